@@ -1,6 +1,5 @@
 import json
 import random
-from functools import lru_cache
 
 from constance.admin import Config, ConstanceAdmin
 from django import forms
@@ -10,7 +9,7 @@ from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import Group
 from django.core.validators import EMPTY_VALUES
 from django.db import models
-from django.db.models import OuterRef, Q, Sum
+from django.db.models import Count, Exists, OuterRef, Q, Subquery, Sum
 from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect, render
 from django.template.loader import render_to_string
@@ -66,10 +65,15 @@ from unfold.widgets import (
     UnfoldAdminTextInputWidget,
 )
 
+from formula.aggregates import GroupConcat, split_concat
+from formula.caching import cached
+from formula.dashboard import DEMO, AggregateComponent, lazy_component
 from formula.models import (
     Circuit,
     Constructor,
+    ConstructorSeasonStanding,
     Driver,
+    DriverSeasonStanding,
     DriverStatus,
     DriverWithFilters,
     Profile,
@@ -561,6 +565,8 @@ class DriverAdminMixin(ModelAdmin):
     readonly_fields = [
         "data",
     ]
+    paginator = InfinitePaginator
+    show_full_result_count = False
     list_before_template = "formula/driver_list_before.html"
     list_after_template = "formula/driver_list_after.html"
     change_form_show_cancel_button = True
@@ -576,30 +582,38 @@ class DriverAdminMixin(ModelAdmin):
         return form
 
     def get_queryset(self, request):
+        # One query per page: points and wins are summed from the precomputed
+        # season rows (a few per driver, read through driver_season_driver_idx),
+        # constructor names come from a single correlated GROUP_CONCAT and
+        # only the shallow constructors relation is prefetched (for the
+        # expandable table section).
+        constructor_names = (
+            Constructor.objects.filter(driver=OuterRef("pk"))
+            .order_by()
+            .values("driver")
+            .annotate(names=GroupConcat("name"))
+            .values("names")
+        )
+        seasons = (
+            DriverSeasonStanding.objects.filter(driver=OuterRef("pk"))
+            .order_by()
+            .values("driver")
+        )
         return (
             super()
             .get_queryset(request)
-            .annotate(total_points=Sum("standing__points"))
             .annotate(
-                constructor_name=Constructor.objects.filter(
-                    standing__driver_id=OuterRef("pk")
-                ).values("name")[:1]
-            )
-            .prefetch_related(
-                "constructors",
-                "race_set",
-                "race_set__circuit",
-                "standings",
-                "standings__race",
-                "standings__race__circuit",
+                total_points=Subquery(seasons.annotate(total=Sum("points")).values("total")),
+                total_wins=Subquery(seasons.annotate(total=Sum("wins")).values("total")),
+                constructor_names=Subquery(constructor_names),
+                has_standings=Exists(seasons.filter(races__gt=0)),
             )
+            .prefetch_related("constructors")
         )
 
     @display(description=_("Driver"), header=True)
     def display_header(self, instance: Driver) -> list:
-        standing = instance.standings.all().first()
-
-        if not standing:
+        if not instance.has_standings:
             return []
 
         return [
@@ -617,10 +631,10 @@ class DriverAdminMixin(ModelAdmin):
 
     @display(description=_("Constructor"), dropdown=True)
     def display_constructor(self, instance: Driver):
-        total = instance.constructors.all().count()
+        names = split_concat(instance.constructor_names)
         items = []
 
-        for constructor in instance.constructors.all():
+        for name in names:
             title = format_html(
                 """
                 <div class="flex flex-row gap-2 items-center">
@@ -630,7 +644,7 @@ class DriverAdminMixin(ModelAdmin):
                     </a>
                 </div>
                 """,
-                constructor.name,
+                name,
             )
             items.append(
                 {
@@ -640,11 +654,11 @@ class DriverAdminMixin(ModelAdmin):
             )
 
         # Display custom string if no records found
-        if total == 0:
+        if not names:
             return "-"
 
         return {
-            "title": f"{total} contructors",
+            "title": f"{len(names)} contructors",
             "items": items,
             "striped": True,
             # "height": 202,  # Optional, max line height 30px
@@ -653,11 +667,11 @@ class DriverAdminMixin(ModelAdmin):
 
     @display(description=_("Total points"), ordering="total_points")
     def display_total_points(self, instance: Driver):
-        return instance.total_points
+        return instance.total_points or 0
 
-    @display(description=_("Total wins"))
+    @display(description=_("Total wins"), ordering="total_wins")
     def display_total_wins(self, instance: Driver):
-        return instance.race_set.count()
+        return instance.total_wins or 0
 
     @display(
         description=_("Status"),
@@ -980,6 +994,41 @@ class StandingAdmin(ModelAdmin):
     list_per_page = 10
 
 
+@admin.register(DriverSeasonStanding, site=formula_admin_site)
+class DriverSeasonStandingAdmin(ModelAdmin):
+    # Rows are maintained by formula.standings; see the rebuild_standings command.
+    list_display = ["year", "driver", "points", "wins", "races", "best_position"]
+    list_filter = [("year", AllValuesCheckboxFilter)]
+    search_fields = ["driver__first_name", "driver__last_name", "driver__code"]
+    ordering = ["-year", "-points"]
+    list_select_related = ["driver"]
+    paginator = InfinitePaginator
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ConstructorSeasonStanding, site=formula_admin_site)
+class ConstructorSeasonStandingAdmin(ModelAdmin):
+    list_display = ["year", "constructor", "points", "wins", "races"]
+    list_filter = [("year", AllValuesCheckboxFilter)]
+    search_fields = ["constructor__name"]
+    ordering = ["-year", "-points"]
+    list_select_related = ["constructor"]
+    paginator = InfinitePaginator
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 try:
     from unfold_studio.admin import StudioOptionAdmin
     from unfold_studio.models import StudioOption
@@ -992,7 +1041,7 @@ except (ImportError, RuntimeError):
     pass
 
 
-@lru_cache
+@cached(DEMO)
 def tracker_random_data():
     data = []
 
@@ -1017,6 +1066,7 @@ def tracker_random_data():
 
 
 @register_component
+@lazy_component("unfold/components/tracker.html")
 class TrackerComponent(BaseComponent):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -1024,7 +1074,7 @@ class TrackerComponent(BaseComponent):
         return context
 
 
-@lru_cache
+@cached(DEMO)
 def cohort_random_data():
     rows = []
     headers = []
@@ -1099,6 +1149,7 @@ def cohort_random_data():
 
 
 @register_component
+@lazy_component("unfold/components/chart/cohort.html")
 class CohortComponent(BaseComponent):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -1107,14 +1158,18 @@ class CohortComponent(BaseComponent):
 
 
 @register_component
-class DriverActiveComponent(BaseComponent):
+class DriverActiveComponent(AggregateComponent):
+    aggregates = {
+        "drivers_active": (Driver, Count("pk", filter=Q(status=DriverStatus.ACTIVE))),
+    }
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
         context["children"] = render_to_string(
             "formula/helpers/kpi_progress.html",
             {
-                "total": Driver.objects.filter(status=DriverStatus.ACTIVE).count(),
+                "total": self.aggregate("drivers_active"),
                 "progress": "positive",
                 "percentage": "2.8%",
             },
@@ -1123,14 +1178,18 @@ class DriverActiveComponent(BaseComponent):
 
 
 @register_component
-class DriverInactiveComponent(BaseComponent):
+class DriverInactiveComponent(AggregateComponent):
+    aggregates = {
+        "drivers_inactive": (Driver, Count("pk", filter=Q(status=DriverStatus.INACTIVE))),
+    }
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
         context["children"] = render_to_string(
             "formula/helpers/kpi_progress.html",
             {
-                "total": Driver.objects.filter(status=DriverStatus.INACTIVE).count(),
+                "total": self.aggregate("drivers_inactive"),
                 "progress": "negative",
                 "percentage": "-12.8%",
             },
@@ -1139,16 +1198,18 @@ class DriverInactiveComponent(BaseComponent):
 
 
 @register_component
-class DriverTotalPointsComponent(BaseComponent):
+class DriverTotalPointsComponent(AggregateComponent):
+    aggregates = {
+        "season_points": (DriverSeasonStanding, Sum("points")),
+    }
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
         context["children"] = render_to_string(
             "formula/helpers/kpi_progress.html",
             {
-                "total": Standing.objects.aggregate(total_points=Sum("points"))[
-                    "total_points"
-                ],
+                "total": self.aggregate("season_points"),
                 "progress": "positive",
                 "percentage": "24.2%",
             },
@@ -1157,14 +1218,18 @@ class DriverTotalPointsComponent(BaseComponent):
 
 
 @register_component
-class DriverRacesComponent(BaseComponent):
+class DriverRacesComponent(AggregateComponent):
+    aggregates = {
+        "races": (Race, Count("pk")),
+    }
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
         context["children"] = render_to_string(
             "formula/helpers/kpi_progress.html",
             {
-                "total": Race.objects.count(),
+                "total": self.aggregate("races"),
                 "progress": "negative",
                 "percentage": "-10.0%",
             },
@@ -1172,34 +1237,39 @@ class DriverRacesComponent(BaseComponent):
         return context
 
 
+@cached(DEMO)
+def driver_section_random_data():
+    WEEKDAYS = [
+        "Mon",
+        "Tue",
+        "Wed",
+        "Thu",
+        "Fri",
+        "Sat",
+        "Sun",
+    ]
+    OF_DAYS = 21
+
+    return json.dumps(
+        {
+            "labels": [WEEKDAYS[day % 7] for day in range(1, OF_DAYS)],
+            "datasets": [
+                {
+                    "data": [
+                        [1, random.randrange(8, OF_DAYS)] for i in range(1, OF_DAYS)
+                    ],
+                    "backgroundColor": "var(--color-primary-600)",
+                }
+            ],
+        }
+    )
+
+
 @register_component
 class DriverSectionChangeComponent(BaseComponent):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        WEEKDAYS = [
-            "Mon",
-            "Tue",
-            "Wed",
-            "Thu",
-            "Fri",
-            "Sat",
-            "Sun",
-        ]
-        OF_DAYS = 21
-
-        context["data"] = json.dumps(
-            {
-                "labels": [WEEKDAYS[day % 7] for day in range(1, OF_DAYS)],
-                "datasets": [
-                    {
-                        "data": [
-                            [1, random.randrange(8, OF_DAYS)] for i in range(1, OF_DAYS)
-                        ],
-                        "backgroundColor": "var(--color-primary-600)",
-                    }
-                ],
-            }
-        )
+        context["data"] = driver_section_random_data()
         return context
 
 
@@ -0,0 +1,28 @@
+from django.db.models import Aggregate, CharField, Value
+from django.db.models.functions import Cast
+
+# ASCII unit separator: never part of a name, safe to split on.
+SEPARATOR = "\x1f"
+
+
+class GroupConcat(Aggregate):
+    """Concatenate grouped values into one string (GROUP_CONCAT/STRING_AGG).
+
+    Order inside the result is not guaranteed; split with ``split_concat``.
+    """
+
+    function = "GROUP_CONCAT"
+    output_field = CharField()
+
+    def __init__(self, expression, separator=SEPARATOR, **extra):
+        super().__init__(expression, Value(separator), **extra)
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        expression, separator = self.get_source_expressions()
+        clone = self.copy()
+        clone.set_source_expressions([Cast(expression, CharField()), separator])
+        return clone.as_sql(compiler, connection, function="STRING_AGG", **extra_context)
+
+
+def split_concat(value, separator=SEPARATOR):
+    return sorted(v for v in (value or "").split(separator) if v)
@@ -1,19 +1,17 @@
 import os
 import base64
-from typing import List, Dict, Optional, Tuple
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple
 from math import sqrt
 from django.db.models import Q
 
 from django.conf import settings
 from django.db import connection
 
-try:
-    from openai import OpenAI
-except Exception:  # pragma: no cover
-    OpenAI = None  # type: ignore
-
 from formula.models import Driver, FileStorage, IFTAReport, Route, Load, BusinessAsset, Finance
 
+if TYPE_CHECKING:
+    from openai import OpenAI
+
 
 MODEL_MAP = {
     # UI value -> provider model id
@@ -26,12 +24,15 @@ EMBED_MODEL = "text-embedding-3-small"
 
 
 def _get_client() -> Optional["OpenAI"]:
-    if OpenAI is None:
-        return None
     api_key = getattr(settings, "OPENAI_API_KEY", None) or os.getenv("OPENAI_API_KEY")
     base_url = getattr(settings, "OPENAI_BASE_URL", None) or os.getenv("OPENAI_BASE_URL")
     if not api_key:
         return None
+    # The SDK takes a noticeable part of startup; load it on first use only.
+    try:
+        from openai import OpenAI
+    except ImportError:  # pragma: no cover
+        return None
     return OpenAI(api_key=api_key, base_url=base_url or "https://api.openai.com/v1")
 
 
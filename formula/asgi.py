@@ -1,3 +1,10 @@
+"""ASGI entrypoint.
+
+Serve the project through this module (``gunicorn formula.asgi`` with the
+uvicorn worker, see Dockerfile) so long-lived responses such as the TV
+dashboard event stream run on the event loop instead of pinning a sync worker.
+"""
+
 import os
 
 from django.core.asgi import get_asgi_application
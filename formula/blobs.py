@@ -0,0 +1,225 @@
+"""Reference counts and garbage collection for content-addressed uploads.
+
+``ContentAddressedStorage`` writes each distinct content once (a blob) and a
+hard link per stored name. ``Blob`` rows count the file fields in
+``BLOB_FIELDS`` that refer to each blob; signals keep the counts up to date
+when rows are saved, changed or deleted.
+
+Deleting a row does not delete files, because another row may share them.
+``collect`` (the ``collect_blobs`` command) recounts the references from the
+database and removes blobs and links that nothing refers to. Files younger
+than the grace period are skipped, because their row may not be committed yet.
+"""
+
+import os
+import re
+import time
+
+BLOB_FIELDS = {
+    "formula.FileStorage": "file",
+    "formula.PersonalDocument": "file",
+    "formula.Upload": "file",
+    "formula.PersonalProjectMedia": "file",
+}
+GRACE_SECONDS = 24 * 60 * 60
+HASH_DIR = re.compile(r"^(?:[0-9a-f]{2}|[0-9a-f]{64})$")
+
+
+def _storage():
+    from formula.storage import content_storage
+
+    return content_storage()
+
+
+####################################################################
+# Reference counts
+####################################################################
+def retain(name):
+    from django.db.models import F
+
+    from formula.models import Blob
+    from formula.storage import blob_hash
+
+    sha256 = blob_hash(name)
+    if not sha256:
+        return
+    if not Blob.objects.filter(sha256=sha256).update(refcount=F("refcount") + 1):
+        try:
+            size = _storage().size(name)
+        except OSError:
+            size = 0
+        blob, created = Blob.objects.get_or_create(sha256=sha256, defaults={"size": size, "refcount": 1})
+        if not created:
+            Blob.objects.filter(pk=blob.pk).update(refcount=F("refcount") + 1)
+
+
+def release(name):
+    from django.db.models import F
+
+    from formula.models import Blob
+    from formula.storage import blob_hash
+
+    sha256 = blob_hash(name)
+    if sha256:
+        Blob.objects.filter(sha256=sha256).update(refcount=F("refcount") - 1)
+
+
+def adopt(dry_run=False):
+    """Move files stored before content addressing into blobs; returns the number of files.
+
+    Rows are updated with ``QuerySet.update`` (no signals); ``collect``
+    recounts afterwards.
+    """
+    from django.apps import apps
+
+    from formula.storage import blob_hash
+
+    storage = _storage()
+    renamed = {}
+    for label, field in BLOB_FIELDS.items():
+        model = apps.get_model(label)
+        rows = model.objects.exclude(**{field: ""}).exclude(**{f"{field}__isnull": True})
+        for pk, name in rows.values_list("pk", field).iterator():
+            if blob_hash(name) or not storage.exists(name):
+                continue
+            if name not in renamed:
+                if dry_run:
+                    renamed[name] = name
+                    continue
+                with storage.open(name) as f:
+                    renamed[name] = storage.save(name, f)
+            if not dry_run:
+                model.objects.filter(pk=pk).update(**{field: renamed[name]})
+    if not dry_run:
+        for name in renamed:
+            storage.delete(name)
+    return len(renamed)
+
+
+####################################################################
+# Garbage collection
+####################################################################
+def usage():
+    """``(unique bytes, referenced bytes)`` of the counted blobs."""
+    from django.db.models import F, Sum
+
+    from formula.models import Blob
+
+    totals = Blob.objects.filter(refcount__gt=0).aggregate(
+        unique=Sum("size"), referenced=Sum(F("size") * F("refcount"))
+    )
+    return totals["unique"] or 0, totals["referenced"] or 0
+
+
+def referenced_names():
+    from django.apps import apps
+
+    names = set()
+    for label, field in BLOB_FIELDS.items():
+        model = apps.get_model(label)
+        names.update(
+            model.objects.exclude(**{field: ""}).exclude(**{f"{field}__isnull": True})
+            .values_list(field, flat=True).iterator()
+        )
+    return names
+
+
+def recount(names):
+    """Set every ``Blob.refcount`` from the referenced ``names``; returns the counts."""
+    from formula.models import Blob
+    from formula.storage import blob_hash
+
+    counts = {}
+    for name in names:
+        sha256 = blob_hash(name)
+        if sha256:
+            counts[sha256] = counts.get(sha256, 0) + 1
+    storage = _storage()
+    blobs = {blob.sha256: blob for blob in Blob.objects.all()}
+    changed, missing = [], []
+    for sha256, blob in blobs.items():
+        if blob.refcount != counts.get(sha256, 0):
+            blob.refcount = counts.get(sha256, 0)
+            changed.append(blob)
+    for sha256, count in counts.items():
+        if sha256 not in blobs:
+            path = storage.path(storage.blob_name(sha256))
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            missing.append(Blob(sha256=sha256, size=size, refcount=count))
+    Blob.objects.bulk_update(changed, ["refcount"], batch_size=500)
+    Blob.objects.bulk_create(missing, batch_size=500, ignore_conflicts=True)
+    return counts
+
+
+def link_dirs():
+    """Directories (``upload_to``) the fields in ``BLOB_FIELDS`` store their links in.
+
+    Only these are searched for stale links: other files under MEDIA_ROOT,
+    like the image variants in ``derivatives/<ab>/<sha256>/``, may be named
+    the same way but are not ours.
+    """
+    from django.apps import apps
+
+    return sorted(
+        {apps.get_model(label)._meta.get_field(field).upload_to.strip("/") for label, field in BLOB_FIELDS.items()}
+    )
+
+
+def _old(path, cutoff):
+    try:
+        return os.path.getmtime(path) < cutoff
+    except OSError:
+        return False
+
+
+def collect(grace=GRACE_SECONDS, dry_run=False):
+    """Delete unreferenced blobs and links; returns ``(blobs, links, bytes)`` removed."""
+    from formula.models import Blob
+    from formula.storage import BLOB_NAME
+
+    storage = _storage()
+    names = referenced_names()
+    counts = recount(names)
+    cutoff = time.time() - grace
+    root = storage.path("")
+    blobs_root = storage.path(storage.blobs_dir)
+    removed_blobs = removed_links = freed = 0
+
+    for link_dir in link_dirs():
+        for directory, _subdirs, files in os.walk(storage.path(link_dir)):
+            for filename in files:
+                path = os.path.join(directory, filename)
+                name = os.path.relpath(path, root).replace(os.sep, "/")
+                if BLOB_NAME.search(name) and name not in names and _old(path, cutoff):
+                    removed_links += 1
+                    if not dry_run:
+                        os.remove(path)
+
+    unreferenced = []
+    for directory, _subdirs, files in os.walk(blobs_root):
+        for sha256 in files:
+            path = os.path.join(directory, sha256)
+            if sha256.startswith(".upload-"):
+                # Left over from an interrupted save.
+                if _old(path, cutoff) and not dry_run:
+                    os.remove(path)
+                continue
+            if counts.get(sha256) or not _old(path, cutoff):
+                continue
+            removed_blobs += 1
+            freed += os.path.getsize(path)
+            unreferenced.append(sha256)
+            if not dry_run:
+                os.remove(path)
+    if not dry_run:
+        Blob.objects.filter(sha256__in=unreferenced).delete()
+        for directory in (storage.blobs_dir, *link_dirs()):
+            _remove_empty_dirs(storage.path(directory))
+    return removed_blobs, removed_links, freed
+
+
+def _remove_empty_dirs(top):
+    # Only the <ab>/ and <sha256>/ directories made by the storage.
+    for directory, _subdirs, _files in os.walk(top, topdown=False):
+        if directory != top and HASH_DIR.match(os.path.basename(directory)) and not os.listdir(directory):
+            os.rmdir(directory)
@@ -0,0 +1,239 @@
+"""Cache configuration from the environment and namespaced cache helpers.
+
+``CACHE_URL`` picks the backend shared by every worker process:
+
+- ``locmem://`` (default): per-process memory, fine for ``runserver``.
+- ``file:///var/tmp/formula-cache``: a directory on the host, shared by all
+  workers of a single machine.
+- ``db://formula_cache``: a table in the default database (create it with
+  ``python manage.py createcachetable``); with SQLite this is a shared cache
+  for a single host without any extra service.
+- ``redis://host:6379/0``: any server speaking the Redis protocol (Redis,
+  Valkey, KeyDB, ...); needs the ``redis`` extra.
+- ``dummy://``: no caching at all.
+
+``CACHE_TIMEOUT`` sets the default timeout in seconds.
+
+``Namespace`` groups related keys under a version number, so ``bump()``
+invalidates all of them at once in every process. ``get_or_compute`` keeps
+one process recomputing an expired value while the others keep serving the
+old one (or wait briefly on a first miss), and starts recomputing a little
+before expiry with a probability that grows as expiry nears. Hits and misses
+are counted per namespace in the cache itself, so ``cache_stats`` reports
+numbers for all workers together.
+"""
+
+import math
+import random
+import time
+from functools import wraps
+from os import environ
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+DEFAULT_TIMEOUT = 300
+# How long a recompute may hold the lock before another process takes over.
+LOCK_TIMEOUT = 30
+# On a cold miss, how long to wait for another process's result.
+LOCK_WAIT = 2.0
+LOCK_POLL = 0.05
+# Flush counters to the shared cache after this many events or seconds.
+STATS_FLUSH_EVENTS = 50
+STATS_FLUSH_SECONDS = 30
+
+NAMESPACES = {}
+
+
+####################################################################
+# Settings
+####################################################################
+def caches(env=environ):
+    """``CACHES`` for ``settings.py``."""
+    url = env.get("CACHE_URL", "").strip() or "locmem://"
+    parts = urlsplit(url)
+    scheme = parts.scheme
+    options = dict(parse_qsl(parts.query))
+    try:
+        timeout = int(env.get("CACHE_TIMEOUT", DEFAULT_TIMEOUT))
+    except ValueError:
+        timeout = DEFAULT_TIMEOUT
+    config = {"TIMEOUT": timeout, "KEY_PREFIX": env.get("CACHE_KEY_PREFIX", "formula")}
+    if scheme == "locmem":
+        config.update(BACKEND="django.core.cache.backends.locmem.LocMemCache", LOCATION=parts.netloc or "formula")
+    elif scheme == "file":
+        config.update(BACKEND="django.core.cache.backends.filebased.FileBasedCache", LOCATION=unquote(parts.path))
+    elif scheme == "db":
+        config.update(BACKEND="django.core.cache.backends.db.DatabaseCache", LOCATION=parts.netloc or "formula_cache")
+    elif scheme in ("redis", "rediss", "unix"):
+        config.update(BACKEND="django.core.cache.backends.redis.RedisCache", LOCATION=url.split("?", 1)[0])
+    elif scheme == "dummy":
+        config.update(BACKEND="django.core.cache.backends.dummy.DummyCache")
+    else:
+        raise ValueError(f"Unsupported CACHE_URL scheme: {scheme!r}")
+    if options:
+        config["OPTIONS"] = options
+    return {"default": config}
+
+
+####################################################################
+# Namespaces
+####################################################################
+def _cache(alias):
+    from django.core.cache import caches as django_caches
+
+    return django_caches[alias]
+
+
+class Namespace:
+    def __init__(self, name, timeout=DEFAULT_TIMEOUT, alias="default", beta=1.0):
+        self.name = name
+        self.timeout = timeout
+        self.alias = alias
+        # Higher beta recomputes earlier; 0 disables early recompute.
+        self.beta = beta
+        self._counts = {"hits": 0, "misses": 0}
+        self._last_flush = time.monotonic()
+        NAMESPACES[name] = self
+
+    @property
+    def cache(self):
+        return _cache(self.alias)
+
+    ####################################################################
+    # Versioning
+    ####################################################################
+    @property
+    def version_key(self):
+        return f"{self.name}:version"
+
+    def version(self):
+        self.cache.add(self.version_key, 1, None)
+        return self.cache.get(self.version_key, 1)
+
+    def bump(self, **kwargs):
+        """Invalidate every key of the namespace (old entries simply expire)."""
+        try:
+            self.cache.incr(self.version_key)
+        except ValueError:
+            self.cache.set(self.version_key, 2, None)
+
+    def key(self, *parts):
+        return ":".join([self.name, f"v{self.version()}", *(str(p) for p in parts)])
+
+    ####################################################################
+    # Access
+    ####################################################################
+    def get(self, *parts, default=None):
+        entry = self.cache.get(self.key(*parts))
+        self._count("hits" if entry is not None else "misses")
+        return default if entry is None else entry[0]
+
+    def set(self, *parts, value, timeout=None):
+        self._store(self.key(*parts), value, 0.0, timeout)
+
+    def _store(self, key, value, cost, timeout):
+        timeout = self.timeout if timeout is None else timeout
+        expires = time.time() + timeout if timeout else None
+        self.cache.set(key, (value, expires, cost), timeout)
+
+    def get_or_compute(self, *parts, compute, timeout=None):
+        """Cached ``compute()`` for ``parts`` with stampede protection."""
+        key = self.key(*parts)
+        entry = self.cache.get(key)
+        if entry is not None:
+            value, expires, cost = entry
+            if not self._recompute_early(expires, cost):
+                self._count("hits")
+                return value
+            # Refresh ahead of expiry; the others keep getting the old value.
+            if not self._lock(key):
+                self._count("hits")
+                return value
+            acquired = True
+        else:
+            self._count("misses")
+            acquired = self._lock(key)
+            if not acquired:
+                entry = self._wait(key)
+                if entry is not None:
+                    return entry[0]
+        try:
+            started = time.monotonic()
+            value = compute()
+            self._store(key, value, time.monotonic() - started, timeout)
+            return value
+        finally:
+            # After a timed out wait the lock is still someone else's.
+            if acquired:
+                self.cache.delete(f"{key}:lock")
+
+    def _recompute_early(self, expires, cost):
+        # XFetch: recompute with probability rising as expiry approaches,
+        # weighted by how long the value took to compute.
+        if not expires or not cost or not self.beta:
+            return False
+        return time.time() - cost * self.beta * math.log(random.random() or 1e-12) >= expires
+
+    def _lock(self, key):
+        return self.cache.add(f"{key}:lock", 1, LOCK_TIMEOUT)
+
+    def _wait(self, key):
+        deadline = time.monotonic() + LOCK_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(LOCK_POLL)
+            entry = self.cache.get(key)
+            if entry is not None:
+                return entry
+        # Give up waiting and compute it here as well.
+        return None
+
+    ####################################################################
+    # Stats
+    ####################################################################
+    def _count(self, kind):
+        self._counts[kind] += 1
+        pending = self._counts["hits"] + self._counts["misses"]
+        if pending >= STATS_FLUSH_EVENTS or time.monotonic() - self._last_flush >= STATS_FLUSH_SECONDS:
+            self.flush_stats()
+
+    def flush_stats(self):
+        counts, self._counts = self._counts, {"hits": 0, "misses": 0}
+        self._last_flush = time.monotonic()
+        for kind, count in counts.items():
+            if not count:
+                continue
+            key = f"{self.name}:stats:{kind}"
+            self.cache.add(key, 0, None)
+            try:
+                self.cache.incr(key, count)
+            except ValueError:
+                self.cache.set(key, count, None)
+
+    def stats(self):
+        self.flush_stats()
+        hits = self.cache.get(f"{self.name}:stats:hits", 0)
+        misses = self.cache.get(f"{self.name}:stats:misses", 0)
+        total = hits + misses
+        return {
+            "namespace": self.name,
+            "version": self.version(),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total if total else None,
+        }
+
+    def reset_stats(self):
+        self._counts = {"hits": 0, "misses": 0}
+        self.cache.delete_many([f"{self.name}:stats:hits", f"{self.name}:stats:misses"])
+
+
+def cached(namespace, *parts, timeout=None):
+    """Decorator caching a function without arguments in ``namespace``."""
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper():
+            return namespace.get_or_compute(*parts, func.__qualname__, compute=func, timeout=timeout)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,315 @@
+"""iCalendar (RFC 5545) feed for personal projects, tasks and schedule blocks.
+
+Projects and tasks become all-day events spanning their start/end dates;
+schedule blocks are timed events. Block times are stored as local wall time
+in ``settings.TIME_ZONE`` and written out in UTC, so every client agrees on
+the instant regardless of its own zone. UIDs are derived from the record,
+not the row, so re-planning a day updates events instead of duplicating
+them in subscribed calendars.
+
+``stream_feed`` yields the file line by line; querysets are iterated with
+``.iterator()`` so large calendars are never built in memory.
+
+The same records are served as JSON for the global calendar widget by
+``cached_range_events``, which only reads the requested date range.
+"""
+
+import datetime
+import hashlib
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+from formula.caching import Namespace
+
+UID_DOMAIN = "formula.personal"
+PRODID = "-//Formula//Personal Projects//EN"
+# Blocks older than this are left out of the feed.
+BLOCK_HISTORY_DAYS = 60
+
+_TOKEN_SALT = "formula.calendar_feed"
+
+
+####################################################################
+# Subscription tokens
+####################################################################
+def make_feed_token(user):
+    """Token for the subscription URL; changing the password revokes it."""
+    digest = salted_hmac(_TOKEN_SALT, f"{user.pk}:{user.password}").hexdigest()[:32]
+    return f"{user.pk}-{digest}"
+
+
+def user_for_token(token):
+    from django.contrib.auth import get_user_model
+
+    pk, _sep, _digest = str(token).partition("-")
+    if not pk.isdigit():
+        return None
+    user = get_user_model().objects.filter(pk=pk, is_active=True).first()
+    if user and constant_time_compare(make_feed_token(user), token):
+        return user
+    return None
+
+
+####################################################################
+# Encoding helpers
+####################################################################
+def escape_text(value):
+    return (
+        str(value or "")
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold(line):
+    """Fold a content line at 75 octets without splitting UTF-8 sequences."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line + "\r\n"
+    parts = []
+    limit = 75
+    while encoded:
+        cut = min(limit, len(encoded))
+        # Back off to a character boundary (continuation bytes are 10xxxxxx).
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode("utf-8"))
+        encoded = encoded[cut:]
+        limit = 74  # leading space of the continuation line counts
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def format_utc(value):
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value.astimezone(datetime.UTC).strftime("%Y%m%dT%H%M%SZ")
+
+
+def format_date(value):
+    return value.strftime("%Y%m%d")
+
+
+def _event(uid, stamp, summary, start, end, description="", status=None, categories=None):
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}@{UID_DOMAIN}",
+        f"DTSTAMP:{format_utc(stamp)}",
+        f"LAST-MODIFIED:{format_utc(stamp)}",
+        *start,
+        *end,
+        f"SUMMARY:{escape_text(summary)}",
+    ]
+    if description:
+        lines.append(f"DESCRIPTION:{escape_text(description)}")
+    if status:
+        lines.append(f"STATUS:{status}")
+    if categories:
+        lines.append(f"CATEGORIES:{escape_text(categories)}")
+    lines.append("END:VEVENT")
+    return lines
+
+
+def _all_day(start, end):
+    start = start or end
+    # DTEND is exclusive for all-day events.
+    end = (end if end and end >= start else start) + datetime.timedelta(days=1)
+    return [f"DTSTART;VALUE=DATE:{format_date(start)}"], [f"DTEND;VALUE=DATE:{format_date(end)}"]
+
+
+####################################################################
+# Events
+####################################################################
+def project_events(projects):
+    for p in projects:
+        if not (p.start_date or p.end_date):
+            continue
+        start, end = _all_day(p.start_date, p.end_date)
+        status = "TENTATIVE" if p.status in ("PLANNED", "ON_HOLD") else "CONFIRMED"
+        yield _event(f"project-{p.pk}", p.updated_at, f"Project: {p.name}", start, end, p.description, status)
+
+
+def task_events(tasks):
+    for t in tasks:
+        if not (t.start_date or t.due_date):
+            continue
+        start, end = _all_day(t.start_date, t.due_date)
+        project = t.project.name if t.project_id else ""
+        summary = f"{t.title} ({project})" if project else t.title
+        status = {"DONE": "CONFIRMED", "IN_PROGRESS": "CONFIRMED"}.get(t.status, "TENTATIVE")
+        yield _event(f"task-{t.pk}", t.updated_at, summary, start, end, t.description, status, project)
+
+
+def block_events(blocks, tz):
+    # Number blocks per task and day so the UID survives re-planning.
+    seen = {}
+    for b in blocks:
+        key = (b.task_id, b.date)
+        seen[key] = seen.get(key, 0) + 1
+        start = datetime.datetime.combine(b.date, b.start, tzinfo=tz)
+        end = datetime.datetime.combine(b.date, b.end, tzinfo=tz)
+        task = b.task
+        project = task.project.name if task.project_id else ""
+        yield _event(
+            f"block-{b.task_id}-{format_date(b.date)}-{seen[key]}",
+            b.created_at,
+            task.title,
+            [f"DTSTART:{format_utc(start)}"],
+            [f"DTEND:{format_utc(end)}"],
+            project,
+            "CONFIRMED",
+            project,
+        )
+
+
+def feed_querysets(since=None):
+    from .models import PersonalProject, PersonalScheduleBlock, PersonalTask
+
+    since = since or (timezone.localdate() - datetime.timedelta(days=BLOCK_HISTORY_DAYS))
+    projects = PersonalProject.objects.order_by("pk")
+    tasks = PersonalTask.objects.select_related("project").order_by("pk")
+    blocks = (
+        PersonalScheduleBlock.objects.filter(date__gte=since)
+        .select_related("task__project")
+        .order_by("task_id", "date", "start")
+    )
+    return projects, tasks, blocks
+
+
+def stream_feed(projects=None, tasks=None, blocks=None, name="Personal projects"):
+    """Yield the calendar as folded CRLF lines.
+
+    Pass ``None`` for a kind of record to leave it out of the feed.
+    """
+    tz = ZoneInfo(settings.TIME_ZONE)
+    for line in (
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{escape_text(name)}",
+        f"X-WR-TIMEZONE:{settings.TIME_ZONE}",
+        "REFRESH-INTERVAL;VALUE=DURATION:PT1H",
+        "X-PUBLISHED-TTL:PT1H",
+    ):
+        yield fold(line)
+    sources = []
+    if projects is not None:
+        sources.append(project_events(projects.iterator()))
+    if tasks is not None:
+        sources.append(task_events(tasks.iterator()))
+    if blocks is not None:
+        sources.append(block_events(blocks.iterator(), tz))
+    for events in sources:
+        for event in events:
+            yield "".join(fold(line) for line in event)
+    yield fold("END:VCALENDAR")
+
+
+def feed_etag(since=None):
+    """Cheap fingerprint of everything in the feed (three aggregate queries)."""
+    projects, tasks, blocks = feed_querysets(since)
+    parts = [
+        projects.aggregate(n=Count("pk"), m=Max("updated_at")),
+        tasks.aggregate(n=Count("pk"), m=Max("updated_at")),
+        blocks.aggregate(n=Count("pk"), m=Max("created_at"), i=Max("pk")),
+        settings.TIME_ZONE,
+    ]
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+####################################################################
+# JSON events for the calendar widget
+####################################################################
+EVENTS_CACHE_TIMEOUT = 60 * 60
+# Widgets ask for the visible range; refuse anything much larger than a year.
+MAX_RANGE_DAYS = 400
+
+TASK_COLORS = {"IN_PROGRESS": "#a78bfa", "DONE": "#34d399"}
+
+
+EVENTS = Namespace("calendar:events", timeout=EVENTS_CACHE_TIMEOUT)
+
+
+def bump_events_version():
+    """Invalidate every cached range at once (old keys simply expire)."""
+    EVENTS.bump()
+
+
+def _overlapping(start_field, end_field, start, end):
+    """Records whose [start_field, end_field] span touches ``start..end``.
+
+    A missing bound means a single-day event on the other one.
+    """
+    from django.db.models import Q
+
+    return (
+        Q(**{f"{start_field}__lte": end, f"{end_field}__gte": start})
+        | Q(**{f"{start_field}__isnull": True, f"{end_field}__range": (start, end)})
+        | Q(**{f"{end_field}__isnull": True, f"{start_field}__range": (start, end)})
+    )
+
+
+def _span(start, end):
+    start = start or end
+    event = {"start": start.isoformat()}
+    if end and end > start:
+        # FullCalendar treats the end of all-day events as exclusive.
+        event["end"] = (end + datetime.timedelta(days=1)).isoformat()
+    return event
+
+
+def range_events(start, end):
+    """Events for ``start..end`` (inclusive dates): one query per record kind."""
+    from .models import PersonalProject, PersonalScheduleBlock, PersonalTask
+
+    events = []
+    projects = PersonalProject.objects.filter(
+        _overlapping("start_date", "end_date", start, end)
+    ).only("id", "name", "start_date", "end_date")
+    for p in projects:
+        events.append({
+            "id": f"project-{p.pk}",
+            "title": f"Project: {p.name}",
+            "backgroundColor": "#93c5fd",
+            **_span(p.start_date, p.end_date),
+        })
+    tasks = (
+        PersonalTask.objects.filter(_overlapping("start_date", "due_date", start, end))
+        .select_related("project")
+        .only("id", "title", "status", "start_date", "due_date", "project__name")
+    )
+    for t in tasks:
+        events.append({
+            "id": f"task-{t.pk}",
+            "title": f"{t.title} ({t.project.name})",
+            "backgroundColor": TASK_COLORS.get(t.status, "#fbbf24"),
+            **_span(t.start_date, t.due_date),
+        })
+    blocks = (
+        PersonalScheduleBlock.objects.filter(date__gte=start, date__lte=end)
+        .select_related("task")
+        .only("id", "date", "start", "end", "task__title")
+    )
+    for b in blocks:
+        events.append({
+            "id": f"block-{b.pk}",
+            "title": b.task.title,
+            "start": f"{b.date.isoformat()}T{b.start:%H:%M}",
+            "end": f"{b.date.isoformat()}T{b.end:%H:%M}",
+            "backgroundColor": "#64748b",
+        })
+    return events
+
+
+def cached_range_events(start, end):
+    return EVENTS.get_or_compute(
+        start.isoformat(), end.isoformat(), compute=lambda: range_events(start, end)
+    )
@@ -0,0 +1,167 @@
+"""Cash-flow forecast from recurring items and recorded entries.
+
+``PersonalMonthlyItem`` rows are expanded by ``day_of_month`` (clamped to
+short months, the 1st when unset) into dated flows after today; recorded
+``PersonalFinancialEntry`` rows are used up to and including today. The flows
+are folded into one sorted list of days with a running balance, so
+``Forecast.balance_on(day)`` is a binary search instead of a sum.
+
+The balance is the net of everything tracked: the opening value is the sum
+of all entries before the forecast starts. Forecasts are cached per day and
+horizon; signals bump the ``cashflow`` namespace when items or entries change.
+"""
+
+import datetime
+from bisect import bisect_right
+from calendar import monthrange
+from decimal import Decimal
+
+from formula.caching import Namespace
+from formula.projections import add_months
+
+CACHE_TIMEOUT = 60 * 60
+MAX_MONTHS = 36
+
+
+####################################################################
+# Expansion
+####################################################################
+def signed(kind, amount):
+    amount = Decimal(amount or 0)
+    return amount if kind == "INCOME" else -amount
+
+
+def occurrences(day_of_month, first, last):
+    """Dates in ``first..last`` on which a monthly item falls."""
+    day_of_month = day_of_month or 1
+    month = first.replace(day=1)
+    while month <= last:
+        day = month.replace(day=min(day_of_month, monthrange(month.year, month.month)[1]))
+        if first <= day <= last:
+            yield day
+        month = add_months(month, 1)
+
+
+class Forecast:
+    """Running balance per day with flows; days in between carry the balance over."""
+
+    def __init__(self, start, end, opening, flows):
+        self.start = start
+        self.end = end
+        self.opening = opening
+        totals = {}
+        for day, amount in flows:
+            totals[day] = totals.get(day, Decimal(0)) + amount
+        self.days = sorted(totals)
+        self.ordinals = [day.toordinal() for day in self.days]
+        self.changes = [totals[day] for day in self.days]
+        self.balances = []
+        balance = opening
+        for change in self.changes:
+            balance += change
+            self.balances.append(balance)
+
+    def balance_on(self, day):
+        """Balance at the end of ``day``."""
+        index = bisect_right(self.ordinals, day.toordinal())
+        return self.balances[index - 1] if index else self.opening
+
+    def net_between(self, first, last):
+        """Sum of flows in ``first..last`` (inclusive)."""
+        return self.balance_on(last) - self.balance_on(first - datetime.timedelta(days=1))
+
+    def lowest(self, first=None):
+        """``(day, balance)`` of the lowest end-of-day balance from ``first`` on."""
+        first = first or self.start
+        index = bisect_right(self.ordinals, first.toordinal())
+        low = (first, self.balance_on(first))
+        for day, balance in zip(self.days[index:], self.balances[index:], strict=True):
+            if balance < low[1]:
+                low = (day, balance)
+        return low
+
+    def series(self):
+        """``[(day, balance), ...]`` for every day from ``start`` to ``end``."""
+        out = []
+        index = 0
+        balance = self.opening
+        day = self.start
+        while day <= self.end:
+            while index < len(self.days) and self.days[index] <= day:
+                balance = self.balances[index]
+                index += 1
+            out.append((day, balance))
+            day += datetime.timedelta(days=1)
+        return out
+
+    def month_ends(self):
+        out = []
+        month = self.start.replace(day=1)
+        while month <= self.end:
+            last = month.replace(day=monthrange(month.year, month.month)[1])
+            out.append((last, self.balance_on(min(last, self.end))))
+            month = add_months(month, 1)
+        return out
+
+    def as_dict(self, daily=False):
+        low_day, low_balance = self.lowest()
+        data = {
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "opening": float(self.opening),
+            "lowest": {"date": low_day.isoformat(), "balance": float(low_balance)},
+            "month_ends": [
+                {"date": day.isoformat(), "balance": float(balance)} for day, balance in self.month_ends()
+            ],
+        }
+        if daily:
+            data["daily"] = [
+                {"date": day.isoformat(), "balance": float(balance)} for day, balance in self.series()
+            ]
+        return data
+
+
+def build(months=6, today=None):
+    """Forecast from the 1st of this month to the end of the ``months``-th month."""
+    from django.db.models import Q, Sum
+
+    from .models import PersonalFinancialEntry, PersonalMonthlyItem
+
+    today = today or datetime.date.today()
+    start = today.replace(day=1)
+    end = add_months(start, months) - datetime.timedelta(days=1)
+
+    before = PersonalFinancialEntry.objects.filter(date__lt=start).aggregate(
+        income=Sum("amount", filter=Q(type="INCOME")),
+        expenses=Sum("amount", filter=Q(type="EXPENSE")),
+    )
+    opening = (before["income"] or Decimal(0)) - (before["expenses"] or Decimal(0))
+
+    flows = [
+        (day, signed(kind, amount))
+        for day, kind, amount in PersonalFinancialEntry.objects.filter(
+            date__gte=start, date__lte=today, type__in=("INCOME", "EXPENSE")
+        ).values_list("date", "type", "amount")
+    ]
+    projected_from = today + datetime.timedelta(days=1)
+    for kind, amount, day_of_month in PersonalMonthlyItem.objects.values_list("type", "amount", "day_of_month"):
+        change = signed(kind, amount)
+        flows.extend((day, change) for day in occurrences(day_of_month, projected_from, end))
+    return Forecast(start, end, opening, flows)
+
+
+####################################################################
+# Cache
+####################################################################
+FORECASTS = Namespace("cashflow", timeout=CACHE_TIMEOUT)
+
+
+def bump_cashflow_version():
+    FORECASTS.bump()
+
+
+def forecast(months=6, today=None):
+    """``build`` shared through the cache until items or entries change."""
+    today = today or datetime.date.today()
+    months = max(1, min(int(months), MAX_MONTHS))
+    return FORECASTS.get_or_compute(today.isoformat(), months, compute=lambda: build(months, today))
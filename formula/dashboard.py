@@ -0,0 +1,132 @@
+"""Data loading for admin dashboard components.
+
+Components declare the scalar aggregates they display instead of querying on
+their own. The first component rendered on a page resolves every registered
+aggregate in a single ``SELECT (subquery), (subquery), ...`` statement; the
+result is kept on the request and in the cache, so the other components of
+the page (and the next page views) reuse it. Signals drop the cached values
+when the underlying rows change.
+
+Slow components can be rendered lazily: ``formula/helpers/lazy_component.html``
+paints a placeholder and fetches the markup from ``component_view``.
+"""
+
+from django.db import connection
+from django.db.models import Value
+from django.http import Http404, HttpResponse
+from django.template.loader import render_to_string
+from unfold.components import BaseComponent, ComponentRegistry
+
+from formula.caching import Namespace
+
+CACHE_TIMEOUT = 5 * 60
+CACHE = Namespace("dashboard", timeout=CACHE_TIMEOUT)
+# Random demo widgets: generated once and shared by every worker.
+DEMO = Namespace("dashboard:demo", timeout=None)
+
+# name -> (model, aggregate expression)
+AGGREGATES = {}
+# component class name -> template, for components that may load lazily
+LAZY_COMPONENTS = {}
+
+
+def register_aggregate(name, model, expression):
+    AGGREGATES[name] = (model, expression)
+
+
+def _scalar_query(model, expression):
+    """Compiler of a query returning ``expression`` over the whole table."""
+    # Grouping by a constant collapses the table to one row without a GROUP BY.
+    query = (
+        model._default_manager.order_by()
+        .annotate(_all=Value(1))
+        .values("_all")
+        .annotate(value=expression)
+        .values("value")
+        .query
+    )
+    return query.get_compiler(connection=connection)
+
+
+def _convert(compiler, value):
+    """Apply the backend/field converters the ORM would (e.g. Decimal on SQLite)."""
+    converters = compiler.get_converters([compiler.query.annotations["value"]])
+    return next(iter(compiler.apply_converters([[value]], converters)))[0]
+
+
+def run_aggregates(names=None):
+    """Resolve ``names`` (all registered aggregates by default) in one query."""
+    names = list(AGGREGATES if names is None else names)
+    if not names:
+        return {}
+    compilers, columns, params = [], [], []
+    for name in names:
+        compiler = _scalar_query(*AGGREGATES[name])
+        sql, sql_params = compiler.as_sql()
+        compilers.append(compiler)
+        columns.append(f"({sql}) AS {connection.ops.quote_name(name)}")
+        params.extend(sql_params)
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT {', '.join(columns)}", params)
+        row = cursor.fetchone()
+    return {
+        name: _convert(compiler, value)
+        for name, compiler, value in zip(names, compilers, row, strict=True)
+    }
+
+
+def load_aggregates(request=None):
+    """All registered aggregates, shared per request and through the cache."""
+    values = getattr(request, "_dashboard_aggregates", None)
+    if values is None:
+        values = CACHE.get_or_compute("aggregates", compute=run_aggregates)
+        if set(values) != set(AGGREGATES):
+            # Cached by a process that had other components registered.
+            values = run_aggregates()
+            CACHE.set("aggregates", value=values)
+        if request is not None:
+            request._dashboard_aggregates = values
+    return values
+
+
+def invalidate(**kwargs):
+    CACHE.bump()
+
+
+class AggregateComponent(BaseComponent):
+    """Component whose numbers come from the shared aggregate batch.
+
+    Subclasses list ``aggregates = {"name": (Model, expression)}`` and read
+    them back with ``self.aggregate("name")``.
+    """
+
+    aggregates = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name, (model, expression) in cls.aggregates.items():
+            register_aggregate(name, model, expression)
+
+    def aggregate(self, name):
+        return load_aggregates(self.request).get(name)
+
+
+def lazy_component(template):
+    """Class decorator allowing ``component_class`` to be fetched on demand."""
+
+    def decorator(cls):
+        LAZY_COMPONENTS[cls.__name__] = template
+        return cls
+
+    return decorator
+
+
+def component_view(request, name):
+    template = LAZY_COMPONENTS.get(name)
+    if template is None:
+        raise Http404
+    component = ComponentRegistry.create_instance(name, request=request)
+    context = component.get_context_data(component_class=name)
+    response = HttpResponse(render_to_string(template, context, request=request))
+    response["Cache-Control"] = "private, max-age=60"
+    return response
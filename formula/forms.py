@@ -441,9 +441,19 @@ class TaskForm(forms.ModelForm):
             "due_date",
             "progress",
             "estimated_hours",
+            "depends_on",
             "ai_suggested",
         ]
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Only offer other tasks from the same project as prerequisites
+        qs = PersonalTask.objects.none()
+        if self.instance and self.instance.project_id:
+            qs = PersonalTask.objects.filter(project_id=self.instance.project_id).exclude(pk=self.instance.pk)
+        self.fields["depends_on"].queryset = qs
+        self.fields["depends_on"].required = False
+
     def clean_progress(self):
         v = self.cleaned_data.get("progress")
         return 0 if v in (None, "") else v
@@ -0,0 +1,135 @@
+"""Resized image variants for uploaded pictures.
+
+Uploads are served at whatever resolution they were taken at. For every
+image field listed in ``IMAGE_FIELDS`` this module writes WebP and JPEG
+copies at the ``WIDTHS`` not larger than the original into the default
+storage under ``derivatives/<sha256 of the source>/<width>.<ext>``. Keying by
+content means re-uploads of the same picture reuse the files and a changed
+picture never serves stale variants.
+
+Variants are made on a small thread pool after the upload is saved (see
+``signals``), or by ``build_image_derivatives`` for existing files. Until they
+exist, ``{% responsive_image %}`` renders the original; afterwards it renders
+a ``<picture>`` with a ``srcset`` per format, and the browser downloads the
+smallest file that fits its layout. What exists for each file is remembered in
+the ``images`` cache namespace, so rendering doesn't touch the disk.
+"""
+
+import hashlib
+import io
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from os import environ
+
+from formula.caching import Namespace
+
+logger = logging.getLogger(__name__)
+
+WIDTHS = (320, 640, 960, 1280, 1920)
+# Format name for Pillow, file extension, MIME type, save options.
+FORMATS = (
+    ("WEBP", "webp", "image/webp", {"quality": 80, "method": 4}),
+    ("JPEG", "jpg", "image/jpeg", {"quality": 82, "optimize": True, "progressive": True}),
+)
+ROOT = "derivatives"
+WORKERS = int(environ.get("IMAGE_WORKERS", 2))
+
+IMAGE_FIELDS = {
+    "formula.Car": "image",
+    "formula.BusinessAsset": "image",
+    "formula.Driver": "picture",
+    "formula.Profile": "picture",
+    "formula.Race": "picture",
+}
+
+VARIANTS = Namespace("images", timeout=None, beta=0)
+
+
+####################################################################
+# Generation
+####################################################################
+def source_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def widths_for(width):
+    """Variant widths for an original ``width`` pixels wide."""
+    widths = [w for w in WIDTHS if w < width]
+    return widths + [min(width, WIDTHS[-1])]
+
+
+def generate(name, storage=None, force=False):
+    """Write the variants of stored file ``name`` and remember them."""
+    from django.core.files.base import ContentFile
+    from django.core.files.storage import default_storage
+    from PIL import Image, ImageOps
+
+    storage = storage or default_storage
+    with storage.open(name, "rb") as f:
+        data = f.read()
+    digest = source_hash(data)
+    with Image.open(io.BytesIO(data)) as image:
+        image = ImageOps.exif_transpose(image)
+        width, height = image.size
+        variants = {}
+        for pil_format, ext, mime, options in FORMATS:
+            variants[mime] = []
+            for w in widths_for(width):
+                path = f"{ROOT}/{digest[:2]}/{digest}/{w}.{ext}"
+                if force or not storage.exists(path):
+                    resized = image.copy()
+                    resized.thumbnail((w, round(height * w / width) or 1), Image.LANCZOS)
+                    if pil_format == "JPEG" and resized.mode not in ("RGB", "L"):
+                        resized = resized.convert("RGB")
+                    out = io.BytesIO()
+                    resized.save(out, pil_format, **options)
+                    if storage.exists(path):
+                        storage.delete(path)
+                    storage.save(path, ContentFile(out.getvalue()))
+                variants[mime].append((w, storage.url(path)))
+    entry = {"hash": digest, "width": width, "height": height, "variants": variants}
+    VARIANTS.set(name, value=entry)
+    return entry
+
+
+####################################################################
+# Background worker
+####################################################################
+_executor = None
+_pending = set()
+_lock = threading.Lock()
+
+
+def schedule(name):
+    """Generate ``name``'s variants on the worker pool, once at a time per file."""
+    global _executor
+    with _lock:
+        if name in _pending:
+            return
+        _pending.add(name)
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="images")
+    _executor.submit(_run, name)
+
+
+def _run(name):
+    try:
+        generate(name)
+    except Exception:
+        logger.exception("Could not build image variants for %s", name)
+        # Not an image Pillow can read: serve the original, retry in an hour.
+        VARIANTS.set(name, value={}, timeout=60 * 60)
+    finally:
+        with _lock:
+            _pending.discard(name)
+
+
+def variants(file, build=True):
+    """Known variants of an image field file; schedules them when missing."""
+    if not file:
+        return None
+    entry = VARIANTS.get(file.name)
+    if entry is None and build:
+        schedule(file.name)
+    return entry
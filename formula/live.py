@@ -0,0 +1,286 @@
+"""Live updates for the TV dashboard.
+
+Model signals (and the scheduler, see ``formula.schedules.publish_week``)
+publish small delta events and the ``tv/dashboard/events/`` endpoint streams
+them to connected screens as server-sent events. Each event carries only the
+changed record (or the recomputed month summary for finances), never the
+whole dashboard.
+
+Events go through the ``LiveEvent`` table, so a write made by any process
+(another web worker, a management command, ``process_outbox``) reaches every
+screen, and the row id is the SSE id: it only grows, also across restarts,
+so a screen reconnecting with ``Last-Event-ID`` gets exactly what it missed.
+Each web process polls the table from one thread while it has screens
+attached and fans new rows out to them. A screen that can't catch up (its id
+is newer than the table after a reset, or older than what is kept) is told to
+reload instead.
+
+Streams are long-lived, so run the app under an ASGI server (see
+``formula/asgi.py``).
+"""
+
+import asyncio
+import datetime
+import json
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+logger = logging.getLogger(__name__)
+
+# Events kept around so reconnecting screens can catch up via Last-Event-ID.
+BACKLOG_SIZE = 256
+HEARTBEAT_SECONDS = 15
+POLL_SECONDS = 1.0
+# How long a skipped id is re-checked: ids are handed out at insert, so a
+# concurrent insert can become visible after a higher one.
+GAP_SECONDS = 10
+RELOAD = "dashboard.reload"
+
+
+def _message(event):
+    return {"id": event.pk, "event": event.event, "data": event.data}
+
+
+def publish(event, data):
+    """Store an event for every screen; returns its id."""
+    from .models import LiveEvent
+
+    row = LiveEvent.objects.create(event=event, data=data)
+    LiveEvent.objects.filter(id__lte=row.pk - BACKLOG_SIZE).delete()
+    return row.pk
+
+
+def latest_id():
+    from .models import LiveEvent
+
+    return LiveEvent.objects.order_by("-id").values_list("id", flat=True).first() or 0
+
+
+def backlog_since(last_id):
+    """Messages after ``last_id``, or ``None`` when the screen has to reload."""
+    from .models import LiveEvent
+
+    events = list(LiveEvent.objects.filter(id__gt=last_id).order_by("id")[:BACKLOG_SIZE])
+    if last_id:
+        if last_id > latest_id():
+            # Id from before the table was reset.
+            return None
+        oldest = LiveEvent.objects.order_by("id").values_list("id", flat=True).first()
+        if oldest is not None and last_id < oldest - 1:
+            # Missed events were pruned already.
+            return None
+    return [_message(e) for e in events]
+
+
+class Broker:
+    """Fan out stored events to the asyncio subscribers of this process."""
+
+    def __init__(self, poll_seconds=POLL_SECONDS):
+        self.poll_seconds = poll_seconds
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def dispatch(self, message):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, message)
+            except RuntimeError:
+                # Loop already closed, subscriber is going away.
+                pass
+
+    @asynccontextmanager
+    async def subscribe(self):
+        entry = (asyncio.get_running_loop(), asyncio.Queue())
+        with self._lock:
+            self._subscribers.add(entry)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="live-events", daemon=True)
+                self._thread.start()
+        self._wake.set()
+        try:
+            yield entry[1]
+        finally:
+            with self._lock:
+                self._subscribers.discard(entry)
+
+    def _run(self):
+        from django.db import connection
+
+        cursor = None
+        gaps = {}  # skipped id -> give up after
+        while True:
+            with self._lock:
+                idle = not self._subscribers
+            if idle:
+                # Nobody listening: don't hold a connection or poll.
+                cursor = None
+                gaps.clear()
+                connection.close()
+                self._wake.clear()
+                self._wake.wait()
+                continue
+            try:
+                if cursor is None:
+                    cursor = latest_id()
+                cursor = self.poll(cursor, gaps)
+            except Exception:
+                logger.exception("Could not read live events")
+                connection.close()
+            time.sleep(self.poll_seconds)
+
+    def poll(self, cursor, gaps):
+        """Dispatch events after ``cursor`` (and late ones in ``gaps``); returns the new cursor."""
+        from django.db.models import Q
+
+        from .models import LiveEvent
+
+        now = time.monotonic()
+        for pk in [pk for pk, until in gaps.items() if until < now]:
+            del gaps[pk]
+        events = LiveEvent.objects.filter(Q(id__gt=cursor) | Q(id__in=list(gaps))).order_by("id")
+        for event in events:
+            gaps.pop(event.pk, None)
+            if event.pk > cursor:
+                skipped = range(max(cursor + 1, event.pk - BACKLOG_SIZE), event.pk)
+                gaps.update(dict.fromkeys(skipped, now + GAP_SECONDS))
+                cursor = event.pk
+            self.dispatch(_message(event))
+        return cursor
+
+
+broker = Broker()
+
+
+def format_sse(message):
+    payload = json.dumps(message["data"], cls=DjangoJSONEncoder)
+    return f"id: {message['id']}\nevent: {message['event']}\ndata: {payload}\n\n"
+
+
+async def event_stream(last_id=0):
+    """Yield SSE frames, replaying anything newer than ``last_id`` first."""
+    from asgiref.sync import sync_to_async
+
+    yield "retry: 5000\n\n"
+    async with broker.subscribe() as queue:
+        backlog = await sync_to_async(backlog_since)(last_id)
+        if backlog is None:
+            yield f"event: {RELOAD}\ndata: {{}}\n\n"
+            return
+        replayed = set()
+        for message in backlog:
+            replayed.add(message["id"])
+            yield format_sse(message)
+        while True:
+            try:
+                message = await asyncio.wait_for(
+                    queue.get(), timeout=HEARTBEAT_SECONDS
+                )
+            except TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if message["id"] in replayed or message["id"] <= last_id:
+                continue
+            yield format_sse(message)
+
+
+####################################################################
+# Payloads shared by the initial render and the deltas
+####################################################################
+def goal_payload(goal):
+    current = float(goal.current_amount or 0)
+    target = float(goal.target_amount or 0)
+    return {
+        "id": goal.pk,
+        "title": goal.title,
+        "icon": goal.icon or "",
+        "type": goal.goal_type or "",
+        "priority": goal.priority,
+        "current": current,
+        "target": target,
+        "remaining": float(goal.remaining_amount),
+        "progress_pct": (current / target * 100) if target else 0,
+    }
+
+
+def task_bucket(task, today=None):
+    today = today or datetime.date.today()
+    if task.status == "IN_PROGRESS":
+        return "in_progress"
+    if task.status == "DONE":
+        return "done"
+    if task.due_date and task.due_date < today:
+        return "overdue"
+    return "upcoming"
+
+
+def task_payload(task, today=None):
+    return {
+        "id": task.pk,
+        "title": task.title,
+        "status": task.status,
+        "due_date": task.due_date,
+        "bucket": task_bucket(task, today),
+    }
+
+
+def month_finances(today=None):
+    from django.db.models import Q, Sum
+
+    from .models import PersonalFinancialEntry
+
+    today = today or datetime.date.today()
+    totals = PersonalFinancialEntry.objects.filter(
+        date__gte=today.replace(day=1), date__lte=today
+    ).aggregate(
+        income=Sum("amount", filter=Q(type="INCOME")),
+        expenses=Sum("amount", filter=Q(type="EXPENSE")),
+    )
+    income = float(totals["income"] or 0)
+    expenses = float(totals["expenses"] or 0)
+    return {"income": income, "expenses": expenses, "net": income - expenses}
+
+
+####################################################################
+# Signal entry points
+####################################################################
+def publish_on_commit(event, build):
+    """Publish once the surrounding transaction commits.
+
+    ``build`` is called lazily so rolled back writes never reach a screen.
+    """
+    from django.db import transaction
+
+    def send():
+        publish(event, build())
+
+    # The write is committed already; a lost screen update must not fail it.
+    transaction.on_commit(send, robust=True)
+
+
+def goal_changed(instance, deleted=False):
+    if deleted:
+        publish_on_commit("goal.deleted", lambda pk=instance.pk: {"id": pk})
+    else:
+        publish_on_commit("goal.updated", lambda: goal_payload(instance))
+
+
+def task_changed(instance, deleted=False):
+    if deleted:
+        publish_on_commit("task.deleted", lambda pk=instance.pk: {"id": pk})
+    else:
+        publish_on_commit("task.updated", lambda: task_payload(instance))
+
+
+def finance_changed(instance, deleted=False):
+    # Totals are re-aggregated rather than patched so an entry moved out of
+    # the current month is handled the same way as a new one.
+    publish_on_commit("finances.updated", month_finances)
+
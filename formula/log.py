@@ -0,0 +1,191 @@
+"""Logging that never blocks a request on disk.
+
+Loggers hand records to ``AsyncFileHandler``, which only puts them on an
+in-memory queue; a ``QueueListener`` thread formats them as JSON lines and
+writes them to a rotating file. When the queue is full, records are dropped
+and counted instead of waiting, and the next record that gets through
+reports how many were lost.
+
+High-volume loggers (``django.db.backends`` logs every SQL statement with
+``DEBUG``) pass through ``SamplingFilter``, which keeps a fraction of their
+debug/info records and every warning or error.
+
+Environment:
+
+- ``LOG_FILE`` (default ``debug.log`` in the project root)
+- ``LOG_LEVEL`` (default ``DEBUG`` with ``DEBUG``, else ``INFO``)
+- ``LOG_ROTATE``: ``size`` (``LOG_MAX_BYTES``, default 10 MB) or ``time``
+  (``LOG_WHEN``, default ``midnight``); ``LOG_BACKUP_COUNT`` files are kept
+- ``LOG_SQL_SAMPLE_RATE`` (default 0.01): share of SQL statements logged
+"""
+
+import atexit
+import copy
+import datetime
+import json
+import logging
+import queue
+import random
+from logging.handlers import (
+    QueueHandler,
+    QueueListener,
+    RotatingFileHandler,
+    TimedRotatingFileHandler,
+)
+from os import environ
+from pathlib import Path
+
+QUEUE_SIZE = 10_000
+
+# LogRecord attributes that are not "extra" fields.
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+####################################################################
+# Formatting and filtering
+####################################################################
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; ``extra={...}`` fields are included."""
+
+    def format(self, record):
+        data = {
+            "time": datetime.datetime.fromtimestamp(record.created, datetime.UTC).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exc"] = record.exc_text
+        for key, value in vars(record).items():
+            if key not in _RESERVED and not key.startswith("_"):
+                data[key] = value
+        return json.dumps(data, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep ``rate`` (0..1) of the records below ``WARNING``."""
+
+    def __init__(self, rate=1.0, name=""):
+        super().__init__(name)
+        self.rate = float(rate)
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or self.rate >= 1:
+            return True
+        return random.random() < self.rate
+
+
+####################################################################
+# Handler
+####################################################################
+class AsyncFileHandler(QueueHandler):
+    """Queue records for a background thread writing a rotating JSON file."""
+
+    def __init__(self, filename, rotate="size", max_bytes=10 * 1024 * 1024, when="midnight",
+                 backup_count=5, queue_size=QUEUE_SIZE):
+        super().__init__(queue.Queue(queue_size))
+        Path(filename).parent.mkdir(parents=True, exist_ok=True)
+        if rotate == "time":
+            target = TimedRotatingFileHandler(filename, when=when, backupCount=backup_count, encoding="utf-8")
+        else:
+            target = RotatingFileHandler(filename, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+        target.setFormatter(JsonFormatter())
+        self.target = target
+        self.dropped = 0
+        self.listener = QueueListener(self.queue, target, respect_handler_level=False)
+        self.listener.start()
+        atexit.register(self.stop)
+
+    def prepare(self, record):
+        # Resolve everything that depends on the caller now; the listener
+        # formats the record later on another thread.
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        request = getattr(record, "request", None)
+        if request is not None:
+            record.request = f"{getattr(request, 'method', '')} {getattr(request, 'path', request)}"
+        return record
+
+    def enqueue(self, record):
+        try:
+            if self.dropped:
+                notice = logging.makeLogRecord({
+                    "name": __name__,
+                    "levelno": logging.WARNING,
+                    "levelname": "WARNING",
+                    "msg": f"Log queue full, dropped {self.dropped} records",
+                })
+                self.queue.put_nowait(notice)
+                self.dropped = 0
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def stop(self):
+        if self.listener._thread is not None:
+            self.listener.stop()
+            self.target.close()
+
+    def close(self):
+        self.stop()
+        super().close()
+
+
+####################################################################
+# Settings
+####################################################################
+def _float(env, key, default):
+    try:
+        return float(env.get(key, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def logging_config(base_dir, debug=False, env=environ):
+    """``LOGGING`` for ``settings.py``."""
+    level = env.get("LOG_LEVEL", "DEBUG" if debug else "INFO").upper()
+    return {
+        "version": 1,
+        "disable_existing_loggers": False,
+        "filters": {
+            "sample_sql": {
+                "()": "formula.log.SamplingFilter",
+                "rate": _float(env, "LOG_SQL_SAMPLE_RATE", 0.01),
+            },
+        },
+        "handlers": {
+            "file": {
+                "()": "formula.log.AsyncFileHandler",
+                "level": level,
+                "filename": env.get("LOG_FILE") or str(base_dir / "debug.log"),
+                "rotate": env.get("LOG_ROTATE", "size"),
+                "max_bytes": int(_float(env, "LOG_MAX_BYTES", 10 * 1024 * 1024)),
+                "when": env.get("LOG_WHEN", "midnight"),
+                "backup_count": int(_float(env, "LOG_BACKUP_COUNT", 5)),
+            },
+        },
+        "loggers": {
+            "django": {
+                "handlers": ["file"],
+                "level": level,
+                "propagate": True,
+            },
+            "django.db.backends": {
+                "filters": ["sample_sql"],
+                "level": level,
+            },
+            "formula": {
+                "handlers": ["file"],
+                "level": level,
+                "propagate": False,
+            },
+        },
+    }
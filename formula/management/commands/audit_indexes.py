@@ -0,0 +1,421 @@
+import datetime
+import random
+import statistics
+import time
+from decimal import Decimal
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, models, transaction
+from django.db.models import Count, Q, Sum
+
+from formula.db import AUDIT_ALIAS, replica_aliases
+from formula.models import (
+    FileStorage,
+    Finance,
+    IFTAReport,
+    Load,
+    PersonalFinancialEntry,
+    PersonalProject,
+    PersonalTask,
+    Route,
+    Upload,
+)
+
+# Index names (from the model Meta) measured by dropping them temporarily.
+AUDITED_INDEXES = {
+    Upload: ["upload_created_idx"],
+    FileStorage: ["filestorage_uploaded_idx"],
+    IFTAReport: ["iftareport_created_idx"],
+    Load: ["load_created_idx", "load_pickup_idx", "load_route_pickup_idx"],
+    Finance: ["finance_date_idx", "finance_type_date_idx", "finance_category_date_idx"],
+    PersonalFinancialEntry: ["entry_date_created_idx", "entry_type_date_idx", "entry_category_date_idx"],
+    PersonalTask: ["task_status_due_idx", "task_project_dates_idx"],
+}
+EQUALITY_LOOKUPS = ("exact", "iexact", "in", "isnull")
+
+
+def query_shapes(today, using):
+    """The filters and orderings the views actually run.
+
+    A shape is a queryset, evaluated with ``list``, or a ``(queryset,
+    evaluate)`` pair for the ones the views aggregate.
+    """
+    month_start = today.replace(day=1)
+    finance = Finance.objects.using(using)
+    entries = PersonalFinancialEntry.objects.using(using)
+    loads = Load.objects.using(using)
+    tasks = PersonalTask.objects.using(using)
+    return {
+        "finance list (-date)": finance.order_by("-date")[:100],
+        "finance by type + range": finance.filter(
+            type="EXPENSE", date__gte=month_start, date__lte=today
+        ).order_by("-date")[:100],
+        "finance by category": finance.filter(category="Fuel").order_by("-date")[:100],
+        "personal finance list": entries.order_by("-date", "-created_at")[:10],
+        "personal finance month totals": (
+            entries.filter(date__gte=month_start, date__lte=today),
+            lambda queryset: queryset.aggregate(
+                income=Sum("amount", filter=Q(type="INCOME")),
+                expenses=Sum("amount", filter=Q(type="EXPENSE")),
+            ),
+        ),
+        "personal finance by category": entries.filter(category="Groceries").order_by("-date")[:100],
+        "loads (-created_at)": loads.order_by("-created_at")[:100],
+        "loads by pickup range": loads.filter(
+            pickup_date__gte=today - datetime.timedelta(days=30), pickup_date__lte=today
+        ).order_by("-created_at")[:100],
+        "loads by route + pickup": loads.filter(
+            route_id=1, pickup_date__gte=today - datetime.timedelta(days=90)
+        )[:100],
+        "files (-uploaded_at)": FileStorage.objects.using(using).order_by("-uploaded_at")[:10],
+        "ifta (-created_at)": IFTAReport.objects.using(using).order_by("-created_at")[:10],
+        "uploads (-created_at)": Upload.objects.using(using).order_by("-created_at")[:200],
+        "open tasks by due date": tasks.filter(status="TODO", due_date__lte=today).order_by("due_date")[:100],
+        "task status counts": tasks.values("status").annotate(n=Count("id")).order_by(),
+        "project tasks export": tasks.filter(project_id=1).order_by("project_id", "start_date", "due_date", "id"),
+    }
+
+
+def run(shape):
+    queryset, evaluate = shape if isinstance(shape, tuple) else (shape, list)
+    # A fresh clone each time, so nothing is served from the result cache.
+    return evaluate(queryset.all())
+
+
+def explain(shape, connection):
+    """EXPLAIN of the first query ``shape`` runs."""
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(connection) as queries:
+        run(shape)
+    sql = queries.captured_queries[0]["sql"]
+    prefix = "EXPLAIN QUERY PLAN " if connection.vendor == "sqlite" else "EXPLAIN "
+    with connection.cursor() as cursor:
+        cursor.execute(prefix + sql)
+        rows = cursor.fetchall()
+    return [str(row[-1]) for row in rows]
+
+
+def is_suspicious(plan):
+    """Full scans and temp sorts, the shapes an index would remove."""
+    text = " ".join(plan).upper()
+    return (
+        ("SCAN " in text and "USING" not in text and "COVERING" not in text)
+        or "TEMP B-TREE" in text
+        or "SEQ SCAN" in text
+    )
+
+
+####################################################################
+# Index proposals
+####################################################################
+def candidate_index(shape):
+    """``(model, fields)`` of the index that would serve ``shape``, or ``None``.
+
+    Equality filters come first, then the sort, then one range filter, so a
+    single b-tree walk both finds and orders the rows.
+    """
+    queryset = shape[0] if isinstance(shape, tuple) else shape
+    query = queryset.query
+    opts = query.model._meta
+    equal, ranges = [], []
+    if query.where.connector != "AND":
+        return None
+    for lookup in query.where.children:
+        target = getattr(getattr(lookup, "lhs", None), "target", None)
+        if target is None or target.model is not query.model:
+            continue
+        (equal if lookup.lookup_name in EQUALITY_LOOKUPS else ranges).append(target.name)
+    if isinstance(query.group_by, tuple):
+        equal += [col.target.name for col in query.group_by if hasattr(col, "target")]
+    ordering = query.order_by or (opts.ordering if query.default_ordering else ())
+    sort = []
+    for name in ordering:
+        if not isinstance(name, str):
+            break
+        name = name.lstrip("-")
+        sort.append(opts.pk.name if name == "pk" else opts.get_field(name).name)
+    fields = list(dict.fromkeys(equal + sort + ranges[:1]))
+    if not fields or fields == [opts.pk.name]:
+        return None
+    return query.model, fields
+
+
+def existing_indexes(model):
+    """Field lists of the indexes ``model`` already has."""
+    opts = model._meta
+    indexes = [[name.lstrip("-") for name in index.fields] for index in opts.indexes]
+    indexes += [list(fields) for fields in opts.unique_together]
+    indexes += [[field.name] for field in opts.concrete_fields if field.db_index or field.unique]
+    return indexes
+
+
+def is_covered(model, fields):
+    return any(index[: len(fields)] == fields for index in existing_indexes(model))
+
+
+####################################################################
+# Throwaway database
+####################################################################
+def same_database(a, b):
+    keys = ("ENGINE", "NAME", "HOST", "PORT")
+    return all(str(a.get(key) or "") == str(b.get(key) or "") for key in keys)
+
+
+def schema_models():
+    return [
+        model
+        for model in apps.get_models()
+        if model._meta.managed and not model._meta.proxy and not model._meta.swapped
+    ]
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed synthetic rows into a throwaway database, run the views' query "
+        "shapes, report EXPLAIN plans and latency with and without the hot "
+        "filter indexes, and propose indexes for queries that still scan or sort."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            required=True,
+            help=f"an empty throwaway database, never default (e.g. {AUDIT_ALIAS!r} from AUDIT_DATABASE_URL)",
+        )
+        parser.add_argument("--rows", type=int, default=50_000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--plans", action="store_true", help="print every plan, not only suspicious ones")
+
+    def handle(self, *args, **options):
+        alias = options["database"]
+        connection = self.throwaway_connection(alias)
+        self.create_schema(connection)
+        try:
+            with transaction.atomic(using=alias):
+                self.seed(alias, options)
+                shapes = query_shapes(datetime.date.today(), alias)
+                current = self.measure(connection, shapes, options, "current indexes")
+                proposals = self.propose(shapes, current)
+                proposed = {}
+                if proposals:
+                    indexes = {(model, index.name): index for model, index in proposals.values()}
+                    self.create_indexes(connection, indexes)
+                    proposed = self.measure(
+                        connection, {name: shapes[name] for name in proposals}, options, "proposed indexes"
+                    )
+                    self.drop_indexes(connection, {model: [name] for model, name in indexes})
+                self.drop_indexes(connection, AUDITED_INDEXES)
+                without = self.measure(connection, shapes, options, "without indexes")
+                self.report(shapes, without, current, proposed)
+                self.suggest(proposals, current, proposed)
+                raise Rollback
+        except Rollback:
+            pass
+        finally:
+            self.drop_schema(connection)
+        self.stdout.write(f"Synthetic data, indexes and tables removed from {alias!r}.")
+
+    def throwaway_connection(self, alias):
+        """The connection for ``alias``, refusing anything that holds real data."""
+        if alias not in settings.DATABASES:
+            raise CommandError(
+                f"Unknown database {alias!r}. Set AUDIT_DATABASE_URL to an empty "
+                f"throwaway database and pass --database {AUDIT_ALIAS}."
+            )
+        connection = connections[alias]
+        for other in (DEFAULT_DB_ALIAS, *replica_aliases()):
+            if alias == other or same_database(connection.settings_dict, connections[other].settings_dict):
+                raise CommandError(
+                    f"Refusing to seed rows and drop indexes in {alias!r}: it is the {other!r} database."
+                )
+        if connection.introspection.table_names():
+            raise CommandError(
+                f"Database {alias!r} is not empty. The audit creates and drops its own "
+                "tables and only runs against an empty throwaway database."
+            )
+        return connection
+
+    def create_schema(self, connection):
+        # Straight from the models: the data migrations use the default
+        # managers, which the router sends to the default database.
+        with connection.schema_editor() as editor:
+            for model in schema_models():
+                editor.create_model(model)
+
+    def drop_schema(self, connection):
+        existing = set(connection.introspection.table_names())
+        with connection.schema_editor() as editor:
+            for model in reversed(schema_models()):
+                if model._meta.db_table in existing:
+                    editor.delete_model(model)
+
+    def seed(self, alias, options):
+        rng = random.Random(options["seed"])
+        rows = options["rows"]
+        today = datetime.date.today()
+        started = time.perf_counter()
+
+        def day():
+            return today - datetime.timedelta(days=rng.randint(0, 1500))
+
+        categories = ["Fuel", "Repairs", "Insurance", "Tolls", "Payroll", "Groceries", "Rent", "Other"]
+        Finance.objects.using(alias).bulk_create(
+            (
+                Finance(
+                    category=rng.choice(categories),
+                    type=rng.choice(["INCOME", "EXPENSE", None]),
+                    amount=rng.uniform(-500, 500),
+                    date=day(),
+                )
+                for _ in range(rows)
+            ),
+            batch_size=2000,
+        )
+        PersonalFinancialEntry.objects.using(alias).bulk_create(
+            (
+                PersonalFinancialEntry(
+                    category=rng.choice(categories),
+                    type=rng.choice(["INCOME", "EXPENSE"]),
+                    amount=Decimal(rng.randint(1, 50000)) / 100,
+                    date=day(),
+                )
+                for _ in range(rows)
+            ),
+            batch_size=2000,
+        )
+        routes = Route.objects.using(alias).bulk_create(
+            Route(name=f"Route {i}", start_location="A", end_location="B", distance=i) for i in range(200)
+        )
+        Load.objects.using(alias).bulk_create(
+            (
+                Load(
+                    load_name=f"Load {i}",
+                    description="",
+                    pickup_date=(pickup := day()),
+                    delivery_date=pickup + datetime.timedelta(days=rng.randint(0, 5)),
+                    route=rng.choice(routes),
+                )
+                for i in range(rows)
+            ),
+            batch_size=2000,
+        )
+        FileStorage.objects.using(alias).bulk_create(
+            (FileStorage(name=f"File {i}", file=f"files/{i}.pdf") for i in range(rows)),
+            batch_size=2000,
+        )
+        IFTAReport.objects.using(alias).bulk_create(
+            (
+                IFTAReport(report_name=f"Q{i}", start_date=day(), end_date=today, total_miles=1000, total_fuel=150)
+                for i in range(rows // 10)
+            ),
+            batch_size=2000,
+        )
+        Upload.objects.using(alias).bulk_create(
+            (Upload(file=f"assignments/{i}.pdf", original_name=f"{i}.pdf") for i in range(rows // 10)),
+            batch_size=2000,
+        )
+        projects = PersonalProject.objects.using(alias).bulk_create(
+            PersonalProject(name=f"Project {i}") for i in range(100)
+        )
+        PersonalTask.objects.using(alias).bulk_create(
+            (
+                PersonalTask(
+                    project=rng.choice(projects),
+                    title=f"Task {i}",
+                    status=rng.choice(["TODO", "IN_PROGRESS", "DONE", "DONE"]),
+                    start_date=(start := day()),
+                    due_date=start + datetime.timedelta(days=rng.randint(0, 60)),
+                )
+                for i in range(rows)
+            ),
+            batch_size=2000,
+        )
+        with connections[alias].cursor() as cursor:
+            cursor.execute("ANALYZE")
+        self.stdout.write(f"Seeded ~{rows} rows per table in {time.perf_counter() - started:.1f}s")
+
+    def measure(self, connection, shapes, options, label):
+        results = {}
+        for name, shape in shapes.items():
+            run(shape)  # warm up
+            timings = []
+            for _ in range(options["repeat"]):
+                started = time.perf_counter()
+                run(shape)
+                timings.append(time.perf_counter() - started)
+            plan = explain(shape, connection)
+            results[name] = (statistics.median(timings), plan)
+            if options["plans"] or is_suspicious(plan):
+                self.stdout.write(f"[{label}] {name}:")
+                for line in plan:
+                    self.stdout.write(f"    {line}")
+        return results
+
+    def propose(self, shapes, measured):
+        """``{shape name: (model, Index)}`` for scans no existing index covers."""
+        proposals, indexes = {}, {}
+        for name, shape in shapes.items():
+            candidate = candidate_index(shape) if is_suspicious(measured[name][1]) else None
+            if candidate is None or is_covered(*candidate):
+                continue
+            model, fields = candidate
+            if (model, tuple(fields)) not in indexes:
+                index = models.Index(fields=fields)
+                index.set_name_with_model(model)
+                indexes[model, tuple(fields)] = index
+            proposals[name] = (model, indexes[model, tuple(fields)])
+        return proposals
+
+    def create_indexes(self, connection, indexes):
+        # Plain statements: the SQLite schema editor can't be entered inside
+        # the transaction.
+        editor = connection.schema_editor()
+        with connection.cursor() as cursor:
+            for (model, _name), index in indexes.items():
+                cursor.execute(str(index.create_sql(model, editor)))
+            cursor.execute("ANALYZE")
+
+    def drop_indexes(self, connection, indexes):
+        with connection.cursor() as cursor:
+            for names in indexes.values():
+                for name in names:
+                    cursor.execute(f"DROP INDEX {connection.ops.quote_name(name)}")
+            cursor.execute("ANALYZE")
+
+    def report(self, shapes, before, after, proposed):
+        self.stdout.write("")
+        self.stdout.write(f"{'query':<34} {'before':>10} {'after':>10} {'speedup':>8}")
+        for name in shapes:
+            old, _plan = before[name]
+            new, plan = after[name]
+            line = f"{name:<34} {old * 1000:>8.2f}ms {new * 1000:>8.2f}ms {old / new if new else 0:>7.1f}x"
+            if name in proposed:
+                line += f"  {proposed[name][0] * 1000:.2f}ms with the proposed index"
+            if is_suspicious(plan):
+                self.stdout.write(self.style.WARNING(f"{line}  still scans"))
+            else:
+                self.stdout.write(self.style.SUCCESS(line))
+
+    def suggest(self, proposals, current, proposed):
+        helpful = {}
+        for name, (model, index) in proposals.items():
+            if proposed[name][0] < current[name][0]:
+                helpful.setdefault((model, index.name), (model, index, []))[2].append(name)
+        self.stdout.write("")
+        if not helpful:
+            self.stdout.write("No missing indexes to propose.")
+            return
+        self.stdout.write("Proposed indexes; add them to the model's Meta.indexes and run makemigrations:")
+        for model, index, names in helpful.values():
+            self.stdout.write(
+                f"    {model.__name__}: models.Index(fields={index.fields!r}, name={index.name!r}),"
+                f"  # {', '.join(names)}"
+            )
@@ -0,0 +1,123 @@
+import datetime
+import random
+import time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from formula import standings
+from formula.models import Circuit, Constructor, Driver, Race, Standing
+from formula.sites import formula_admin_site
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed synthetic standings inside a rolled back transaction and time the "
+        "driver admin changelist (queryset + list_display) against them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--standings", type=int, default=100_000)
+        parser.add_argument("--drivers", type=int, default=500)
+        parser.add_argument("--pages", type=int, default=3)
+        parser.add_argument("--ordering", default="", help="changelist ?o= value, e.g. -3")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.seed(options)
+                self.measure(options)
+                raise Rollback
+        except Rollback:
+            self.stdout.write("Synthetic data rolled back.")
+
+    def seed(self, options):
+        rng = random.Random(options["seed"])
+        started = time.perf_counter()
+        circuits = Circuit.objects.bulk_create(
+            Circuit(name=f"Circuit {i}", city="City", country="Country") for i in range(30)
+        )
+        constructors = Constructor.objects.bulk_create(
+            Constructor(name=f"Constructor {i}") for i in range(20)
+        )
+        drivers = Driver.objects.bulk_create(
+            Driver(first_name=f"First{i}", last_name=f"Last{i}", code=f"{i % 1000:03d}")
+            for i in range(options["drivers"])
+        )
+        through = Driver.constructors.through
+        through.objects.bulk_create(
+            through(driver_id=d.pk, constructor_id=c.pk)
+            for d in drivers
+            for c in rng.sample(constructors, k=rng.randint(1, 3))
+        )
+        race_count = max(options["standings"] // 20, 1)
+        races = Race.objects.bulk_create(
+            (
+                Race(
+                    circuit=rng.choice(circuits),
+                    winner=rng.choice(drivers),
+                    year=2000 + i % 25,
+                    laps=rng.randint(40, 70),
+                    date=datetime.date(2000 + i % 25, 1, 1) + datetime.timedelta(days=i % 300),
+                )
+                for i in range(race_count)
+            ),
+            batch_size=1000,
+        )
+        Standing.objects.bulk_create(
+            (
+                Standing(
+                    race=races[i % race_count],
+                    driver=rng.choice(drivers),
+                    constructor=rng.choice(constructors),
+                    position=i % 20 + 1,
+                    number=rng.randint(1, 99),
+                    laps=rng.randint(40, 70),
+                    points=Decimal(rng.randint(0, 25)),
+                )
+                for i in range(options["standings"])
+            ),
+            batch_size=2000,
+        )
+        # bulk_create skips signals; fill the season tables the admin reads.
+        standings.rebuild()
+        self.stdout.write(
+            f"Seeded {len(drivers)} drivers, {race_count} races, "
+            f"{options['standings']} standings in {time.perf_counter() - started:.1f}s"
+        )
+
+    def measure(self, options):
+        model_admin = formula_admin_site._registry[Driver]
+        user = get_user_model()(username="benchmark", is_staff=True, is_superuser=True, is_active=True)
+        factory = RequestFactory()
+        for page in range(1, options["pages"] + 1):
+            params = {"p": page}
+            if options["ordering"]:
+                params["o"] = options["ordering"]
+            request = factory.get("/admin/formula/driver/", params)
+            request.user = user
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                changelist = model_admin.get_changelist_instance(request)
+                rows = list(changelist.result_list)
+                for row in rows:
+                    for name in model_admin.get_list_display(request):
+                        attr = getattr(model_admin, name, None)
+                        if callable(attr):
+                            attr(row)
+                elapsed = time.perf_counter() - started
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"page {page}: {len(rows)} rows, {len(queries)} queries, "
+                    f"{elapsed * 1000:.1f} ms"
+                )
+            )
@@ -0,0 +1,68 @@
+import datetime
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from formula.scheduling import TaskSpec, build_days, schedule_tasks
+
+
+class Command(BaseCommand):
+    help = "Time the project scheduler engine on synthetic tasks (no database access)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, default=3000)
+        parser.add_argument("--weeks", type=int, default=26)
+        parser.add_argument("--min-block", type=int, default=30)
+        parser.add_argument("--dependency-rate", type=float, default=0.3)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        today = datetime.date.today()
+        monday = today - datetime.timedelta(days=today.weekday())
+        horizon = options["weeks"] * 7
+
+        tasks = []
+        for i in range(options["tasks"]):
+            depends_on = ()
+            if i and rng.random() < options["dependency_rate"]:
+                depends_on = tuple(rng.sample(range(i), k=min(i, rng.randint(1, 2))))
+            tasks.append(
+                TaskSpec(
+                    id=i,
+                    title=f"Task {i}",
+                    minutes=rng.randint(15, 240),
+                    due_date=monday + datetime.timedelta(days=rng.randint(0, horizon)),
+                    priority=rng.choice(["HIGH", "MEDIUM", "LOW", None]),
+                    created=float(i),
+                    depends_on=depends_on,
+                )
+            )
+        # Weekday evenings plus a longer weekend session
+        windows = {d: [(18 * 60, 22 * 60)] for d in range(5)}
+        windows.update({5: [(9 * 60, 12 * 60), (13 * 60, 17 * 60)], 6: [(10 * 60, 14 * 60)]})
+
+        timings = []
+        result = None
+        for _ in range(options["repeat"]):
+            days = build_days(monday, options["weeks"], windows)
+            started = time.perf_counter()
+            result = schedule_tasks(tasks, days, min_block=options["min_block"])
+            timings.append(time.perf_counter() - started)
+
+        placed = sum(b.duration for b in result.blocks)
+        wanted = sum(t.minutes for t in tasks)
+        self.stdout.write(
+            f"{len(tasks)} tasks over {horizon} days: {len(result.blocks)} blocks, "
+            f"{placed / 60:.0f}h of {wanted / 60:.0f}h placed, "
+            f"{len(result.unscheduled)} unscheduled, {len(result.late)} late"
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"best {min(timings) * 1000:.1f} ms, "
+                f"median {sorted(timings)[len(timings) // 2] * 1000:.1f} ms "
+                f"({options['repeat']} runs)"
+            )
+        )
@@ -0,0 +1,66 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.urls import reverse_lazy
+
+from formula.models import Route
+from formula.tables import Actions, Column, Table
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed synthetic routes inside a rolled back transaction and time the "
+        "route table built row by row against formula.tables.Table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                Route.objects.bulk_create(
+                    (
+                        Route(name=f"Route {i}", start_location="A", end_location="B", distance=i)
+                        for i in range(options["rows"])
+                    ),
+                    batch_size=2000,
+                )
+                self.measure()
+                raise Rollback
+        except Rollback:
+            self.stdout.write("Synthetic data rolled back.")
+
+    def measure(self):
+        started = time.perf_counter()
+        rows = []
+        for r in Route.objects.order_by("-pk"):
+            edit_url = reverse_lazy("route_edit", args=[r.pk])
+            delete_url = reverse_lazy("route_delete", args=[r.pk])
+            actions = f'<a class="text-blue-600 hover:underline mr-2" href="{edit_url}">Edit</a>' \
+                      f'<a class="text-red-600 hover:underline" href="{delete_url}">Delete</a>'
+            rows.append([r.name, r.start_location, r.end_location, r.distance, r.created_at.strftime("%Y-%m-%d"), actions])
+        self.stdout.write(f"row by row: {len(rows)} rows in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+        started = time.perf_counter()
+        table = Table(
+            Route.objects.all(),
+            [
+                Column("Name", "name"),
+                Column("Start", "start_location"),
+                Column("End", "end_location"),
+                Column("Distance", "distance"),
+                Column("Created", "created_at", render=lambda r: r["created_at"].strftime("%Y-%m-%d")),
+                Actions(edit="route_edit", delete="route_delete"),
+            ],
+            per_page=None,
+        )
+        rows = table.as_dict()["rows"]
+        self.stdout.write(
+            self.style.SUCCESS(f"Table: {len(rows)} rows in {(time.perf_counter() - started) * 1000:.1f} ms")
+        )
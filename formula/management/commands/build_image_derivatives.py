@@ -0,0 +1,52 @@
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from formula.images import IMAGE_FIELDS, generate
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the resized WebP/JPEG variants of every uploaded image that "
+        "doesn't have them yet (all of them with --force)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model", action="append", default=[], help="e.g. formula.Car; repeatable")
+        parser.add_argument("--force", action="store_true", help="rewrite variants that already exist")
+
+    def handle(self, *args, **options):
+        fields = IMAGE_FIELDS
+        if options["model"]:
+            unknown = set(options["model"]) - set(IMAGE_FIELDS)
+            if unknown:
+                raise CommandError(f"No image field registered for {', '.join(sorted(unknown))}")
+            fields = {label: IMAGE_FIELDS[label] for label in options["model"]}
+
+        started = time.perf_counter()
+        built = failed = 0
+        seen = set()
+        for label, field in fields.items():
+            model = apps.get_model(label)
+            names = (
+                model.objects.exclude(**{field: ""}).exclude(**{f"{field}__isnull": True})
+                .values_list(field, flat=True).distinct()
+            )
+            for name in names.iterator():
+                if name in seen:
+                    continue
+                seen.add(name)
+                try:
+                    entry = generate(name, force=options["force"])
+                except Exception as e:
+                    failed += 1
+                    self.stdout.write(self.style.ERROR(f"{label} {name}: {e}"))
+                    continue
+                built += 1
+                self.stdout.write(f"{label} {name}: {entry['width']}x{entry['height']}", ending="\r")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Built variants for {built} images in {time.perf_counter() - started:.1f} s")
+            + (f", {failed} failed" if failed else "")
+        )
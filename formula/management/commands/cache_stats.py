@@ -0,0 +1,47 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+from formula.caching import NAMESPACES
+
+
+class Command(BaseCommand):
+    help = (
+        "Show the configured cache backend and the hit rate of every cache "
+        "namespace, summed over all processes sharing the cache."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="zero the counters after printing them")
+        parser.add_argument("--bump", metavar="NAMESPACE", action="append", default=[], help="invalidate a namespace")
+
+    def handle(self, *args, **options):
+        config = settings.CACHES["default"]
+        started = time.perf_counter()
+        cache.set("cache_stats:ping", 1, 10)
+        ok = cache.get("cache_stats:ping") == 1
+        elapsed = (time.perf_counter() - started) * 1000
+        status = self.style.SUCCESS if ok else self.style.ERROR
+        self.stdout.write(status(f"{config['BACKEND']} {config.get('LOCATION', '')} round trip {elapsed:.1f} ms"))
+        if "locmem" in config["BACKEND"]:
+            self.stdout.write(self.style.WARNING("  local memory: every process has its own cache and counters"))
+
+        for name in options["bump"]:
+            if name not in NAMESPACES:
+                self.stdout.write(self.style.ERROR(f"Unknown namespace {name!r}"))
+                continue
+            NAMESPACES[name].bump()
+            self.stdout.write(f"Bumped {name}")
+
+        self.stdout.write(f"{'namespace':<20} {'version':>7} {'hits':>9} {'misses':>9} {'hit rate':>9}")
+        for name in sorted(NAMESPACES):
+            namespace = NAMESPACES[name]
+            stats = namespace.stats()
+            rate = f"{stats['hit_rate'] * 100:.1f}%" if stats["hit_rate"] is not None else "-"
+            self.stdout.write(
+                f"{name:<20} {stats['version']:>7} {stats['hits']:>9} {stats['misses']:>9} {rate:>9}"
+            )
+            if options["reset"]:
+                namespace.reset_stats()
@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Connect to every configured database alias and report the backend, "
+        "connection settings and (for SQLite) the active pragmas."
+    )
+
+    def handle(self, *args, **options):
+        for alias in connections:
+            connection = connections[alias]
+            settings_dict = connection.settings_dict
+            started = time.perf_counter()
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                    cursor.fetchone()
+            except Exception as exc:
+                self.stdout.write(self.style.ERROR(f"{alias}: {exc}"))
+                continue
+            elapsed = (time.perf_counter() - started) * 1000
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{alias}: {connection.vendor} {connection.display_name} "
+                    f"{settings_dict.get('HOST') or settings_dict['NAME']} ({elapsed:.1f} ms)"
+                )
+            )
+            self.stdout.write(
+                f"  CONN_MAX_AGE={settings_dict.get('CONN_MAX_AGE')} "
+                f"CONN_HEALTH_CHECKS={settings_dict.get('CONN_HEALTH_CHECKS')} "
+                f"server-side cursors={'off' if settings_dict.get('DISABLE_SERVER_SIDE_CURSORS') else 'on'}"
+            )
+            if connection.vendor == "sqlite":
+                with connection.cursor() as cursor:
+                    for pragma in ("journal_mode", "synchronous", "busy_timeout", "foreign_keys"):
+                        cursor.execute(f"PRAGMA {pragma}")
+                        self.stdout.write(f"  {pragma}={cursor.fetchone()[0]}")
+            elif connection.vendor == "postgresql":
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT version(), pg_is_in_recovery()")
+                    version, in_recovery = cursor.fetchone()
+                    self.stdout.write(f"  {version}")
+                    self.stdout.write(f"  role={'replica' if in_recovery else 'primary'}")
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from formula import blobs
+
+
+def _mb(size):
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount references to content-addressed uploads and delete blobs and links no row refers to. "
+        "--adopt first moves files uploaded before content addressing into blobs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--grace-hours", type=float, default=blobs.GRACE_SECONDS / 3600)
+        parser.add_argument("--dry-run", action="store_true")
+        parser.add_argument("--adopt", action="store_true")
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        if options["adopt"]:
+            adopted = blobs.adopt(dry_run=dry_run)
+            self.stdout.write(f"{'Would adopt' if dry_run else 'Adopted'} {adopted} files.")
+        removed, links, freed = blobs.collect(grace=options["grace_hours"] * 3600, dry_run=dry_run)
+        unique, referenced = blobs.usage()
+        self.stdout.write(f"Stored {_mb(unique)} for {_mb(referenced)} of referenced files.")
+        verb = "Would remove" if dry_run else "Removed"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {removed} blobs ({_mb(freed)}) and {links} links."))
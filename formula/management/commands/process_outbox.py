@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from formula import outbox
+
+
+class Command(BaseCommand):
+    help = (
+        "Send due outbox emails with retries and backoff, batching busy "
+        "recipients into digests. Runs once, or keeps polling with --loop."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="keep running, polling every --interval seconds")
+        parser.add_argument("--interval", type=float, default=5.0)
+        parser.add_argument("--batch", type=int, default=outbox.BATCH_SIZE)
+        parser.add_argument("--digest-threshold", type=int, default=outbox.DIGEST_THRESHOLD,
+                            help="messages per recipient that are sent as one digest (0 = never)")
+
+    def handle(self, *args, **options):
+        while True:
+            sent, retried, failed = outbox.process(options["batch"], options["digest_threshold"])
+            if sent or retried or failed:
+                self.stdout.write(f"sent {sent}, retrying {retried}, failed {failed}")
+            if not options["loop"]:
+                break
+            # A full batch means more are probably due; go again right away.
+            if sent + retried + failed < options["batch"]:
+                time.sleep(options["interval"])
+        self.stdout.write(self.style.SUCCESS("Outbox processed."))
@@ -0,0 +1,23 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from formula import uploads
+from formula.models import UploadSession
+
+
+class Command(BaseCommand):
+    help = "Delete resumable uploads that were not touched for --days days, with their partial files."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=float, default=7)
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - datetime.timedelta(days=options["days"])
+        stale = UploadSession.objects.filter(updated_at__lt=cutoff)
+        count = 0
+        for session in stale.iterator():
+            uploads.terminate(session)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f"Removed {count} stale uploads."))
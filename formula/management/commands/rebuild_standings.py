@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from formula import dashboard, standings
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the driver and constructor season standings tables from "
+        "standings and race winners (after bulk imports or raw SQL edits)."
+    )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        drivers, constructors = standings.rebuild()
+        dashboard.invalidate()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt {drivers} driver and {constructors} constructor season rows "
+                f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+            )
+        )
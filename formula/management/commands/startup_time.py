@@ -0,0 +1,94 @@
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter so nothing is imported yet.
+PROBE = """
+import time
+started = time.perf_counter()
+import django
+django.setup()
+if {urls!r}:
+    from django.urls import get_resolver
+    get_resolver().url_patterns
+print(f"startup {{(time.perf_counter() - started) * 1000:.3f}}")
+"""
+
+IMPORTTIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|\s+(\S+)$")
+
+
+class Command(BaseCommand):
+    help = (
+        "Time a cold start (imports, django.setup() and optionally the URL "
+        "conf) in fresh processes, list the slowest imports from -X importtime "
+        "and fail when the best run is over --budget milliseconds."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--budget", type=float, default=float(os.environ.get("STARTUP_BUDGET_MS", 0) or 0),
+                            help="maximum cold start in ms (default STARTUP_BUDGET_MS, 0 = report only)")
+        parser.add_argument("--runs", type=int, default=5)
+        parser.add_argument("--top", type=int, default=15)
+        parser.add_argument("--urls", action="store_true", help="include loading the URL conf (first request)")
+
+    def handle(self, *args, **options):
+        probe = PROBE.format(urls=options["urls"])
+        timings = [self.startup(probe) for _ in range(max(options["runs"], 1))]
+        best = min(timings)
+        self.stdout.write(
+            f"Cold start over {len(timings)} runs: best {best:.0f} ms, median {statistics.median(timings):.0f} ms"
+        )
+
+        modules = self.importtime(probe)
+        packages = {}
+        for name, self_us, _ in modules:
+            root = name.split(".")[0]
+            packages[root] = packages.get(root, 0) + self_us
+        total = sum(packages.values())
+
+        self.stdout.write(f"\n{'package':<40} {'ms':>8} {'share':>7}")
+        for root, self_us in sorted(packages.items(), key=lambda item: -item[1])[: options["top"]]:
+            self.stdout.write(f"{root:<40} {self_us / 1000:>8.1f} {self_us / total * 100:>6.1f}%")
+
+        self.stdout.write(f"\n{'module (cumulative)':<60} {'ms':>8}")
+        for name, _, cumulative_us in sorted(modules, key=lambda item: -item[2])[: options["top"]]:
+            self.stdout.write(f"{name:<60} {cumulative_us / 1000:>8.1f}")
+
+        budget = options["budget"]
+        if not budget:
+            return
+        if best > budget:
+            raise CommandError(f"Cold start {best:.0f} ms is over the {budget:.0f} ms budget")
+        self.stdout.write(self.style.SUCCESS(f"\nCold start {best:.0f} ms is within the {budget:.0f} ms budget"))
+
+    def run(self, probe, *flags):
+        result = subprocess.run(
+            [sys.executable, *flags, "-c", probe],
+            cwd=settings.BASE_DIR,
+            env={**os.environ, "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", "formula.settings")},
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode:
+            raise CommandError(f"Startup probe failed:\n{result.stderr}")
+        return result
+
+    def startup(self, probe):
+        # Without -X importtime, which adds its own overhead to every import.
+        output = self.run(probe).stdout
+        return float(re.search(r"^startup (\S+)$", output, re.MULTILINE).group(1))
+
+    def importtime(self, probe):
+        """``[(module, self µs, cumulative µs), ...]`` for one cold start."""
+        modules = []
+        for line in self.run(probe, "-X", "importtime").stderr.splitlines():
+            match = IMPORTTIME.match(line)
+            if match:
+                self_us, cumulative_us, name = match.groups()
+                modules.append((name, int(self_us), int(cumulative_us)))
+        return modules
@@ -0,0 +1,89 @@
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management.base import BaseCommand, CommandError
+
+from formula.vite import immutable_file_test
+
+
+def size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Report the size of the collected static files as served: raw, gzip "
+        "and brotli per directory and for the largest files, and flag files "
+        "that are not served as immutable."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top", type=int, default=20)
+        parser.add_argument("--prefix", default="", help="only files under this path, e.g. assets/")
+
+    def handle(self, *args, **options):
+        load_manifest = getattr(staticfiles_storage, "load_manifest", None)
+        hashed_files = load_manifest() if load_manifest else {}
+        if not hashed_files:
+            raise CommandError("No static files manifest; run collectstatic first.")
+
+        rows = []
+        for name in sorted(set(hashed_files.values())):
+            if not name.startswith(options["prefix"]):
+                continue
+            path = staticfiles_storage.path(name)
+            raw = size(path)
+            if raw is None:
+                continue
+            rows.append({
+                "name": name,
+                "raw": raw,
+                "gzip": size(f"{path}.gz"),
+                "brotli": size(f"{path}.br"),
+                "immutable": immutable_file_test(path, settings.STATIC_URL + name),
+            })
+        if not rows:
+            self.stdout.write("No files.")
+            return
+
+        def served(row):
+            return min(s for s in (row["raw"], row["gzip"], row["brotli"]) if s is not None)
+
+        directories = {}
+        for row in rows:
+            directory = row["name"].split("/", 1)[0] if "/" in row["name"] else "."
+            totals = directories.setdefault(directory, [0, 0, 0])
+            totals[0] += 1
+            totals[1] += row["raw"]
+            totals[2] += served(row)
+
+        self.stdout.write(f"{'directory':<40} {'files':>6} {'raw KB':>10} {'served KB':>10}")
+        for directory, (count, raw, best) in sorted(directories.items(), key=lambda item: -item[1][1]):
+            self.stdout.write(f"{directory:<40} {count:>6} {raw / 1024:>10.1f} {best / 1024:>10.1f}")
+
+        def kb(value):
+            return f"{value / 1024:.1f}" if value is not None else "-"
+
+        self.stdout.write(f"\n{'largest files':<60} {'raw KB':>8} {'gzip':>8} {'brotli':>8}")
+        for row in sorted(rows, key=lambda row: -row["raw"])[: options["top"]]:
+            flag = "" if row["immutable"] else "  (revalidated)"
+            self.stdout.write(
+                f"{row['name']:<60} {kb(row['raw']):>8} {kb(row['gzip']):>8} {kb(row['brotli']):>8}{flag}"
+            )
+
+        raw = sum(row["raw"] for row in rows)
+        best = sum(served(row) for row in rows)
+        mutable = sum(1 for row in rows if not row["immutable"])
+        without_brotli = sum(1 for row in rows if row["gzip"] is not None and row["brotli"] is None)
+        self.stdout.write(
+            f"\n{len(rows)} files, {raw / 1024:.1f} KB raw, {best / 1024:.1f} KB served "
+            f"({(1 - best / raw) * 100 if raw else 0:.0f}% saved)"
+        )
+        if mutable:
+            self.stdout.write(self.style.WARNING(f"{mutable} files are not served as immutable"))
+        if without_brotli:
+            self.stdout.write(self.style.WARNING(f"{without_brotli} files have gzip but no brotli copy"))
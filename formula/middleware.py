@@ -42,6 +42,7 @@ class PublicLoginExemptMiddleware:
         "/cars/",
         "/contact/submit/",
         "/login/",
+        "/calendar/",  # ICS subscriptions authenticate with a URL token
         settings.STATIC_URL,
         settings.MEDIA_URL,
         "/__debug__/",
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('formula', '0046_car_lead'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='personaltask',
+            name='depends_on',
+            field=models.ManyToManyField(blank=True, related_name='dependents', to='formula.personaltask'),
+        ),
+    ]
@@ -0,0 +1,62 @@
+import datetime
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def blobs_to_blocks(apps, schema_editor):
+    """Copy blocks out of the weekly JSON blobs; keep only the window settings."""
+    PersonalSchedule = apps.get_model('formula', 'PersonalSchedule')
+    PersonalScheduleBlock = apps.get_model('formula', 'PersonalScheduleBlock')
+    PersonalTask = apps.get_model('formula', 'PersonalTask')
+    task_ids = set(PersonalTask.objects.values_list('id', flat=True))
+    rows = []
+    for schedule in PersonalSchedule.objects.all():
+        data = dict(schedule.data or {})
+        for day in data.pop('days', None) or []:
+            try:
+                date = datetime.date.fromisoformat(day.get('date'))
+            except (TypeError, ValueError):
+                continue
+            for block in day.get('blocks') or []:
+                if block.get('task_id') not in task_ids:
+                    continue
+                try:
+                    start = datetime.time.fromisoformat(block['start'])
+                    end = datetime.time.fromisoformat(block['end'])
+                except (KeyError, TypeError, ValueError):
+                    continue
+                rows.append(PersonalScheduleBlock(task_id=block['task_id'], date=date, start=start, end=end))
+        schedule.data = data
+        schedule.save(update_fields=['data'])
+    PersonalScheduleBlock.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('formula', '0047_personaltask_depends_on'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PersonalScheduleBlock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('start', models.TimeField()),
+                ('end', models.TimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schedule_blocks', to='formula.personaltask')),
+            ],
+            options={
+                'db_table': 'personal_schedule_blocks',
+                'ordering': ['date', 'start'],
+                'indexes': [
+                    models.Index(fields=['date', 'start'], name='schedule_block_date_idx'),
+                    models.Index(fields=['task', 'date'], name='schedule_block_task_idx'),
+                ],
+            },
+        ),
+        migrations.RunPython(blobs_to_blocks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('formula', '0049_personalproject_updated_at_personaltask_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='personalproject',
+            index=models.Index(fields=['start_date', 'end_date'], name='project_dates_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='personalproject',
+            index=models.Index(fields=['end_date'], name='project_end_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='personaltask',
+            index=models.Index(fields=['start_date', 'due_date'], name='task_dates_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='personaltask',
+            index=models.Index(fields=['due_date'], name='task_due_date_idx'),
+        ),
+    ]
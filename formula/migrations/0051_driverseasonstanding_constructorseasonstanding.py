@@ -0,0 +1,110 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Min, Q, Sum
+
+
+def populate(apps, schema_editor):
+    Race = apps.get_model('formula', 'Race')
+    Standing = apps.get_model('formula', 'Standing')
+    DriverSeasonStanding = apps.get_model('formula', 'DriverSeasonStanding')
+    ConstructorSeasonStanding = apps.get_model('formula', 'ConstructorSeasonStanding')
+
+    drivers = {}
+    rows = Standing.objects.order_by().values('race__year', 'driver_id').annotate(
+        points=Sum('points'), races=Count('id'), best_position=Min('position')
+    )
+    for row in rows:
+        drivers[(row['race__year'], row['driver_id'])] = {
+            'points': row['points'] or 0,
+            'races': row['races'],
+            'best_position': row['best_position'],
+            'wins': 0,
+        }
+    for row in Race.objects.order_by().values('year', 'winner_id').annotate(wins=Count('id')):
+        key = (row['year'], row['winner_id'])
+        drivers.setdefault(key, {'points': 0, 'races': 0, 'best_position': None})['wins'] = row['wins']
+    DriverSeasonStanding.objects.bulk_create(
+        [DriverSeasonStanding(year=y, driver_id=d, **v) for (y, d), v in drivers.items()],
+        batch_size=1000,
+    )
+
+    rows = Standing.objects.order_by().values('race__year', 'constructor_id').annotate(
+        points=Sum('points'),
+        races=Count('race', distinct=True),
+        wins=Count('id', filter=Q(position=1)),
+    )
+    ConstructorSeasonStanding.objects.bulk_create(
+        [
+            ConstructorSeasonStanding(
+                year=row['race__year'],
+                constructor_id=row['constructor_id'],
+                points=row['points'] or 0,
+                races=row['races'],
+                wins=row['wins'],
+            )
+            for row in rows
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('formula', '0050_personalproject_dates_personaltask_dates_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DriverSeasonStanding',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveIntegerField(verbose_name='year')),
+                ('points', models.DecimalField(decimal_places=2, default=0, max_digits=8, verbose_name='points')),
+                ('wins', models.PositiveIntegerField(default=0, verbose_name='wins')),
+                ('races', models.PositiveIntegerField(default=0, verbose_name='races')),
+                ('best_position', models.PositiveIntegerField(blank=True, null=True, verbose_name='best position')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='updated at')),
+                ('driver', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='season_standings', to='formula.driver', verbose_name='driver')),
+            ],
+            options={
+                'verbose_name': 'driver season standing',
+                'verbose_name_plural': 'driver season standings',
+                'db_table': 'driver_season_standings',
+                'ordering': ['-year', '-points'],
+                'indexes': [
+                    models.Index(fields=['year', '-points'], name='driver_season_points_idx'),
+                    models.Index(fields=['driver', 'year'], name='driver_season_driver_idx'),
+                ],
+                'constraints': [
+                    models.UniqueConstraint(fields=('year', 'driver'), name='driver_season_unique'),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name='ConstructorSeasonStanding',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveIntegerField(verbose_name='year')),
+                ('points', models.DecimalField(decimal_places=2, default=0, max_digits=8, verbose_name='points')),
+                ('wins', models.PositiveIntegerField(default=0, verbose_name='wins')),
+                ('races', models.PositiveIntegerField(default=0, verbose_name='races')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='updated at')),
+                ('constructor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='season_standings', to='formula.constructor', verbose_name='constructor')),
+            ],
+            options={
+                'verbose_name': 'constructor season standing',
+                'verbose_name_plural': 'constructor season standings',
+                'db_table': 'constructor_season_standings',
+                'ordering': ['-year', '-points'],
+                'indexes': [
+                    models.Index(fields=['year', '-points'], name='constructor_season_points_idx'),
+                    models.Index(fields=['constructor', 'year'], name='constructor_season_ctor_idx'),
+                ],
+                'constraints': [
+                    models.UniqueConstraint(fields=('year', 'constructor'), name='constructor_season_unique'),
+                ],
+            },
+        ),
+        migrations.RunPython(populate, migrations.RunPython.noop),
+    ]
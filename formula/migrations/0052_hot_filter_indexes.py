@@ -0,0 +1,67 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('formula', '0051_driverseasonstanding_constructorseasonstanding'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='upload',
+            index=models.Index(fields=['created_at'], name='upload_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='filestorage',
+            index=models.Index(fields=['uploaded_at'], name='filestorage_uploaded_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='iftareport',
+            index=models.Index(fields=['created_at'], name='iftareport_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='load',
+            index=models.Index(fields=['created_at'], name='load_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='load',
+            index=models.Index(fields=['pickup_date'], name='load_pickup_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='load',
+            index=models.Index(fields=['route', 'pickup_date'], name='load_route_pickup_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='finance',
+            index=models.Index(fields=['date'], name='finance_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='finance',
+            index=models.Index(fields=['type', 'date'], name='finance_type_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='finance',
+            index=models.Index(fields=['category', 'date'], name='finance_category_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='personalfinancialentry',
+            index=models.Index(fields=['date', 'created_at'], name='entry_date_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='personalfinancialentry',
+            index=models.Index(fields=['type', 'date'], name='entry_type_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='personalfinancialentry',
+            index=models.Index(fields=['category', 'date'], name='entry_category_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='personaltask',
+            index=models.Index(fields=['status', 'due_date'], name='task_status_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='personaltask',
+            index=models.Index(fields=['project', 'start_date', 'due_date'], name='task_project_dates_idx'),
+        ),
+    ]
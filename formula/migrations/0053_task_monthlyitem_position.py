@@ -0,0 +1,42 @@
+from django.db import migrations, models
+from django.db.models import F
+
+GAP = 1024
+
+
+def spread_goal_priorities(apps, schema_editor):
+    # Dense 0, 1, 2, ... priorities leave no room between neighbours.
+    SavingsGoal = apps.get_model('formula', 'SavingsGoal')
+    goals = list(SavingsGoal.objects.order_by('priority', 'created_at', 'pk'))
+    for index, goal in enumerate(goals):
+        goal.priority = (index + 1) * GAP
+    SavingsGoal.objects.bulk_update(goals, ['priority'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('formula', '0052_hot_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='personaltask',
+            name='position',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='personalmonthlyitem',
+            name='position',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AlterModelOptions(
+            name='personalmonthlyitem',
+            options={'ordering': ['type', F('position').asc(nulls_last=True), 'title']},
+        ),
+        migrations.AddIndex(
+            model_name='personaltask',
+            index=models.Index(fields=['project', 'position'], name='task_project_position_idx'),
+        ),
+        migrations.RunPython(spread_goal_priorities, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('formula', '0053_task_monthlyitem_position'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='savingsgoal',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
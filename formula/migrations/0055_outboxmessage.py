@@ -0,0 +1,37 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('formula', '0054_savingsgoal_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=64, verbose_name='kind')),
+                ('recipient', models.CharField(max_length=255, verbose_name='recipient')),
+                ('subject', models.CharField(max_length=255, verbose_name='subject')),
+                ('body', models.TextField(blank=True, default='', verbose_name='body')),
+                ('status', models.CharField(choices=[('pending', 'pending'), ('sent', 'sent'), ('failed', 'failed')], default='pending', max_length=16, verbose_name='status')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='attempts')),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='next attempt at')),
+                ('last_error', models.TextField(blank=True, default='', verbose_name='last error')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='created at')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='sent at')),
+            ],
+            options={
+                'verbose_name': 'outbox message',
+                'verbose_name_plural': 'outbox messages',
+                'db_table': 'outbox_messages',
+                'ordering': ['next_attempt_at', 'id'],
+                'indexes': [
+                    models.Index(fields=['status', 'next_attempt_at'], name='outbox_due_idx'),
+                ],
+            },
+        ),
+    ]
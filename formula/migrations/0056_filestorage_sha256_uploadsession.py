@@ -0,0 +1,51 @@
+import uuid
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('formula', '0055_outboxmessage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='filestorage',
+            name='sha256',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='filestorage',
+            name='size',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='filestorage',
+            index=models.Index(fields=['sha256'], name='filestorage_sha256_idx'),
+        ),
+        migrations.CreateModel(
+            name='UploadSession',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('filename', models.CharField(max_length=255, verbose_name='filename')),
+                ('length', models.BigIntegerField(verbose_name='length')),
+                ('offset', models.BigIntegerField(default=0, verbose_name='offset')),
+                ('metadata', models.JSONField(blank=True, default=dict, verbose_name='metadata')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='updated at')),
+                ('file', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='formula.filestorage', verbose_name='file')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='user')),
+            ],
+            options={
+                'verbose_name': 'upload session',
+                'verbose_name_plural': 'upload sessions',
+                'db_table': 'upload_sessions',
+                'indexes': [
+                    models.Index(fields=['updated_at'], name='upload_session_updated_idx'),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+import formula.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('formula', '0056_filestorage_sha256_uploadsession'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Blob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True, verbose_name='SHA-256')),
+                ('size', models.BigIntegerField(default=0, verbose_name='size')),
+                ('refcount', models.IntegerField(default=0, verbose_name='references')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='created at')),
+            ],
+            options={
+                'verbose_name': 'blob',
+                'verbose_name_plural': 'blobs',
+                'db_table': 'blobs',
+                'indexes': [
+                    models.Index(fields=['refcount'], name='blob_refcount_idx'),
+                ],
+            },
+        ),
+        migrations.AlterField(
+            model_name='filestorage',
+            name='file',
+            field=models.FileField(max_length=255, storage=formula.storage.content_storage, upload_to='files/'),
+        ),
+        migrations.AlterField(
+            model_name='personaldocument',
+            name='file',
+            field=models.FileField(max_length=255, storage=formula.storage.content_storage, upload_to='personal_docs/'),
+        ),
+        migrations.AlterField(
+            model_name='upload',
+            name='file',
+            field=models.FileField(max_length=255, storage=formula.storage.content_storage, upload_to='assignments/'),
+        ),
+        migrations.AlterField(
+            model_name='personalprojectmedia',
+            name='file',
+            field=models.FileField(blank=True, max_length=255, null=True, storage=formula.storage.content_storage, upload_to='personal_project_media/'),
+        ),
+    ]
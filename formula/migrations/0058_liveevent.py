@@ -0,0 +1,26 @@
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('formula', '0057_blob_content_storage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LiveEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event', models.CharField(max_length=64, verbose_name='event')),
+                ('data', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder, verbose_name='data')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='created at')),
+            ],
+            options={
+                'verbose_name': 'live event',
+                'verbose_name_plural': 'live events',
+                'db_table': 'live_events',
+            },
+        ),
+    ]
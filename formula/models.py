@@ -1,13 +1,19 @@
+import uuid
+
 from django.contrib.auth.models import AbstractUser
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
 from django.contrib.contenttypes.models import ContentType
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from djmoney.models.fields import MoneyField
 from simple_history.models import HistoricalRecords
 from django_currentuser.db.models import CurrentUserField
 
 from formula.encoders import PrettyJSONEncoder
+from formula.projections import periods_needed
+from formula.storage import content_storage
 
 
 class DriverStatus(models.TextChoices):
@@ -205,7 +211,7 @@ class Driver(AuditedModel):
 # Assignments evaluation models
 # =============================
 class Upload(models.Model):
-    file = models.FileField(upload_to='assignments/')
+    file = models.FileField(upload_to='assignments/', storage=content_storage, max_length=255)
     original_name = models.CharField(max_length=255)
     detected_title = models.CharField(max_length=500, blank=True, default='')
     extracted_text = models.TextField(blank=True, default='')
@@ -216,6 +222,9 @@ class Upload(models.Model):
     class Meta:
         db_table = 'assign_uploads'
         ordering = ['-id']
+        indexes = [
+            models.Index(fields=['created_at'], name='upload_created_idx'),
+        ]
 
     def __str__(self):  # pragma: no cover
         return self.original_name
@@ -313,9 +322,74 @@ class Standing(AuditedModel):
         return f"{self.driver.full_name}, {self.position}"
 
 
+class DriverSeasonStanding(models.Model):
+    """Per season totals of a driver, kept in sync by ``formula.standings``."""
+
+    year = models.PositiveIntegerField(_("year"))
+    driver = models.ForeignKey(
+        Driver,
+        verbose_name=_("driver"),
+        on_delete=models.CASCADE,
+        related_name="season_standings",
+    )
+    points = models.DecimalField(_("points"), decimal_places=2, max_digits=8, default=0)
+    wins = models.PositiveIntegerField(_("wins"), default=0)
+    races = models.PositiveIntegerField(_("races"), default=0)
+    best_position = models.PositiveIntegerField(_("best position"), null=True, blank=True)
+    updated_at = models.DateTimeField(_("updated at"), auto_now=True)
+
+    class Meta:
+        db_table = "driver_season_standings"
+        verbose_name = _("driver season standing")
+        verbose_name_plural = _("driver season standings")
+        ordering = ["-year", "-points"]
+        constraints = [
+            models.UniqueConstraint(fields=["year", "driver"], name="driver_season_unique"),
+        ]
+        indexes = [
+            models.Index(fields=["year", "-points"], name="driver_season_points_idx"),
+            models.Index(fields=["driver", "year"], name="driver_season_driver_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.driver}, {self.year}"
+
+
+class ConstructorSeasonStanding(models.Model):
+    """Per season totals of a constructor, kept in sync by ``formula.standings``."""
+
+    year = models.PositiveIntegerField(_("year"))
+    constructor = models.ForeignKey(
+        Constructor,
+        verbose_name=_("constructor"),
+        on_delete=models.CASCADE,
+        related_name="season_standings",
+    )
+    points = models.DecimalField(_("points"), decimal_places=2, max_digits=8, default=0)
+    wins = models.PositiveIntegerField(_("wins"), default=0)
+    races = models.PositiveIntegerField(_("races"), default=0)
+    updated_at = models.DateTimeField(_("updated at"), auto_now=True)
+
+    class Meta:
+        db_table = "constructor_season_standings"
+        verbose_name = _("constructor season standing")
+        verbose_name_plural = _("constructor season standings")
+        ordering = ["-year", "-points"]
+        constraints = [
+            models.UniqueConstraint(fields=["year", "constructor"], name="constructor_season_unique"),
+        ]
+        indexes = [
+            models.Index(fields=["year", "-points"], name="constructor_season_points_idx"),
+            models.Index(fields=["constructor", "year"], name="constructor_season_ctor_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.constructor}, {self.year}"
+
+
 class FileStorage(models.Model):
     name = models.CharField(max_length=255)
-    file = models.FileField(upload_to="files/")
+    file = models.FileField(upload_to="files/", storage=content_storage, max_length=255)
     uploaded_at = models.DateTimeField(auto_now_add=True)
 
     # New: optional user-set category and description
@@ -341,6 +415,15 @@ class FileStorage(models.Model):
     load = models.ForeignKey(
         "Load", on_delete=models.SET_NULL, null=True, blank=True, related_name="documents"
     )
+    # Content hash and size of the stored file, used to store identical uploads once
+    sha256 = models.CharField(max_length=64, blank=True, default="", editable=False)
+    size = models.BigIntegerField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["uploaded_at"], name="filestorage_uploaded_idx"),
+            models.Index(fields=["sha256"], name="filestorage_sha256_idx"),
+        ]
 
     @property
     def category_display(self):
@@ -371,6 +454,59 @@ class FileStorage(models.Model):
         return "Other"
 
 
+class Blob(models.Model):
+    """Distinct stored content and how many file fields refer to it (see ``formula.blobs``)."""
+
+    sha256 = models.CharField(_("SHA-256"), max_length=64, unique=True)
+    size = models.BigIntegerField(_("size"), default=0)
+    refcount = models.IntegerField(_("references"), default=0)
+    created_at = models.DateTimeField(_("created at"), auto_now_add=True)
+
+    class Meta:
+        db_table = "blobs"
+        verbose_name = _("blob")
+        verbose_name_plural = _("blobs")
+        indexes = [
+            models.Index(fields=["refcount"], name="blob_refcount_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.refcount})"
+
+
+class UploadSession(models.Model):
+    """Resumable upload in progress (see ``formula.uploads``)."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        "User", verbose_name=_("user"), on_delete=models.CASCADE, null=True, blank=True, related_name="+"
+    )
+    filename = models.CharField(_("filename"), max_length=255)
+    length = models.BigIntegerField(_("length"))
+    offset = models.BigIntegerField(_("offset"), default=0)
+    metadata = models.JSONField(_("metadata"), default=dict, blank=True)
+    file = models.ForeignKey(
+        FileStorage, verbose_name=_("file"), on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    created_at = models.DateTimeField(_("created at"), auto_now_add=True)
+    updated_at = models.DateTimeField(_("updated at"), auto_now=True)
+
+    class Meta:
+        db_table = "upload_sessions"
+        verbose_name = _("upload session")
+        verbose_name_plural = _("upload sessions")
+        indexes = [
+            models.Index(fields=["updated_at"], name="upload_session_updated_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.length})"
+
+    @property
+    def complete(self):
+        return self.offset >= self.length
+
+
 class IFTAReport(models.Model):
     report_name = models.CharField(max_length=255)
     start_date = models.DateField()
@@ -379,6 +515,11 @@ class IFTAReport(models.Model):
     total_fuel = models.FloatField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at"], name="iftareport_created_idx"),
+        ]
+
 
 class Route(models.Model):
     name = models.CharField(max_length=255)
@@ -400,6 +541,13 @@ class Load(models.Model):
     route = models.ForeignKey(Route, on_delete=models.CASCADE, related_name="loads")
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at"], name="load_created_idx"),
+            models.Index(fields=["pickup_date"], name="load_pickup_idx"),
+            models.Index(fields=["route", "pickup_date"], name="load_route_pickup_idx"),
+        ]
+
 
 class Lead(AuditedModel):
     """Public contact/lead captured from the landing page."""
@@ -435,6 +583,58 @@ class Car(AuditedModel):
         return self.title
 
 
+class OutboxMessage(models.Model):
+    """Email waiting to be sent by ``process_outbox`` (see ``formula.outbox``)."""
+
+    STATUS_PENDING = "pending"
+    STATUS_SENT = "sent"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = (
+        (STATUS_PENDING, _("pending")),
+        (STATUS_SENT, _("sent")),
+        (STATUS_FAILED, _("failed")),
+    )
+
+    kind = models.CharField(_("kind"), max_length=64)
+    recipient = models.CharField(_("recipient"), max_length=255)
+    subject = models.CharField(_("subject"), max_length=255)
+    body = models.TextField(_("body"), blank=True, default="")
+    status = models.CharField(_("status"), max_length=16, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(_("attempts"), default=0)
+    next_attempt_at = models.DateTimeField(_("next attempt at"), default=timezone.now)
+    last_error = models.TextField(_("last error"), blank=True, default="")
+    created_at = models.DateTimeField(_("created at"), auto_now_add=True)
+    sent_at = models.DateTimeField(_("sent at"), null=True, blank=True)
+
+    class Meta:
+        db_table = "outbox_messages"
+        verbose_name = _("outbox message")
+        verbose_name_plural = _("outbox messages")
+        ordering = ["next_attempt_at", "id"]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="outbox_due_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} to {self.recipient}: {self.subject}"
+
+
+class LiveEvent(models.Model):
+    """Dashboard delta for the TV screens, shared by every process (see ``formula.live``)."""
+
+    event = models.CharField(_("event"), max_length=64)
+    data = models.JSONField(_("data"), default=dict, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(_("created at"), auto_now_add=True)
+
+    class Meta:
+        db_table = "live_events"
+        verbose_name = _("live event")
+        verbose_name_plural = _("live events")
+
+    def __str__(self):
+        return f"#{self.pk} {self.event}"
+
+
 class BusinessAsset(models.Model):
     name = models.CharField(max_length=255)
     description = models.TextField(blank=True, null=True)
@@ -461,6 +661,13 @@ class Finance(models.Model):
     description = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["date"], name="finance_date_idx"),
+            models.Index(fields=["type", "date"], name="finance_type_date_idx"),
+            models.Index(fields=["category", "date"], name="finance_category_date_idx"),
+        ]
+
     @property
     def is_expense(self) -> bool:
         if self.type:
@@ -505,6 +712,13 @@ class PersonalProject(models.Model):
     budget = models.DecimalField(max_digits=12, decimal_places=2, blank=True, null=True)
     assigned_to = models.CharField(max_length=255, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["start_date", "end_date"], name="project_dates_idx"),
+            models.Index(fields=["end_date"], name="project_end_date_idx"),
+        ]
 
     def __str__(self):
         return self.name
@@ -512,7 +726,9 @@ class PersonalProject(models.Model):
 
 class PersonalProjectMedia(models.Model):
     project = models.ForeignKey(PersonalProject, on_delete=models.CASCADE, related_name="media")
-    file = models.FileField(upload_to="personal_project_media/", blank=True, null=True)
+    file = models.FileField(
+        upload_to="personal_project_media/", storage=content_storage, max_length=255, blank=True, null=True
+    )
     url = models.URLField(blank=True, null=True)
     caption = models.CharField(max_length=255, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -562,6 +778,7 @@ class SavingsGoal(models.Model):
     icon = models.CharField(max_length=32, blank=True, null=True, help_text="Optional emoji or short icon code")
     priority = models.PositiveIntegerField(default=0, help_text="Lower number = higher priority")
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["priority", "created_at"]
@@ -580,28 +797,15 @@ class SavingsGoal(models.Model):
     def weeks_to_complete_alone(self, weekly_amount: float | int):
         """Number of weeks to complete this goal alone given weekly pool (ceil)."""
         try:
-            w = float(weekly_amount or 0)
-            if w <= 0:
-                return None
-            rem = float(self.remaining_amount)
-            if rem <= 0:
-                return 0
-            import math
-            return int(math.ceil(rem / w))
-        except Exception:
+            return periods_needed(self.target_amount, self.current_amount, weekly_amount)
+        except (TypeError, ValueError):
             return None
 
     @property
     def months_to_finish(self):
         try:
-            if self.monthly_contribution <= 0:
-                return None
-            rem = float(self.remaining_amount)
-            if rem <= 0:
-                return 0
-            import math
-            return int(math.ceil(rem / float(self.monthly_contribution)))
-        except Exception:
+            return periods_needed(self.target_amount, self.current_amount, self.monthly_contribution)
+        except (TypeError, ValueError):
             return None
 
 
@@ -642,13 +846,20 @@ class PersonalFinancialEntry(models.Model):
     description = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["date", "created_at"], name="entry_date_created_idx"),
+            models.Index(fields=["type", "date"], name="entry_type_date_idx"),
+            models.Index(fields=["category", "date"], name="entry_category_date_idx"),
+        ]
+
     def __str__(self):
         return f"{self.date} ${self.amount}"
 
 
 class PersonalDocument(models.Model):
     title = models.CharField(max_length=255)
-    file = models.FileField(upload_to="personal_docs/")
+    file = models.FileField(upload_to="personal_docs/", storage=content_storage, max_length=255)
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
@@ -657,6 +868,7 @@ class PersonalDocument(models.Model):
 
 # New: Persisted weekly schedule (as JSON) for the personal scheduler
 class PersonalSchedule(models.Model):
+    # Availability windows for a week; planned blocks are PersonalScheduleBlock rows
     week_start = models.DateField(db_index=True)
     data = models.JSONField(default=dict, encoder=PrettyJSONEncoder)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -670,6 +882,34 @@ class PersonalSchedule(models.Model):
         return f"Schedule {self.week_start}"
 
 
+class PersonalScheduleBlock(models.Model):
+    """A scheduled chunk of work on a task; one row per task per time slot.
+
+    ``PersonalSchedule`` only keeps the availability settings for a week,
+    the planned blocks themselves live here so views can query date ranges.
+    """
+    task = models.ForeignKey("PersonalTask", on_delete=models.CASCADE, related_name="schedule_blocks")
+    date = models.DateField()
+    start = models.TimeField()
+    end = models.TimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "personal_schedule_blocks"
+        ordering = ["date", "start"]
+        indexes = [
+            models.Index(fields=["date", "start"], name="schedule_block_date_idx"),
+            models.Index(fields=["task", "date"], name="schedule_block_task_idx"),
+        ]
+
+    @property
+    def duration(self):
+        return (self.end.hour * 60 + self.end.minute) - (self.start.hour * 60 + self.start.minute)
+
+    def __str__(self):
+        return f"{self.task_id} {self.date} {self.start:%H:%M}-{self.end:%H:%M}"
+
+
 class PersonalReport(models.Model):
     title = models.CharField(max_length=255)
     content = models.TextField(blank=True, null=True)
@@ -697,7 +937,21 @@ class PersonalTask(models.Model):
     ai_details = models.JSONField(blank=True, null=True)
     # New: estimated hours for scheduling into weekly calendar
     estimated_hours = models.DecimalField(max_digits=6, decimal_places=2, blank=True, null=True)
+    # Tasks that must be finished before this one can be scheduled
+    depends_on = models.ManyToManyField("self", symmetrical=False, blank=True, related_name="dependents")
+    # Manual order inside the project (sparse ranks, see formula.ordering)
+    position = models.IntegerField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["start_date", "due_date"], name="task_dates_idx"),
+            models.Index(fields=["due_date"], name="task_due_date_idx"),
+            models.Index(fields=["status", "due_date"], name="task_status_due_idx"),
+            models.Index(fields=["project", "start_date", "due_date"], name="task_project_dates_idx"),
+            models.Index(fields=["project", "position"], name="task_project_position_idx"),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.get_status_display()})"
@@ -715,10 +969,12 @@ class PersonalMonthlyItem(models.Model):
     category = models.CharField(max_length=255, blank=True, null=True)
     day_of_month = models.PositiveSmallIntegerField(blank=True, null=True, help_text="Day of month this is due/received (1-31)")
     notes = models.TextField(blank=True, null=True)
+    # Manual order inside the type (sparse ranks, see formula.ordering)
+    position = models.IntegerField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        ordering = ["type", "title"]
+        ordering = ["type", models.F("position").asc(nulls_last=True), "title"]
 
     def __str__(self):
         sign = "+" if self.type == "INCOME" else "-"
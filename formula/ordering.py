@@ -0,0 +1,141 @@
+"""Drag-and-drop ordering stored as sparse integer ranks.
+
+Ranks are spaced ``GAP`` apart, so moving one item usually means giving it
+a rank between its new neighbours and touching a single row. ``reorder``
+takes the full new order of a scope, keeps every item that is already in
+relative order (the longest increasing run of current ranks) and only
+renumbers the rest; when a gap is exhausted it respaces the whole scope.
+Either way the changes go out as one ``UPDATE ... SET rank = CASE pk WHEN
+... END`` inside a transaction.
+
+Works on any integer field: ``SavingsGoal.priority``, ``PersonalTask.position``
+and ``PersonalMonthlyItem.position``. Items with a ``NULL`` rank (never
+ordered by hand) are placed like any other moved item.
+"""
+
+from bisect import bisect_left
+from itertools import pairwise
+
+from django.db import transaction
+from django.db.models import Case, Max, Min, Value, When
+from django.utils import timezone
+
+GAP = 1024
+
+_UNSIGNED = ("PositiveIntegerField", "PositiveSmallIntegerField", "PositiveBigIntegerField")
+
+
+def _floor(model_field):
+    """Lowest rank the field can hold, ``None`` when negative ranks are fine."""
+    return 0 if model_field.get_internal_type() in _UNSIGNED else None
+
+
+def next_rank(queryset, field="priority"):
+    """Rank that puts a new item after every item of ``queryset``."""
+    last = queryset.order_by().aggregate(last=Max(field))["last"]
+    return 0 if last is None else last + GAP
+
+
+def first_rank(queryset, field="priority"):
+    """Rank that puts a new item before every item of ``queryset`` (if the field allows)."""
+    first = queryset.order_by().aggregate(first=Min(field))["first"]
+    if first is None:
+        return 0
+    floor = _floor(queryset.model._meta.get_field(field))
+    return first - GAP if floor is None else max(floor, first - GAP)
+
+
+def longest_increasing(values):
+    """Indices of a longest strictly increasing subsequence of ``values`` (``None`` skipped)."""
+    tails, tail_index = [], []
+    parent = [None] * len(values)
+    for i, value in enumerate(values):
+        if value is None:
+            continue
+        pos = bisect_left(tails, value)
+        if pos == len(tails):
+            tails.append(value)
+            tail_index.append(i)
+        else:
+            tails[pos] = value
+            tail_index[pos] = i
+        parent[i] = tail_index[pos - 1] if pos else None
+    result = []
+    i = tail_index[-1] if tail_index else None
+    while i is not None:
+        result.append(i)
+        i = parent[i]
+    return result[::-1]
+
+
+def plan(current, floor=None, gap=GAP):
+    """New ranks for items listed in their wanted order.
+
+    ``current`` holds the present rank of each item (or ``None``). Returns
+    ``{index: rank}`` for the items that must change, or ``None`` when the
+    gaps are too small and the whole list has to be respaced.
+    """
+    keep = longest_increasing(current)
+    anchors = [None, *keep, None]
+    changes = {}
+    for lo_index, hi_index in pairwise(anchors):
+        start = 0 if lo_index is None else lo_index + 1
+        stop = len(current) if hi_index is None else hi_index
+        count = stop - start
+        if count <= 0:
+            continue
+        lo = None if lo_index is None else current[lo_index]
+        hi = None if hi_index is None else current[hi_index]
+        if lo is None and hi is None:
+            lo, hi = -gap, count * gap
+        elif lo is None:
+            lo = hi - (count + 1) * gap
+            if floor is not None and lo < floor - 1:
+                lo = floor - 1
+        elif hi is None:
+            hi = lo + (count + 1) * gap
+        step = (hi - lo) // (count + 1)
+        if step < 1:
+            return None
+        for offset, index in enumerate(range(start, stop), start=1):
+            changes[index] = lo + offset * step
+    return changes
+
+
+def respace(count, gap=GAP):
+    return {index: (index + 1) * gap for index in range(count)}
+
+
+def reorder(queryset, ids, field="priority"):
+    """Store ``ids`` (pks of ``queryset``) in that order; return the number of rows written."""
+    model_field = queryset.model._meta.get_field(field)
+    pk_field = queryset.model._meta.pk
+    with transaction.atomic():
+        ranks = dict(
+            queryset.select_for_update()
+            .filter(pk__in=ids)
+            .order_by()
+            .values_list("pk", field)
+        )
+        # Unknown pks and duplicates are dropped; the first occurrence wins.
+        seen = set()
+        order = []
+        for pk in ids:
+            key = pk_field.to_python(pk)
+            if key in ranks and key not in seen:
+                seen.add(key)
+                order.append(key)
+        current = [ranks[pk] for pk in order]
+        changes = plan(current, _floor(model_field))
+        if changes is None:
+            changes = respace(len(order))
+        changes = {order[i]: rank for i, rank in changes.items() if current[i] != rank}
+        if not changes:
+            return 0
+        whens = [When(pk=pk, then=Value(rank)) for pk, rank in changes.items()]
+        values = {field: Case(*whens, output_field=model_field)}
+        # update() skips auto_now, but a reorder is a change like any other.
+        for other in queryset.model._meta.concrete_fields:
+            if getattr(other, "auto_now", False):
+                values[other.name] = timezone.now()
+        return queryset.model._default_manager.filter(pk__in=changes).update(**values)
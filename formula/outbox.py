@@ -0,0 +1,155 @@
+"""Outgoing email through the ``OutboxMessage`` table.
+
+Requests only insert a row (``enqueue``); ``process_outbox`` sends due rows in
+the background, so a slow or unreachable SMTP server never holds up a page.
+
+- Rows are claimed by pushing ``next_attempt_at`` a lease ahead, so several
+  workers can run side by side and a crashed worker's rows come back later.
+- A failed send is retried after ``BACKOFF_BASE * 2**(attempts - 1)`` seconds
+  (capped at ``BACKOFF_MAX``, with some jitter) and marked failed after
+  ``MAX_ATTEMPTS``.
+- When ``DIGEST_THRESHOLD`` or more messages of one kind wait for the same
+  recipient, they go out as one digest email instead.
+
+Mail goes through ``EMAIL_BACKEND``, so the locmem backend captures it in
+``django.core.mail.outbox`` under test.
+"""
+
+import datetime
+import logging
+import random
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 100
+LEASE = datetime.timedelta(minutes=5)
+MAX_ATTEMPTS = 8
+BACKOFF_BASE = 60
+BACKOFF_MAX = 6 * 60 * 60
+DIGEST_THRESHOLD = 5
+
+
+####################################################################
+# Enqueue
+####################################################################
+def enqueue(kind, recipient, subject, body):
+    from formula.models import OutboxMessage
+
+    return OutboxMessage.objects.create(kind=kind, recipient=recipient, subject=subject[:255], body=body)
+
+
+def notify_lead(lead):
+    """Queue the sales notification for a new ``Lead`` (``SALES_EMAIL``)."""
+    from django.conf import settings
+
+    sales_email = getattr(settings, "SALES_EMAIL", None)
+    if not sales_email:
+        return None
+    body = (
+        f"Name: {lead.name}\nEmail: {lead.email}\nPhone: {lead.phone}\n"
+        f"ZIP: {lead.zip_code}\nMessage:\n{lead.message}\nSource: {lead.source}"
+    )
+    return enqueue("lead", sales_email, f"New lead: {lead.name or 'No name'}", body)
+
+
+####################################################################
+# Processing
+####################################################################
+def backoff(attempts):
+    """Seconds to wait before attempt ``attempts + 1``."""
+    delay = min(BACKOFF_BASE * 2 ** max(attempts - 1, 0), BACKOFF_MAX)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def claim(limit=BATCH_SIZE, now=None):
+    """Due pending messages, leased to this worker."""
+    from django.db import transaction
+    from django.utils import timezone
+
+    from formula.models import OutboxMessage
+
+    now = now or timezone.now()
+    with transaction.atomic():
+        ids = list(
+            OutboxMessage.objects.select_for_update(skip_locked=True)
+            .filter(status=OutboxMessage.STATUS_PENDING, next_attempt_at__lte=now)
+            .order_by("next_attempt_at", "id")
+            .values_list("id", flat=True)[:limit]
+        )
+        OutboxMessage.objects.filter(id__in=ids).update(next_attempt_at=now + LEASE)
+    return list(OutboxMessage.objects.filter(id__in=ids).order_by("id"))
+
+
+def group(messages, threshold=DIGEST_THRESHOLD):
+    """``[(messages, digest?), ...]``: one digest per busy (kind, recipient)."""
+    groups = {}
+    for message in messages:
+        groups.setdefault((message.kind, message.recipient), []).append(message)
+    out = []
+    for members in groups.values():
+        if threshold and len(members) >= threshold:
+            out.append((members, True))
+        else:
+            out.extend(([message], False) for message in members)
+    return out
+
+
+def digest(messages):
+    subject = f"{len(messages)} new {messages[0].kind} notifications"
+    body = "\n\n".join(f"{m.subject}\n{'-' * len(m.subject)}\n{m.body}" for m in messages)
+    return subject, body
+
+
+def process(limit=BATCH_SIZE, threshold=DIGEST_THRESHOLD, now=None):
+    """Send one batch; returns ``(sent, retried, failed)`` message counts."""
+    from django.conf import settings
+    from django.core.mail import EmailMessage, get_connection
+    from django.utils import timezone
+
+    from formula.models import OutboxMessage
+
+    now = now or timezone.now()
+    messages = claim(limit, now)
+    if not messages:
+        return 0, 0, 0
+    sent = retried = failed = 0
+    connection = get_connection()
+    connection_error = None
+    try:
+        connection.open()
+    except Exception as e:
+        # Nothing can go out; every message is retried.
+        connection_error = e
+    try:
+        for members, is_digest in group(messages, threshold):
+            subject, body = digest(members) if is_digest else (members[0].subject, members[0].body)
+            error = connection_error
+            if error is None:
+                try:
+                    EmailMessage(
+                        subject, body, settings.DEFAULT_FROM_EMAIL, [members[0].recipient], connection=connection
+                    ).send()
+                except Exception as e:
+                    error = e
+            ids = [m.pk for m in members]
+            if error is None:
+                OutboxMessage.objects.filter(id__in=ids).update(
+                    status=OutboxMessage.STATUS_SENT, sent_at=timezone.now(), last_error=""
+                )
+                sent += len(members)
+                continue
+            logger.warning("Outbox send to %s failed: %s", members[0].recipient, error)
+            for message in members:
+                message.attempts += 1
+                message.last_error = repr(error)[:2000]
+                if message.attempts >= MAX_ATTEMPTS:
+                    message.status = OutboxMessage.STATUS_FAILED
+                    failed += 1
+                else:
+                    message.next_attempt_at = now + datetime.timedelta(seconds=backoff(message.attempts))
+                    retried += 1
+            OutboxMessage.objects.bulk_update(members, ["attempts", "last_error", "status", "next_attempt_at"])
+    finally:
+        if connection_error is None:
+            connection.close()
+    return sent, retried, failed
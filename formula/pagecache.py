@@ -0,0 +1,127 @@
+"""Cached responses of the public marketing pages for anonymous visitors.
+
+``PublicPageCacheMiddleware`` sits in front of the session and auth
+middleware. A ``GET`` for one of the ``PUBLIC_PAGES`` without a session or
+messages cookie is answered from the ``pages`` cache namespace without
+touching sessions, users or the database; otherwise the request goes through
+as usual and a cacheable 200 response is stored on the way out.
+
+The home page contains the contact form's CSRF token, which differs per
+visitor. It is stored with ``CSRF_MARKER`` in place of the token, and a hit
+gets a fresh token for the visitor's CSRF cookie (setting the cookie when they
+don't have one yet).
+
+Responses carry an ``ETag`` of the stored body, so revalidations are answered
+with 304, a short ``max-age`` (``private`` when the body holds a CSRF token)
+and ``Vary: Accept-Language, Cookie``. Saving or deleting a ``Car`` bumps the
+namespace (see ``signals``).
+"""
+
+import hashlib
+import re
+from os import environ
+
+from formula.caching import Namespace
+
+PUBLIC_PAGES = {"public_home", "public_services", "public_cars", "public_car_detail"}
+MAX_AGE = 60
+CSRF_MARKER = b"__formula_csrf_token__"
+CSRF_INPUT = re.compile(rb'(name="csrfmiddlewaretoken" value=")[^"]*(")')
+
+PAGES = Namespace("pages", timeout=int(environ.get("PAGE_CACHE_TIMEOUT", 10 * 60)))
+
+
+def bump_pages_version():
+    PAGES.bump()
+
+
+class PublicPageCacheMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        key = self.cache_key(request)
+        if key is None:
+            return self.get_response(request)
+        entry = PAGES.get(*key)
+        if entry is not None:
+            return self.hit(request, entry)
+        response = self.get_response(request)
+        entry = self.entry(request, response)
+        if entry is not None:
+            PAGES.set(*key, value=entry)
+            self.add_headers(response, entry)
+        return response
+
+    ####################################################################
+    # Lookup
+    ####################################################################
+    def cache_key(self, request):
+        from django.conf import settings
+        from django.contrib.messages.storage.cookie import CookieStorage
+        from django.urls import Resolver404, resolve
+        from django.utils.translation import get_language_from_request
+
+        if request.method != "GET":
+            return None
+        if settings.SESSION_COOKIE_NAME in request.COOKIES or CookieStorage.cookie_name in request.COOKIES:
+            return None
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return None
+        if match.url_name not in PUBLIC_PAGES:
+            return None
+        return request.path, request.GET.urlencode(), get_language_from_request(request)
+
+    def hit(self, request, entry):
+        from django.http import HttpResponse
+        from django.middleware.csrf import CsrfViewMiddleware, get_token
+        from django.utils.cache import get_conditional_response
+
+        response = get_conditional_response(request, etag=entry["etag"])
+        if response is not None:
+            self.add_headers(response, entry)
+            return response
+
+        content = entry["content"]
+        csrf = None
+        if CSRF_MARKER in content:
+            csrf = CsrfViewMiddleware(self.get_response)
+            csrf.process_request(request)
+            content = content.replace(CSRF_MARKER, get_token(request).encode())
+        response = HttpResponse(content, content_type=entry["content_type"])
+        if entry["language"]:
+            response["Content-Language"] = entry["language"]
+        self.add_headers(response, entry)
+        if csrf is not None:
+            csrf.process_response(request, response)
+        return response
+
+    ####################################################################
+    # Store
+    ####################################################################
+    def entry(self, request, response):
+        from django.conf import settings
+
+        if response.status_code != 200 or response.streaming:
+            return None
+        if getattr(request, "user", None) is not None and request.user.is_authenticated:
+            return None
+        if settings.SESSION_COOKIE_NAME in response.cookies or "no-store" in response.get("Cache-Control", ""):
+            return None
+        content = CSRF_INPUT.sub(rb"\1" + CSRF_MARKER + rb"\2", response.content)
+        return {
+            "content": content,
+            "content_type": response["Content-Type"],
+            "language": response.get("Content-Language", ""),
+            "etag": f'W/"{hashlib.sha256(content).hexdigest()[:32]}"',
+        }
+
+    def add_headers(self, response, entry):
+        from django.utils.cache import patch_vary_headers
+
+        scope = "private" if CSRF_MARKER in entry["content"] else "public"
+        response["Cache-Control"] = f"{scope}, max-age={MAX_AGE}"
+        response["ETag"] = entry["etag"]
+        patch_vary_headers(response, ("Accept-Language", "Cookie"))
@@ -17,6 +17,8 @@ urlpatterns = [
     path("projects/<int:pk>/edit/", views.PersonalProjectEditView.as_view(), name="edit_project"),
     path("projects/<int:pk>/delete/", views.PersonalProjectDeleteView.as_view(), name="delete_project"),
 
+    path("projects/<int:project_pk>/tasks/reorder/", views.reorder_tasks, name="reorder_tasks"),
+
     path("tasks/<int:pk>/edit/", views.ProjectTaskEditView.as_view(), name="edit_task"),
     path("tasks/<int:pk>/delete/", views.ProjectTaskDeleteView.as_view(), name="delete_task"),
     path("tasks/<int:pk>/enrich/", views.enrich_task_with_ai, name="enrich_task"),
@@ -27,6 +29,8 @@ urlpatterns = [
     path("goals/v2/react/", views.SavingsGoalsEmbedView.as_view(), name="goals_v2_embed"),
     # Lightweight API for the embedded original goals dashboard
     path("goals/v2/api/list", views.api_goals_list, name="goals_v2_api_list"),
+    path("goals/v2/api/scenarios", views.api_goals_scenarios, name="goals_v2_api_scenarios"),
+    path("goals/v2/api/batch", views.api_goals_batch, name="goals_v2_api_batch"),
     path("goals/v2/api/add", views.api_goals_add, name="goals_v2_api_add"),
     path("goals/v2/api/update/<int:pk>/", views.api_goals_update, name="goals_v2_api_update"),
     path("goals/v2/api/delete/<int:pk>/", views.api_goals_delete, name="goals_v2_api_delete"),
@@ -42,6 +46,8 @@ urlpatterns = [
     path("financial/<int:pk>/delete/", views.PersonalFinancialDeleteView.as_view(), name="delete_financial_entry"),
     # Monthly recurring items subpage
     path("financial/monthly/", views.PersonalMonthlyItemsView.as_view(), name="monthly_items"),
+    path("financial/cashflow/", views.api_cashflow, name="cashflow"),
+    path("financial/monthly/reorder/", views.reorder_monthly_items, name="reorder_monthly_items"),
     path("financial/monthly/<int:pk>/edit/", views.PersonalMonthlyItemEditView.as_view(), name="edit_monthly_item"),
     path("financial/monthly/<int:pk>/delete/", views.PersonalMonthlyItemDeleteView.as_view(), name="delete_monthly_item"),
 
@@ -54,6 +60,7 @@ urlpatterns = [
     path("reports/<int:pk>/delete/", views.PersonalReportDeleteView.as_view(), name="delete_report"),
 
     path("calendar/", views.GlobalCalendarView.as_view(), name="global_calendar"),
+    path("calendar/events/", views.calendar_events, name="calendar_events"),
 
     path("ai/", views.PersonalAIChatView.as_view(), name="personal_ai"),
 ]
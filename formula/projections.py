@@ -0,0 +1,194 @@
+"""Savings goal projections.
+
+One place for the "how long until this goal is funded" arithmetic used by
+``SavingsGoal``, the goals pages and the scenarios API.
+
+- ``periods_needed`` is the closed form for a single goal: plain division
+  without a rate, the annuity formula with one (returns compound on savings
+  and investments, interest accrues on debts).
+- ``pooled_schedule`` funds goals one after another from the weekly pool.
+- ``monthly_timeline`` chains each goal's own monthly contribution.
+- ``scenarios`` evaluates a grid of weekly amounts x annual rates x goal
+  orders in one call. Per-goal durations only depend on (amount, rate), so
+  they are computed once per grid cell and every order is a running sum over
+  a permutation of them.
+"""
+
+import datetime
+import math
+from calendar import monthrange
+
+WEEKS_PER_YEAR = 52
+# Float noise (e.g. 299.99999) must not add a whole period.
+EPSILON = 1e-9
+# Slider stops for the scenarios API.
+DEFAULT_ANNUAL_RATES = (0.0, 0.02, 0.05, 0.08)
+
+ORDERS = {
+    "priority": None,
+    "smallest_first": lambda goal: goal["remaining"],
+    "largest_first": lambda goal: -goal["remaining"],
+}
+
+
+####################################################################
+# Single goal
+####################################################################
+def period_rate(annual_rate, periods_per_year):
+    """Compounded rate per period equivalent to ``annual_rate`` (0.05 = 5 %)."""
+    if not annual_rate:
+        return 0.0
+    return (1 + annual_rate) ** (1 / periods_per_year) - 1
+
+
+def periods_needed(target, current, contribution, rate=0.0, debt=False):
+    """Whole periods of ``contribution`` until ``current`` reaches ``target``.
+
+    ``rate`` is per period. For a debt the remaining balance accrues it; for
+    anything else the saved balance earns it. ``None`` means never.
+    """
+    target, current, contribution = float(target or 0), float(current or 0), float(contribution or 0)
+    remaining = target - current
+    if remaining <= 0:
+        return 0
+    if contribution <= 0:
+        return None
+    if not rate:
+        return math.ceil(remaining / contribution - EPSILON)
+    if debt:
+        # Amortization: balance * (1 + r)^n - c * ((1 + r)^n - 1) / r = 0
+        if remaining * rate >= contribution:
+            return None
+        n = -math.log(1 - remaining * rate / contribution) / math.log(1 + rate)
+    else:
+        # Future value: current * (1 + r)^n + c * ((1 + r)^n - 1) / r >= target
+        n = math.log((target * rate + contribution) / (current * rate + contribution)) / math.log(1 + rate)
+    return max(math.ceil(n - EPSILON), 0)
+
+
+def add_months(day, months):
+    """``day`` moved ``months`` ahead, clamped to the end of shorter months."""
+    index = day.month - 1 + months
+    year, month = day.year + index // 12, index % 12 + 1
+    return datetime.date(year, month, min(day.day, monthrange(year, month)[1]))
+
+
+####################################################################
+# Schedules
+####################################################################
+def goal_values(goal):
+    """The numbers a projection needs from a ``SavingsGoal``."""
+    target = float(goal.target_amount or 0)
+    current = float(goal.current_amount or 0)
+    return {
+        "id": goal.pk,
+        "title": goal.title,
+        "target": target,
+        "current": current,
+        "remaining": max(target - current, 0.0),
+        "monthly": float(goal.monthly_contribution or 0),
+        "debt": goal.goal_type == "debt",
+    }
+
+
+def pooled_schedule(goals, weekly, today=None, annual_rate=0.0):
+    """The whole weekly pool goes to one goal at a time, in the given order."""
+    today = today or datetime.date.today()
+    weekly = float(weekly or 0)
+    rate = period_rate(annual_rate, WEEKS_PER_YEAR)
+    out = []
+    cumulative = 0
+    for goal in goals:
+        values = goal_values(goal)
+        weeks = None
+        if weekly > 0:
+            weeks = periods_needed(values["target"], values["current"], weekly, rate, values["debt"])
+        if weeks is None or cumulative is None:
+            cumulative = None
+        else:
+            cumulative += weeks
+        out.append({
+            "id": values["id"],
+            "title": values["title"],
+            "remaining": values["remaining"],
+            "weeks": weeks,
+            "cumulative_weeks": cumulative,
+            "eta_date": today + datetime.timedelta(weeks=cumulative) if cumulative is not None else None,
+        })
+    return out
+
+
+def monthly_timeline(goals, today=None, annual_rate=0.0):
+    """Each goal starts when the previous one is funded by its own monthly contribution.
+
+    A goal that can never finish (no contribution) is reported with a
+    ``None`` month count and does not move the next goal's start.
+    """
+    today = today or datetime.date.today()
+    rate = period_rate(annual_rate, 12)
+    cursor = today
+    out = []
+    for goal in goals:
+        values = goal_values(goal)
+        months = periods_needed(values["target"], values["current"], values["monthly"], rate, values["debt"])
+        start = cursor
+        completion = add_months(start, months) if months else start
+        cursor = completion
+        out.append({**values, "months": months, "start_date": start, "completion_date": completion})
+    return out
+
+
+####################################################################
+# Scenarios
+####################################################################
+def scenarios(goals, weekly_amounts, annual_rates=DEFAULT_ANNUAL_RATES, orders=tuple(ORDERS)):
+    """Cumulative weeks per goal for every (order, weekly amount, rate).
+
+    ``results[order][i][j]`` lists, in the goals' input order, the week each
+    goal is funded with ``weekly_amounts[i]`` and ``annual_rates[j]``
+    (``None`` once a goal in front of it can't finish).
+    """
+    values = [goal_values(goal) for goal in goals]
+    permutations = {}
+    for order in orders:
+        key = ORDERS[order]
+        indices = list(range(len(values)))
+        permutations[order] = indices if key is None else sorted(indices, key=lambda i: key(values[i]))
+
+    results = {order: [] for order in permutations}
+    for weekly in weekly_amounts:
+        rows = {order: [] for order in permutations}
+        for annual_rate in annual_rates:
+            rate = period_rate(annual_rate, WEEKS_PER_YEAR)
+            durations = [
+                periods_needed(v["target"], v["current"], weekly, rate, v["debt"]) if weekly > 0 else None
+                for v in values
+            ]
+            for order, permutation in permutations.items():
+                finished = [None] * len(values)
+                cumulative = 0
+                for i in permutation:
+                    if cumulative is not None and durations[i] is not None:
+                        cumulative += durations[i]
+                    else:
+                        cumulative = None
+                    finished[i] = cumulative
+                rows[order].append(finished)
+        for order in permutations:
+            results[order].append(rows[order])
+    return {
+        "goals": [{"id": v["id"], "title": v["title"], "remaining": v["remaining"]} for v in values],
+        "weekly_amounts": list(weekly_amounts),
+        "annual_rates": list(annual_rates),
+        "orders": list(permutations),
+        "results": results,
+    }
+
+
+def default_weekly_amounts(weekly):
+    """Slider stops around the saved weekly pool."""
+    weekly = float(weekly or 0)
+    if weekly <= 0:
+        return [25.0, 50.0, 100.0, 150.0, 200.0, 300.0]
+    return [round(weekly * factor, 2) for factor in (0.5, 0.75, 1, 1.25, 1.5, 2)]
+
@@ -0,0 +1,368 @@
+"""Persistence and incremental re-planning for the project scheduler.
+
+Planned work is stored as ``PersonalScheduleBlock`` rows (one per task per
+slot) and ``PersonalSchedule`` keeps the availability windows of each week.
+A full plan is produced by ``formula.scheduling`` from the scheduler page;
+afterwards task edits only touch the days the task occupied or moves into.
+"""
+
+import datetime
+import logging
+
+from django.db import transaction
+
+from .scheduling import (
+    DEFAULT_MIN_BLOCK,
+    DayCapacity,
+    TaskSpec,
+    build_days,
+    parse_hhmm,
+    schedule_tasks,
+)
+
+DEFAULT_OPEN_START = "18:00"
+DEFAULT_OPEN_END = "22:00"
+# How far ahead a changed task may be moved when re-planning incrementally.
+REPLAN_HORIZON_WEEKS = 8
+# Task fields that change where/whether a task is scheduled.
+SCHEDULING_FIELDS = ("estimated_hours", "status", "due_date", "start_date", "project_id")
+
+logger = logging.getLogger(__name__)
+
+
+def week_start_for(date):
+    return date - datetime.timedelta(days=date.weekday())
+
+
+def to_minutes(value):
+    return value.hour * 60 + value.minute
+
+
+def to_time(minutes):
+    # Windows may end at midnight ("24:00"); TimeField tops out at 23:59.
+    minutes = min(int(minutes), 24 * 60 - 1)
+    return datetime.time(minutes // 60, minutes % 60)
+
+
+def window_settings(open_start, open_end, windows, min_block=DEFAULT_MIN_BLOCK):
+    """Serialize availability for ``PersonalSchedule.data``."""
+    return {
+        "open_start": open_start,
+        "open_end": open_end,
+        "min_block": min_block,
+        "windows": {str(k): [list(w) for w in v] for k, v in windows.items()},
+    }
+
+
+def weekly_windows(settings_data):
+    """Weekday -> ``[(start, end)]`` minute windows from saved settings."""
+    data = settings_data or {}
+    if "windows" in data:
+        return {int(k): [tuple(w) for w in v] for k, v in data["windows"].items()}
+    start = parse_hhmm(data.get("open_start"), DEFAULT_OPEN_START)
+    end = parse_hhmm(data.get("open_end"), DEFAULT_OPEN_END)
+    return {d: [(start, end)] for d in range(7)}
+
+
+def settings_by_week(start, end):
+    """Saved settings for every week touching ``start..end``.
+
+    Weeks that were never planned inherit the closest earlier week.
+    """
+    from .models import PersonalSchedule
+
+    first = week_start_for(start)
+    rows = {}
+    for schedule in PersonalSchedule.objects.filter(week_start__lte=end).order_by("week_start", "updated_at"):
+        rows[schedule.week_start] = schedule.data or {}
+    fallback = {}
+    for week_start in sorted(rows):
+        if week_start <= first:
+            fallback = rows[week_start]
+    result = {}
+    week = first
+    while week <= end:
+        fallback = rows.get(week, fallback)
+        result[week] = fallback
+        week += datetime.timedelta(days=7)
+    return result
+
+
+def save_settings(week_start, data):
+    from .models import PersonalSchedule
+
+    obj, created = PersonalSchedule.objects.get_or_create(week_start=week_start, defaults={"data": data})
+    if not created:
+        obj.data = data
+        obj.save(update_fields=["data", "updated_at"])
+    return obj
+
+
+####################################################################
+# Reading
+####################################################################
+def blocks_between(start, end):
+    from .models import PersonalScheduleBlock
+
+    return (
+        PersonalScheduleBlock.objects.filter(date__gte=start, date__lte=end)
+        .select_related("task__project")
+        .order_by("date", "start")
+    )
+
+
+def block_payload(block):
+    task = block.task
+    return {
+        "id": block.pk,
+        "task_id": block.task_id,
+        "title": task.title,
+        "project": task.project.name if task.project_id else "",
+        "duration": block.duration,
+        "start": block.start.strftime("%H:%M"),
+        "end": block.end.strftime("%H:%M"),
+    }
+
+
+def schedule_payload(start, end):
+    """``{'week_start', 'days': [{'date', 'blocks': [...]}]}`` for a range.
+
+    Same shape the scheduler page, compact view and TV dashboard render.
+    """
+    days = {}
+    date = start
+    while date <= end:
+        days[date] = []
+        date += datetime.timedelta(days=1)
+    for block in blocks_between(start, end):
+        days[block.date].append(block_payload(block))
+    return {
+        "week_start": start.isoformat(),
+        "days": [{"date": d.isoformat(), "blocks": blocks} for d, blocks in days.items()],
+    }
+
+
+def has_blocks(start, end):
+    from .models import PersonalScheduleBlock
+
+    return PersonalScheduleBlock.objects.filter(date__gte=start, date__lte=end).exists()
+
+
+def publish_week(date):
+    """Let live screens and cached calendar ranges know ``date``'s week changed."""
+    from . import live
+    from .calendar_feed import bump_events_version
+
+    transaction.on_commit(bump_events_version)
+    monday = week_start_for(date)
+    live.publish_on_commit(
+        "schedule.updated",
+        lambda: schedule_payload(monday, monday + datetime.timedelta(days=6)),
+    )
+
+
+####################################################################
+# Writing
+####################################################################
+def store_plan(result, start, end, task_ids):
+    """Replace the blocks of ``task_ids`` in ``start..end`` with ``result``."""
+    from .models import PersonalScheduleBlock
+
+    with transaction.atomic():
+        PersonalScheduleBlock.objects.filter(
+            date__gte=start, date__lte=end, task_id__in=task_ids
+        ).delete()
+        PersonalScheduleBlock.objects.bulk_create(
+            [
+                PersonalScheduleBlock(
+                    task_id=b.task_id, date=b.date, start=to_time(b.start), end=to_time(b.end)
+                )
+                for b in result.blocks
+            ],
+            batch_size=500,
+        )
+        week = week_start_for(start)
+        while week <= end:
+            publish_week(week)
+            week += datetime.timedelta(days=7)
+
+
+def _capacity(start, end, exclude_task=None):
+    """``DayCapacity`` per day with every existing block reserved."""
+    settings = settings_by_week(start, end)
+    reserved = {}
+    qs = blocks_between(start, end).values_list("task_id", "date", "start", "end")
+    for task_id, date, s, e in qs:
+        if task_id == exclude_task:
+            continue
+        reserved.setdefault(date, []).append((to_minutes(s), to_minutes(e)))
+    days = []
+    date = start
+    while date <= end:
+        windows = weekly_windows(settings[week_start_for(date)])
+        day = DayCapacity(date, windows.get(date.weekday(), ()))
+        for s, e in reserved.get(date, ()):
+            day.reserve(s, e)
+        days.append(day)
+        date += datetime.timedelta(days=1)
+    return days, settings
+
+
+def _repack_day(date):
+    """Close gaps on ``date`` by sliding its blocks to the front of the windows."""
+    from .models import PersonalScheduleBlock
+
+    blocks = list(PersonalScheduleBlock.objects.filter(date=date).order_by("start"))
+    if not blocks:
+        return
+    settings = settings_by_week(date, date)[week_start_for(date)]
+    day = DayCapacity(date, weekly_windows(settings).get(date.weekday(), ()))
+    new_rows = []
+    for block in blocks:
+        for s, e in day.take(block.duration, 0) or [(to_minutes(block.start), to_minutes(block.end))]:
+            new_rows.append(PersonalScheduleBlock(task_id=block.task_id, date=date, start=to_time(s), end=to_time(e)))
+    PersonalScheduleBlock.objects.filter(pk__in=[b.pk for b in blocks]).delete()
+    PersonalScheduleBlock.objects.bulk_create(new_rows)
+
+
+def replan_task(task_id, vacated_dates=()):
+    """Re-plan a single task and only the days it leaves or lands on.
+
+    The task's future blocks are dropped, the days it vacated are compacted
+    and the remaining work is placed into the earliest free capacity after
+    its prerequisites. Dependents that would now start before the task
+    finishes are re-planned the same way; other tasks keep their days.
+    """
+    from .models import PersonalSchedule
+
+    today = datetime.date.today()
+    if not PersonalSchedule.objects.filter(week_start__gte=week_start_for(today) - datetime.timedelta(days=7)).exists():
+        # Scheduler not in use; nothing to keep in sync.
+        return set()
+
+    affected = set()
+    queue, seen = [(task_id, vacated_dates)], set()
+    with transaction.atomic():
+        while queue:
+            current, vacated = queue.pop(0)
+            if current in seen:
+                continue
+            seen.add(current)
+            affected |= _replan_one(current, vacated, today)
+            queue.extend((pk, ()) for pk in _dependents_ahead(current))
+        for week in {week_start_for(d) for d in affected}:
+            publish_week(week)
+    return affected
+
+
+def _last_block(task_ids):
+    """``(date, end)`` of the latest block of ``task_ids``, or ``None``."""
+    from .models import PersonalScheduleBlock
+
+    return (
+        PersonalScheduleBlock.objects.filter(task_id__in=task_ids)
+        .order_by("-date", "-end")
+        .values_list("date", "end")
+        .first()
+    )
+
+
+def _dependents_ahead(task_id):
+    """Dependents of ``task_id`` with a block starting before it finishes."""
+    from django.db.models import Q
+
+    from .models import PersonalScheduleBlock
+
+    last = _last_block([task_id])
+    if last is None:
+        return []
+    date, end = last
+    return list(
+        PersonalScheduleBlock.objects.filter(task__depends_on=task_id)
+        .exclude(task__status="DONE")
+        .filter(Q(date__lt=date) | Q(date=date, start__lt=end))
+        .order_by("task_id")
+        .values_list("task_id", flat=True)
+        .distinct()
+    )
+
+
+def _replan_one(task_id, vacated_dates, today):
+    """Move ``task_id``'s future blocks; returns the dates touched."""
+    from .models import PersonalScheduleBlock, PersonalTask
+
+    affected = set(vacated_dates)
+    future = PersonalScheduleBlock.objects.filter(task_id=task_id, date__gte=today)
+    affected.update(future.values_list("date", flat=True).distinct())
+    future.delete()
+    for date in sorted(d for d in affected if d >= today):
+        _repack_day(date)
+
+    task = PersonalTask.objects.select_related("project").filter(pk=task_id).first()
+    if not task or task.status == "DONE" or (task.estimated_hours or 0) <= 0:
+        return affected
+    spec = TaskSpec.from_task(task)
+    done = sum(
+        to_minutes(e) - to_minutes(s)
+        for s, e in PersonalScheduleBlock.objects.filter(task_id=task_id, date__lt=today).values_list("start", "end")
+    )
+    spec.minutes = max(spec.minutes - done, 0)
+    # Start after the latest block of any prerequisite, on that day too.
+    latest = _last_block(task.depends_on.values_list("pk", flat=True))
+    start = max(today, latest[0]) if latest else today
+    end = start + datetime.timedelta(days=REPLAN_HORIZON_WEEKS * 7 - 1)
+    # Starting after the horizon leaves it unplanned, like a full plan would.
+    if spec.start_date and spec.start_date > end:
+        return affected
+    days, settings = _capacity(start, end, exclude_task=task_id)
+    if latest and latest[0] == start:
+        days[0].reserve(0, to_minutes(latest[1]))
+    min_block = settings[week_start_for(start)].get("min_block", DEFAULT_MIN_BLOCK)
+    result = schedule_tasks([spec], days, min_block=min_block)
+    PersonalScheduleBlock.objects.bulk_create(
+        [
+            PersonalScheduleBlock(task_id=task_id, date=b.date, start=to_time(b.start), end=to_time(b.end))
+            for b in result.blocks
+        ]
+    )
+    affected.update(b.date for b in result.blocks)
+    return affected
+
+
+def replan_task_on_commit(task_id, vacated_dates=()):
+    """Run ``replan_task`` once the task edit is committed.
+
+    The edit is saved by then, so a failing re-plan is logged instead of
+    turning the response into an error; the task keeps its previous blocks.
+    """
+
+    def replan():
+        try:
+            replan_task(task_id, vacated_dates)
+        except Exception:
+            logger.exception("Could not re-plan task %s", task_id)
+
+    transaction.on_commit(replan)
+
+
+def plan(tasks, start, weeks, settings_data, depends_on=None):
+    """Full re-plan of ``tasks`` from ``start`` for ``weeks`` weeks.
+
+    ``settings_data`` comes from ``window_settings`` and is saved for every
+    planned week. Blocks of tasks outside ``tasks`` stay put and their time is
+    reserved, so planning a single project doesn't overbook the others.
+    """
+    end = start + datetime.timedelta(days=7 * weeks - 1)
+    task_ids = [t.id for t in tasks]
+    reserved = {}
+    other = blocks_between(start, end).exclude(task_id__in=task_ids)
+    for date, s, e in other.values_list("date", "start", "end"):
+        reserved.setdefault(date, []).append((to_minutes(s), to_minutes(e)))
+    specs = [TaskSpec.from_task(t, (depends_on or {}).get(t.id, ())) for t in tasks]
+    days = build_days(start, weeks, weekly_windows(settings_data), reserved)
+    result = schedule_tasks(specs, days, min_block=settings_data.get("min_block", DEFAULT_MIN_BLOCK))
+    with transaction.atomic():
+        for w in range(weeks):
+            save_settings(start + datetime.timedelta(days=7 * w), settings_data)
+        store_plan(result, start, end, task_ids)
+    return result
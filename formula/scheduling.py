@@ -0,0 +1,330 @@
+"""Task scheduling engine used by the project scheduler.
+
+Tasks are packed into per-day availability windows over a horizon of one or
+more weeks. Ordering is earliest-deadline-first (deadlines are pulled forward
+through dependency chains), then priority, then age; a task only becomes
+eligible once everything it depends on has been placed and it never starts
+before its prerequisites finish.
+
+Each day keeps its free time as a short list of intervals plus a running free
+total, and days without room for a minimum block are skipped through a
+union-find "next open day" pointer, so placing a task costs roughly the number
+of blocks it produces rather than ``days x blocks``.
+"""
+
+import datetime
+import heapq
+from dataclasses import dataclass, field
+
+PRIORITY_WEIGHTS = {"HIGH": 3, "MEDIUM": 2, "LOW": 1}
+DEFAULT_MIN_BLOCK = 30
+FAR_FUTURE = datetime.date.max
+
+
+def parse_hhmm(value, default="00:00"):
+    """Return minutes since midnight for ``HH:MM``, falling back to ``default``."""
+    for candidate in (value, default):
+        try:
+            hours, minutes = (int(x) for x in str(candidate).split(":"))
+            return hours * 60 + minutes
+        except (TypeError, ValueError):
+            continue
+    return 0
+
+
+def format_hhmm(minutes):
+    hours, minutes = divmod(int(minutes), 60)
+    return f"{hours:02d}:{minutes:02d}"
+
+
+@dataclass
+class TaskSpec:
+    id: int
+    title: str
+    minutes: int
+    project: str = ""
+    due_date: datetime.date | None = None
+    start_date: datetime.date | None = None
+    priority: str | None = None
+    created: float = 0.0
+    depends_on: tuple = ()
+
+    @classmethod
+    def from_task(cls, task, depends_on=()):
+        """Build a spec from a ``PersonalTask`` (project must be select_related)."""
+        return cls(
+            id=task.pk,
+            title=task.title,
+            minutes=int(float(task.estimated_hours or 0) * 60),
+            project=task.project.name if task.project_id else "",
+            due_date=task.due_date,
+            start_date=task.start_date,
+            priority=(task.priority or "").upper() or None,
+            created=task.created_at.timestamp() if task.created_at else 0.0,
+            depends_on=tuple(depends_on),
+        )
+
+
+@dataclass
+class Block:
+    task_id: int
+    title: str
+    project: str
+    date: datetime.date
+    start: int
+    end: int
+
+    @property
+    def duration(self):
+        return self.end - self.start
+
+    def as_dict(self):
+        return {
+            "task_id": self.task_id,
+            "title": self.title,
+            "project": self.project,
+            "duration": self.duration,
+            "start": format_hhmm(self.start),
+            "end": format_hhmm(self.end),
+        }
+
+
+class DayCapacity:
+    """Free intervals of a single day, consumed front to back."""
+
+    __slots__ = ("date", "free", "intervals")
+
+    def __init__(self, date, windows):
+        self.date = date
+        self.intervals = sorted([s, e] for s, e in windows if e > s)
+        self.free = sum(e - s for s, e in self.intervals)
+
+    def largest(self):
+        return max((e - s for s, e in self.intervals), default=0)
+
+    def reserve(self, start, end):
+        """Mark ``[start, end)`` as busy (e.g. blocks that are already booked)."""
+        kept = []
+        for s, e in self.intervals:
+            if e <= start or s >= end:
+                kept.append([s, e])
+                continue
+            if s < start:
+                kept.append([s, start])
+            if e > end:
+                kept.append([end, e])
+        self.intervals = kept
+        self.free = sum(e - s for s, e in kept)
+
+    def take(self, wanted, min_block, not_before=0):
+        """Allocate up to ``wanted`` minutes, returning ``[(start, end), ...]``.
+
+        A piece shorter than ``min_block`` is only used when it finishes the
+        task, so tasks are never shredded into unusable slivers.
+        """
+        pieces = []
+        i = 0
+        while wanted > 0 and i < len(self.intervals):
+            begin, end = self.intervals[i]
+            s = max(begin, not_before)
+            chunk = min(end - s, wanted)
+            if chunk <= 0 or (chunk < min_block and chunk < wanted):
+                i += 1
+                continue
+            pieces.append((s, s + chunk))
+            wanted -= chunk
+            self.free -= chunk
+            # Keep whatever is left on either side of the allocated piece.
+            rest = [[a, b] for a, b in ((begin, s), (s + chunk, end)) if b > a]
+            self.intervals[i : i + 1] = rest
+            i += len(rest)
+        return pieces
+
+
+@dataclass
+class ScheduleResult:
+    start: datetime.date
+    days: list
+    blocks: list = field(default_factory=list)
+    unscheduled: dict = field(default_factory=dict)
+    late: list = field(default_factory=list)
+    cycles: list = field(default_factory=list)
+
+    def blocks_by_date(self):
+        grouped = {d.date: [] for d in self.days}
+        for block in self.blocks:
+            grouped.setdefault(block.date, []).append(block)
+        for blocks in grouped.values():
+            blocks.sort(key=lambda b: b.start)
+        return grouped
+
+    def as_days(self):
+        return [
+            {"date": date.isoformat(), "blocks": [b.as_dict() for b in blocks]}
+            for date, blocks in sorted(self.blocks_by_date().items())
+        ]
+
+
+def build_days(start, weeks, weekly_windows, reserved=None):
+    """Create ``DayCapacity`` objects for ``weeks`` weeks from ``start``.
+
+    ``weekly_windows`` maps weekday (0 = Monday) to a list of ``(start, end)``
+    minute windows; ``reserved`` maps dates to already booked intervals.
+    """
+    days = []
+    for offset in range(max(int(weeks), 1) * 7):
+        date = start + datetime.timedelta(days=offset)
+        day = DayCapacity(date, weekly_windows.get(date.weekday(), ()))
+        for s, e in (reserved or {}).get(date, ()):
+            day.reserve(s, e)
+        days.append(day)
+    return days
+
+
+class _OpenDays:
+    """Union-find over day indexes pointing at the next day with room left."""
+
+    def __init__(self, days, min_block):
+        self.parent = list(range(len(days) + 1))
+        for i, day in enumerate(days):
+            if day.largest() < min_block:
+                self.close(i)
+
+    def find(self, i):
+        root = i
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[i] != root:
+            self.parent[i], i = root, self.parent[i]
+        return root
+
+    def close(self, i):
+        self.parent[i] = i + 1
+
+
+def _effective_deadlines(specs, dependents, order):
+    """Pull each deadline forward to the earliest deadline of its dependents."""
+    due = {tid: s.due_date or FAR_FUTURE for tid, s in specs.items()}
+    for tid in reversed(order):
+        for child in dependents.get(tid, ()):
+            if due[child] < due[tid]:
+                due[tid] = due[child]
+    return due
+
+
+def _topological(specs, dependents):
+    indegree = dict.fromkeys(specs, 0)
+    for s in specs.values():
+        for dep in s.depends_on:
+            if dep in specs:
+                indegree[s.id] += 1
+    ready = [tid for tid, n in indegree.items() if n == 0]
+    order = []
+    while ready:
+        tid = ready.pop()
+        order.append(tid)
+        for child in dependents.get(tid, ()):
+            indegree[child] -= 1
+            if indegree[child] == 0:
+                ready.append(child)
+    # Tasks in a cycle, or downstream of one, never reach indegree zero.
+    blocked = [tid for tid, n in indegree.items() if n > 0]
+    return order, blocked
+
+
+def schedule_tasks(tasks, days, min_block=DEFAULT_MIN_BLOCK):
+    """Place ``tasks`` (``TaskSpec``) into ``days`` (``DayCapacity``)."""
+    result = ScheduleResult(start=days[0].date if days else None, days=days)
+    specs = {t.id: t for t in tasks if t.minutes > 0}
+    if not days:
+        result.unscheduled = {tid: s.minutes for tid, s in specs.items()}
+        return result
+
+    dependents = {}
+    for s in specs.values():
+        for dep in s.depends_on:
+            if dep in specs:
+                dependents.setdefault(dep, []).append(s.id)
+    order, blocked = _topological(specs, dependents)
+    due = _effective_deadlines(specs, dependents, order)
+    result.cycles = blocked
+    blocked = set(blocked)
+
+    def sort_key(tid):
+        s = specs[tid]
+        return (due[tid], -PRIORITY_WEIGHTS.get(s.priority, 0), s.created, tid)
+
+    waiting = {
+        tid: sum(1 for d in s.depends_on if d in specs)
+        for tid, s in specs.items()
+        if tid not in blocked
+    }
+    heap = [(sort_key(tid), tid) for tid, n in waiting.items() if n == 0]
+    heapq.heapify(heap)
+
+    first_date = days[0].date
+    open_days = _OpenDays(days, min_block)
+    finished = {}  # task id -> (day index, minute) of its last block
+
+    while heap:
+        _key, tid = heapq.heappop(heap)
+        spec = specs[tid]
+        earliest = (0, 0)
+        if spec.start_date and spec.start_date > first_date:
+            earliest = ((spec.start_date - first_date).days, 0)
+        for dep in spec.depends_on:
+            if dep in finished and finished[dep] > earliest:
+                earliest = finished[dep]
+
+        remaining = spec.minutes
+        # Starting after the horizon: nothing to place, dependents follow below.
+        index = open_days.find(earliest[0]) if earliest[0] < len(days) else len(days)
+        last = None
+        while remaining > 0 and index < len(days):
+            day = days[index]
+            not_before = earliest[1] if index == earliest[0] else 0
+            for s, e in day.take(remaining, min_block, not_before):
+                result.blocks.append(
+                    Block(spec.id, spec.title, spec.project, day.date, s, e)
+                )
+                remaining -= e - s
+                last = (index, e)
+            if day.largest() < min_block:
+                open_days.close(index)
+            index = open_days.find(index + 1)
+
+        if remaining > 0:
+            result.unscheduled[tid] = remaining
+        if last is not None:
+            finished[tid] = last
+            if spec.due_date and days[last[0]].date > spec.due_date:
+                result.late.append(tid)
+        elif remaining > 0:
+            # Nothing placed; dependents can still go after the horizon start.
+            finished[tid] = earliest
+
+        for child in dependents.get(tid, ()):
+            if child in blocked:
+                continue
+            waiting[child] -= 1
+            if waiting[child] == 0:
+                heapq.heappush(heap, (sort_key(child), child))
+
+    # Tasks caught in (or behind) a dependency cycle go last, ignoring the cycle.
+    for tid in sorted(blocked, key=sort_key):
+        spec = specs[tid]
+        remaining = spec.minutes
+        index = open_days.find(0)
+        while remaining > 0 and index < len(days):
+            day = days[index]
+            for s, e in day.take(remaining, min_block):
+                result.blocks.append(
+                    Block(spec.id, spec.title, spec.project, day.date, s, e)
+                )
+                remaining -= e - s
+            if day.largest() < min_block:
+                open_days.close(index)
+            index = open_days.find(index + 1)
+        if remaining > 0:
+            result.unscheduled[tid] = remaining
+    return result
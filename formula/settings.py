@@ -2,13 +2,17 @@ from collections import OrderedDict
 from os import environ, path
 from pathlib import Path
 
-import sentry_sdk
 from django.core.management.utils import get_random_secret_key
 from django.templatetags.static import static
 from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 from unfold.contrib.constance.settings import UNFOLD_CONSTANCE_ADDITIONAL_FIELDS
 
+from formula.caching import caches
+from formula.db import databases
+from formula.log import logging_config
+from formula.vite import immutable_file_test
+
 ######################################################################
 # General
 ######################################################################
@@ -106,11 +110,15 @@ MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "debug_toolbar.middleware.DebugToolbarMiddleware",
+    # Anonymous hits on public pages are served before sessions and auth
+    "formula.pagecache.PublicPageCacheMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    # Dashboard/export/search GETs read from replicas when configured
+    "formula.db.ReplicaReadMiddleware",
     # Require login only for internal sections; public pages are exempt
     "formula.middleware.PublicLoginExemptMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
@@ -154,12 +162,18 @@ TEMPLATES = [
 ######################################################################
 # Databases
 ######################################################################
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "database.sqlite",
-    },
-}
+# DATABASE_URL / DATABASE_REPLICA_URLS / DB_* variables, see formula/db.py.
+# Without them this is database.sqlite in WAL mode.
+DATABASES = databases(BASE_DIR, environ)
+
+DATABASE_ROUTERS = ["formula.db.ReplicaRouter"]
+
+######################################################################
+# Cache
+######################################################################
+# CACHE_URL=locmem:// | file:///path | db://table | redis://host:6379/0,
+# see formula/caching.py. Use a shared backend with more than one worker.
+CACHES = caches(environ)
 
 ######################################################################
 # Authentication
@@ -253,15 +267,34 @@ MEDIA_ROOT = BASE_DIR / "media"
 
 MEDIA_URL = "/media/"
 
+# Largest file accepted by the upload views and the resumable upload endpoint
+FILE_UPLOAD_MAX_SIZE = int(environ.get("FILE_UPLOAD_MAX_MB", 2048)) * 1024 * 1024
+
+# Unfinished resumable uploads (see formula.uploads)
+FILE_UPLOAD_PARTIAL_DIR = Path(environ.get("FILE_UPLOAD_PARTIAL_DIR") or BASE_DIR / "tmp" / "uploads")
+
 STORAGES = {
     "default": {
         "BACKEND": "django.core.files.storage.FileSystemStorage",
     },
+    # Uploaded documents, stored once per distinct content (see formula.storage)
+    "content": {
+        "BACKEND": "formula.storage.ContentAddressedStorage",
+    },
     "staticfiles": {
-        "BACKEND": "whitenoise.storage.CompressedStaticFilesStorage",
+        # Hashed names plus gzip and brotli copies (see formula.storage)
+        "BACKEND": "formula.storage.StaticStorage",
     },
 }
 
+# Hashed files never change under the same name: serve them with a one year
+# "immutable" Cache-Control.
+WHITENOISE_IMMUTABLE_FILE_TEST = immutable_file_test
+
+# Fall back to the plain name instead of failing the page when a template
+# refers to a file missing from the manifest.
+WHITENOISE_MANIFEST_STRICT = False
+
 ######################################################################
 # Unfold
 ######################################################################
@@ -392,6 +425,11 @@ UNFOLD = {
                         "permission": "formula.utils.permission_callback",
                         # "permission": lambda request: request.user.is_superuser,
                     },
+                    {
+                        "title": _("Season standings"),
+                        "icon": "leaderboard",
+                        "link": reverse_lazy("admin:formula_driverseasonstanding_changelist"),
+                    },
                     {
                         "title": _("Constance"),
                         "icon": "settings",
@@ -537,6 +575,8 @@ OPENAI_API_KEY = environ.get("OPENAI_API_KEY")
 OPENAI_BASE_URL = environ.get("OPENAI_BASE_URL", "https://api.openai.com/v1")
 
 if SENTRY_DSN:
+    import sentry_sdk
+
     sentry_sdk.init(
         dsn=SENTRY_DSN,
         enable_tracing=False,
@@ -640,21 +680,5 @@ CONSTANCE_ADDITIONAL_FIELDS = {
     ],
 }
 
-LOGGING = {
-    'version': 1,
-    'disable_existing_loggers': False,
-    'handlers': {
-        'file': {
-            'level': 'DEBUG',
-            'class': 'logging.FileHandler',
-            'filename': BASE_DIR / 'debug.log',
-        },
-    },
-    'loggers': {
-        'django': {
-            'handlers': ['file'],
-            'level': 'DEBUG',
-            'propagate': True,
-        },
-    },
-}
+# JSON lines through a background queue, see formula/log.py for LOG_* variables.
+LOGGING = logging_config(BASE_DIR, DEBUG, environ)
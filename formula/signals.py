@@ -1,7 +1,21 @@
+from decimal import Decimal
+
 from django.conf import settings
-from django.db.models.signals import pre_delete, pre_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
 from django.dispatch import receiver
 
+from formula import (
+    blobs,
+    calendar_feed,
+    cashflow,
+    dashboard,
+    images,
+    live,
+    pagecache,
+    schedules,
+    standings,
+)
 from formula.exceptions import ReadonlyException
 
 
@@ -20,3 +34,227 @@ def prevent_modifications(sender, instance, **kwargs):
 @receiver(pre_delete)
 def block_delete(sender, instance, **kwargs):
     prevent_modifications(sender, instance, **kwargs)
+
+
+####################################################################
+# TV dashboard live updates
+####################################################################
+LIVE_MODELS = {
+    "formula.SavingsGoal": live.goal_changed,
+    "formula.PersonalTask": live.task_changed,
+    "formula.PersonalFinancialEntry": live.finance_changed,
+}
+
+
+def _connect_live(sender, handler):
+    def on_save(sender, instance, **kwargs):
+        handler(instance)
+
+    def on_delete(sender, instance, **kwargs):
+        handler(instance, deleted=True)
+
+    post_save.connect(on_save, sender=sender, weak=False)
+    post_delete.connect(on_delete, sender=sender, weak=False)
+
+
+for _sender, _handler in LIVE_MODELS.items():
+    _connect_live(_sender, _handler)
+
+
+####################################################################
+# Resized image variants
+####################################################################
+def _connect_images(sender, field):
+    def on_save(sender, instance, **kwargs):
+        file = getattr(instance, field)
+        if file:
+            # Schedules a build unless this file already has variants.
+            transaction.on_commit(lambda: images.variants(file))
+
+    post_save.connect(on_save, sender=sender, weak=False)
+
+
+for _sender, _field in images.IMAGE_FIELDS.items():
+    _connect_images(_sender, _field)
+
+
+####################################################################
+# Content-addressed file references
+####################################################################
+def _connect_blobs(sender, field):
+    def before_save(sender, instance, **kwargs):
+        old = None
+        if instance.pk is not None and not kwargs.get("raw"):
+            old = sender._default_manager.filter(pk=instance.pk).values_list(field, flat=True).first()
+        instance._blob_old_name = old or ""
+
+    def on_save(sender, instance, **kwargs):
+        # Same transaction as the row, so a rollback undoes the counts too.
+        old, new = getattr(instance, "_blob_old_name", ""), getattr(instance, field).name or ""
+        if old != new:
+            blobs.retain(new)
+            blobs.release(old)
+
+    def on_delete(sender, instance, **kwargs):
+        blobs.release(getattr(instance, field).name)
+
+    pre_save.connect(before_save, sender=sender, weak=False)
+    post_save.connect(on_save, sender=sender, weak=False)
+    post_delete.connect(on_delete, sender=sender, weak=False)
+
+
+for _sender, _field in blobs.BLOB_FIELDS.items():
+    _connect_blobs(_sender, _field)
+
+
+####################################################################
+# Incremental re-planning of scheduled task blocks
+####################################################################
+@receiver(pre_save, sender="formula.PersonalTask")
+def remember_task_schedule_fields(sender, instance, **kwargs):
+    instance._schedule_before = None
+    if instance.pk:
+        instance._schedule_before = (
+            sender.objects.filter(pk=instance.pk).values(*schedules.SCHEDULING_FIELDS).first()
+        )
+
+
+def _normalized(values):
+    # Decimals read back from the db carry trailing zeros the form value lacks.
+    return {
+        k: float(v) if isinstance(v, Decimal) else str(v) for k, v in values.items()
+    }
+
+
+@receiver(post_save, sender="formula.PersonalTask")
+def replan_changed_task(sender, instance, created, **kwargs):
+    before = getattr(instance, "_schedule_before", None)
+    if not created and before is not None:
+        after = {f: getattr(instance, f) for f in schedules.SCHEDULING_FIELDS}
+        if _normalized(before) == _normalized(after):
+            return
+    schedules.replan_task_on_commit(instance.pk)
+
+
+@receiver(pre_delete, sender="formula.PersonalTask")
+def remember_task_block_dates(sender, instance, **kwargs):
+    instance._schedule_dates = set(
+        instance.schedule_blocks.values_list("date", flat=True).distinct()
+    )
+
+
+@receiver(post_delete, sender="formula.PersonalTask")
+def replan_deleted_task(sender, instance, **kwargs):
+    dates = getattr(instance, "_schedule_dates", set())
+    if dates:
+        schedules.replan_task_on_commit(instance.pk, dates)
+
+
+####################################################################
+# Cached calendar ranges
+####################################################################
+@receiver(post_save, sender="formula.PersonalProject")
+@receiver(post_delete, sender="formula.PersonalProject")
+@receiver(post_save, sender="formula.PersonalTask")
+@receiver(post_delete, sender="formula.PersonalTask")
+def invalidate_calendar_events(sender, **kwargs):
+    transaction.on_commit(calendar_feed.bump_events_version)
+
+
+####################################################################
+# Cached cash-flow forecasts
+####################################################################
+@receiver(post_save, sender="formula.PersonalMonthlyItem")
+@receiver(post_delete, sender="formula.PersonalMonthlyItem")
+@receiver(post_save, sender="formula.PersonalFinancialEntry")
+@receiver(post_delete, sender="formula.PersonalFinancialEntry")
+def invalidate_cashflow(sender, **kwargs):
+    transaction.on_commit(cashflow.bump_cashflow_version)
+
+
+####################################################################
+# Cached public pages
+####################################################################
+@receiver(post_save, sender="formula.Car")
+@receiver(post_delete, sender="formula.Car")
+def invalidate_public_pages(sender, **kwargs):
+    transaction.on_commit(pagecache.bump_pages_version)
+
+
+####################################################################
+# Precomputed season standings
+####################################################################
+def _standing_keys(race_id, driver_id, constructor_id):
+    from formula.models import Race
+
+    year = Race.objects.filter(pk=race_id).values_list("year", flat=True).first()
+    return {(year, driver_id)}, {(year, constructor_id)}
+
+
+@receiver(pre_save, sender="formula.Standing")
+def remember_standing_keys(sender, instance, **kwargs):
+    instance._season_before = (set(), set())
+    if instance.pk:
+        old = sender.objects.filter(pk=instance.pk).values_list(
+            "race_id", "driver_id", "constructor_id"
+        ).first()
+        if old:
+            instance._season_before = _standing_keys(*old)
+
+
+@receiver(post_save, sender="formula.Standing")
+@receiver(post_delete, sender="formula.Standing")
+def update_standing_seasons(sender, instance, **kwargs):
+    drivers, constructors = getattr(instance, "_season_before", (set(), set()))
+    new_drivers, new_constructors = _standing_keys(
+        instance.race_id, instance.driver_id, instance.constructor_id
+    )
+    standings.update(drivers | new_drivers, constructors | new_constructors)
+
+
+@receiver(pre_save, sender="formula.Race")
+def remember_race_keys(sender, instance, **kwargs):
+    instance._season_before = None
+    if instance.pk:
+        instance._season_before = (
+            sender.objects.filter(pk=instance.pk).values_list("year", "winner_id").first()
+        )
+
+
+@receiver(post_save, sender="formula.Race")
+def update_race_seasons(sender, instance, created, **kwargs):
+    before = getattr(instance, "_season_before", None)
+    if created or before is None:
+        standings.update({(instance.year, instance.winner_id)})
+        return
+    year, winner_id = before
+    if (year, winner_id) == (instance.year, instance.winner_id):
+        return
+    drivers = {(year, winner_id), (instance.year, instance.winner_id)}
+    constructors = set()
+    if year != instance.year:
+        # Every result of the race moves to another season.
+        for y in (year, instance.year):
+            race_drivers, race_constructors = standings.race_keys(instance.pk, y)
+            drivers |= race_drivers
+            constructors |= race_constructors
+    standings.update(drivers, constructors)
+
+
+@receiver(post_delete, sender="formula.Race")
+def update_deleted_race_seasons(sender, instance, **kwargs):
+    # Standings protect their race, so only the win goes away.
+    standings.update({(instance.year, instance.winner_id)})
+
+
+####################################################################
+# Cached dashboard aggregates
+####################################################################
+@receiver(post_save, sender="formula.Driver")
+@receiver(post_delete, sender="formula.Driver")
+@receiver(post_save, sender="formula.Race")
+@receiver(post_delete, sender="formula.Race")
+@receiver(post_save, sender="formula.DriverSeasonStanding")
+@receiver(post_delete, sender="formula.DriverSeasonStanding")
+def invalidate_dashboard_aggregates(sender, **kwargs):
+    transaction.on_commit(dashboard.invalidate)
@@ -1,3 +1,4 @@
+from django.urls import path
 from unfold.sites import UnfoldAdminSite
 
 from .forms import LoginForm
@@ -6,5 +7,16 @@ from .forms import LoginForm
 class FormulaAdminSite(UnfoldAdminSite):
     login_form = LoginForm
 
+    def get_urls(self):
+        from .dashboard import component_view
+
+        return [
+            path(
+                "dashboard/components/<str:name>/",
+                self.admin_view(component_view),
+                name="dashboard_component",
+            ),
+        ] + super().get_urls()
+
 
 formula_admin_site = FormulaAdminSite()
@@ -0,0 +1,159 @@
+"""Season standings per (year, driver) and (year, constructor).
+
+Totals are derived from ``Standing`` rows (points, races, best position) and
+``Race.winner`` (driver wins); a constructor win is a standing in position 1.
+Instead of aggregating on every admin view the results are stored in
+``DriverSeasonStanding`` / ``ConstructorSeasonStanding`` and only the keys a
+change touches are recomputed. ``rebuild`` recreates both tables from scratch.
+"""
+
+from django.db import transaction
+from django.db.models import Count, Min, Q, Sum
+
+
+def _driver_totals(keys=None):
+    """``{(year, driver_id): {...}}`` for ``keys`` (every driver if ``None``)."""
+    from .models import Race, Standing
+
+    standings = Standing.objects.order_by()
+    races = Race.objects.order_by()
+    if keys is not None:
+        if not keys:
+            return {}
+        years = {y for y, _d in keys}
+        drivers = {d for _y, d in keys}
+        standings = standings.filter(race__year__in=years, driver_id__in=drivers)
+        races = races.filter(year__in=years, winner_id__in=drivers)
+    totals = {}
+    rows = standings.values("race__year", "driver_id").annotate(
+        points=Sum("points"), races=Count("id"), best_position=Min("position")
+    )
+    for row in rows:
+        totals[(row["race__year"], row["driver_id"])] = {
+            "points": row["points"] or 0,
+            "races": row["races"],
+            "best_position": row["best_position"],
+            "wins": 0,
+        }
+    for row in races.values("year", "winner_id").annotate(wins=Count("id")):
+        key = (row["year"], row["winner_id"])
+        totals.setdefault(key, {"points": 0, "races": 0, "best_position": None})["wins"] = row["wins"]
+    if keys is not None:
+        # The IN filters above match the cross product of years and ids.
+        totals = {k: v for k, v in totals.items() if k in keys}
+    return totals
+
+
+def _constructor_totals(keys=None):
+    from .models import Standing
+
+    standings = Standing.objects.order_by()
+    if keys is not None:
+        if not keys:
+            return {}
+        standings = standings.filter(
+            race__year__in={y for y, _c in keys},
+            constructor_id__in={c for _y, c in keys},
+        )
+    rows = standings.values("race__year", "constructor_id").annotate(
+        points=Sum("points"),
+        races=Count("race", distinct=True),
+        wins=Count("id", filter=Q(position=1)),
+    )
+    totals = {
+        (row["race__year"], row["constructor_id"]): {
+            "points": row["points"] or 0,
+            "races": row["races"],
+            "wins": row["wins"],
+        }
+        for row in rows
+    }
+    if keys is not None:
+        totals = {k: v for k, v in totals.items() if k in keys}
+    return totals
+
+
+def _store(model, owner_field, keys, totals):
+    """Upsert rows for ``keys`` that have totals and drop the ones that don't."""
+    if not keys:
+        return
+    existing = {
+        (row.year, getattr(row, f"{owner_field}_id")): row
+        for row in model.objects.filter(
+            year__in={y for y, _o in keys},
+            **{f"{owner_field}_id__in": {o for _y, o in keys}},
+        )
+    }
+    stale = []
+    for key in keys:
+        row = existing.get(key)
+        values = totals.get(key)
+        if values is None:
+            if row is not None:
+                stale.append(row.pk)
+            continue
+        if row is None:
+            model.objects.create(year=key[0], **{f"{owner_field}_id": key[1]}, **values)
+            continue
+        for name, value in values.items():
+            setattr(row, name, value)
+        row.save(update_fields=[*values, "updated_at"])
+    if stale:
+        model.objects.filter(pk__in=stale).delete()
+
+
+def update(driver_keys=(), constructor_keys=()):
+    """Recompute the season rows of the given ``(year, id)`` keys."""
+    from .models import ConstructorSeasonStanding, DriverSeasonStanding
+
+    driver_keys = {k for k in driver_keys if None not in k}
+    constructor_keys = {k for k in constructor_keys if None not in k}
+    with transaction.atomic():
+        _store(DriverSeasonStanding, "driver", driver_keys, _driver_totals(driver_keys))
+        _store(
+            ConstructorSeasonStanding,
+            "constructor",
+            constructor_keys,
+            _constructor_totals(constructor_keys),
+        )
+
+
+def race_keys(race_id, year):
+    """Driver and constructor keys of everything a race contributes to ``year``."""
+    from .models import Race, Standing
+
+    pairs = Standing.objects.filter(race_id=race_id).values_list("driver_id", "constructor_id")
+    drivers, constructors = set(), set()
+    for driver_id, constructor_id in pairs:
+        drivers.add((year, driver_id))
+        constructors.add((year, constructor_id))
+    winner = Race.objects.filter(pk=race_id).values_list("winner_id", flat=True).first()
+    if winner:
+        drivers.add((year, winner))
+    return drivers, constructors
+
+
+def rebuild(batch_size=1000):
+    """Recreate both tables from ``Standing`` and ``Race`` (three grouped queries)."""
+    from .models import ConstructorSeasonStanding, DriverSeasonStanding
+
+    drivers = _driver_totals()
+    constructors = _constructor_totals()
+    with transaction.atomic():
+        DriverSeasonStanding.objects.all().delete()
+        ConstructorSeasonStanding.objects.all().delete()
+        DriverSeasonStanding.objects.bulk_create(
+            (
+                DriverSeasonStanding(year=year, driver_id=driver_id, **values)
+                for (year, driver_id), values in drivers.items()
+            ),
+            batch_size=batch_size,
+        )
+        ConstructorSeasonStanding.objects.bulk_create(
+            (
+                ConstructorSeasonStanding(year=year, constructor_id=constructor_id, **values)
+                for (year, constructor_id), values in constructors.items()
+            ),
+            batch_size=batch_size,
+        )
+    return len(drivers), len(constructors)
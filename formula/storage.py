@@ -0,0 +1,126 @@
+"""Static files and uploaded files storage.
+
+``collectstatic`` writes every file under a content-hashed name
+(``app.3f2a9c1b7d4e.css``) plus a gzip and, with the ``brotli`` package
+installed, a brotli copy next to it; WhiteNoise picks the smallest encoding
+the browser accepts and, through ``formula.vite.immutable_file_test``, serves
+hashed names with a one year ``immutable`` Cache-Control. Templates get the
+hashed URL from ``{% static %}``, so a changed file is a new URL and repeat
+visits never revalidate.
+
+The Vite build in ``frontend_v2/dist`` already hashes its chunks and refers to
+them by those names, so those files keep their names instead of being hashed
+a second time.
+
+Uploaded documents go through ``ContentAddressedStorage``, which keeps one
+copy per distinct content.
+"""
+
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+
+from django.core.files.storage import FileSystemStorage, storages
+from django.utils.deconstruct import deconstructible
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+from formula.vite import HASHED_VITE_FILE
+
+
+class StaticStorage(CompressedManifestStaticFilesStorage):
+    def hashed_name(self, name, content=None, filename=None):
+        if HASHED_VITE_FILE.match(name.replace("\\", "/")):
+            return name
+        return super().hashed_name(name, content, filename)
+
+
+####################################################################
+# Uploaded files
+####################################################################
+# max_length of the FileFields using this storage
+MAX_NAME_LENGTH = 255
+BLOB_NAME = re.compile(r"(?:^|/)[0-9a-f]{2}/([0-9a-f]{64})/[^/]+$")
+
+
+def blob_hash(name):
+    """SHA-256 in a name written by ``ContentAddressedStorage``, else ``None``."""
+    match = BLOB_NAME.search(name or "")
+    return match.group(1) if match else None
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """Stores each distinct content once, as ``blobs/<ab>/<sha256>``.
+
+    A saved file is named ``<upload_to>/<ab>/<sha256>/<original filename>``
+    and that path is a hard link to the blob. URLs, ``path()``, media serving
+    and downloads keep the original filename, while the same content uploaded
+    any number of times (under any name) takes the disk space once.
+    ``formula.blobs`` counts references per blob and ``collect_blobs`` removes
+    blobs and links no row refers to anymore.
+    """
+
+    blobs_dir = "blobs"
+
+    def blob_name(self, sha256):
+        return f"{self.blobs_dir}/{sha256[:2]}/{sha256}"
+
+    def get_available_name(self, name, max_length=None):
+        # The final name comes from the content (see _save); equal names mean equal files.
+        return name
+
+    def _save(self, name, content):
+        sha256, temp_path = self._spool(content)
+        blob_path = self.path(self.blob_name(sha256))
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        if os.path.exists(blob_path):
+            os.remove(temp_path)
+        else:
+            os.replace(temp_path, blob_path)
+            if self.file_permissions_mode is not None:
+                os.chmod(blob_path, self.file_permissions_mode)
+
+        directory, filename = os.path.split(name)
+        prefix = "/".join(part for part in (directory, sha256[:2], sha256) if part) + "/"
+        name = prefix + self._shorten(filename, MAX_NAME_LENGTH - len(prefix))
+        link_path = self.path(name)
+        if not os.path.exists(link_path):
+            os.makedirs(os.path.dirname(link_path), exist_ok=True)
+            try:
+                os.link(blob_path, link_path)
+            except FileExistsError:
+                pass
+            except OSError:
+                # No hard links on this filesystem: keep a plain copy.
+                shutil.copyfile(blob_path, link_path)
+        return name
+
+    @staticmethod
+    def _shorten(filename, length):
+        if len(filename) <= length:
+            return filename
+        stem, ext = os.path.splitext(filename)
+        return stem[: max(length - len(ext), 1)] + ext[: max(length - 1, 0)]
+
+    def _spool(self, content):
+        """Write ``content`` to a temporary file next to the blobs while hashing it."""
+        directory = self.path(self.blobs_dir)
+        os.makedirs(directory, exist_ok=True)
+        digest = hashlib.sha256()
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    out.write(chunk)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        return digest.hexdigest(), temp_path
+
+
+def content_storage():
+    """Storage of the uploaded-file fields (``STORAGES["content"]``)."""
+    return storages["content"]
@@ -0,0 +1,217 @@
+"""Server-side tables for the custom list pages.
+
+``Table`` reads only the columns it displays (``values()``), resolves each
+row URL pattern once by reversing it with a sentinel pk and splicing real
+pks into the result, and escapes cells with plain string operations instead
+of a template or ``format_html`` call per cell.
+
+``Table.as_dict()`` keeps the ``{"headers", "rows"}`` shape of
+``build_table`` that ``unfold/components/table.html`` renders; ``stream()``
+yields the same rows as HTML for ``StreamingHttpResponse``.
+
+Sorting (``?sort=field`` / ``?sort=-field``) is limited to the declared
+sortable columns and pagination uses ``?page=`` / ``?per_page=``.
+"""
+
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.http import StreamingHttpResponse
+from django.urls import reverse
+from django.utils.formats import localize
+from django.utils.html import conditional_escape
+from django.utils.safestring import mark_safe
+from django.utils.translation import gettext_lazy as _
+
+# Reversed in place of a pk and swapped for the real one afterwards.
+SENTINEL_PK = 987654321
+DEFAULT_PER_PAGE = 100
+MAX_PER_PAGE = 1000
+STREAM_CHUNK_SIZE = 2000
+
+LINK_CLASS = "text-blue-600 hover:underline"
+DELETE_CLASS = "text-red-600 hover:underline"
+
+
+class RowUrl:
+    """``reverse(viewname, args=[pk])`` for many pks at the cost of one reverse."""
+
+    def __init__(self, viewname):
+        self.viewname = viewname
+        self._parts = None
+
+    def __call__(self, pk):
+        if self._parts is None:
+            url = reverse(self.viewname, args=[SENTINEL_PK])
+            self._parts = url.split(str(SENTINEL_PK), 1)
+        prefix, suffix = self._parts
+        return f"{prefix}{pk}{suffix}"
+
+
+def link(url, text, css=LINK_CLASS):
+    return f'<a class="{css}" href="{conditional_escape(url)}">{conditional_escape(text)}</a>'
+
+
+class Column:
+    """A table column.
+
+    ``field`` is the ``values()`` key shown (and sorted on). ``render`` takes
+    the row dict and returns the cell text; it may need extra ``fields``.
+    With ``link`` (a view name) the cell links to that view for the row pk.
+    ``html=True`` marks ``render`` output as already escaped markup.
+    """
+
+    def __init__(self, header, field=None, *, render=None, fields=(), link=None,
+                 sortable=None, html=False, blank=""):
+        self.header = header
+        self.field = field
+        self.render = render
+        self.fields = tuple(fields) + ((field,) if field else ())
+        self.url = RowUrl(link) if link else None
+        self.sortable = bool(field) if sortable is None else sortable
+        self.html = html
+        self.blank = blank
+
+    def cell(self, row):
+        value = self.render(row) if self.render else row.get(self.field)
+        if value is None:
+            value = self.blank
+        if self.url is not None:
+            return link(self.url(row["pk"]), localize(value))
+        return str(value) if self.html else conditional_escape(localize(value))
+
+
+class Actions(Column):
+    """Edit/Delete links for the row: ``Actions(edit="route_edit", delete="route_delete")``."""
+
+    def __init__(self, edit=None, delete=None, header=None):
+        super().__init__(header or _("Actions"), sortable=False, html=True)
+        self.actions = []
+        if edit:
+            self.actions.append((_("Edit"), RowUrl(edit), f"{LINK_CLASS} mr-2"))
+        if delete:
+            self.actions.append((_("Delete"), RowUrl(delete), DELETE_CLASS))
+
+    def cell(self, row):
+        return "".join(link(url(row["pk"]), label, css) for label, url, css in self.actions)
+
+
+class Table:
+    def __init__(self, queryset, columns, request=None, *, ordering=None,
+                 per_page=DEFAULT_PER_PAGE):
+        self.queryset = queryset
+        self.columns = columns
+        self.request = request
+        self.params = request.GET if request is not None else {}
+        self.ordering = self._ordering(ordering)
+        self.per_page = self._per_page(per_page)
+        self._page = None
+
+    ####################################################################
+    # Query
+    ####################################################################
+    def _ordering(self, default):
+        sortable = {c.field for c in self.columns if c.sortable}
+        sort = self.params.get("sort", "")
+        if sort.lstrip("-") in sortable:
+            return [sort, "-pk" if sort.startswith("-") else "pk"]
+        return list(default or self.queryset.query.order_by or ["-pk"])
+
+    def _per_page(self, default):
+        try:
+            value = int(self.params.get("per_page", default or 0))
+        except (TypeError, ValueError):
+            value = default or 0
+        return min(value, MAX_PER_PAGE) if value > 0 else None
+
+    def values(self):
+        fields = {"pk"}
+        for column in self.columns:
+            fields.update(column.fields)
+        return self.queryset.order_by(*self.ordering).values(*sorted(fields))
+
+    @property
+    def page(self):
+        """The current ``Page`` (``None`` when the table is not paginated)."""
+        if self._page is None and self.per_page:
+            paginator = Paginator(self.values(), self.per_page)
+            try:
+                self._page = paginator.page(self.params.get("page", 1))
+            except PageNotAnInteger:
+                self._page = paginator.page(1)
+            except EmptyPage:
+                self._page = paginator.page(paginator.num_pages)
+        return self._page
+
+    ####################################################################
+    # Rendering
+    ####################################################################
+    @property
+    def headers(self):
+        return [c.header for c in self.columns]
+
+    def render_row(self, row):
+        return [mark_safe(c.cell(row)) for c in self.columns]
+
+    def rows(self):
+        source = self.page.object_list if self.per_page else self.values()
+        return [self.render_row(row) for row in source]
+
+    def as_dict(self):
+        return {"headers": self.headers, "rows": self.rows()}
+
+    def stream(self):
+        """Yield the whole (unpaginated) table as HTML, a chunk of rows at a time."""
+        yield "<table><thead><tr>"
+        yield "".join(f"<th>{conditional_escape(h)}</th>" for h in self.headers)
+        yield "</tr></thead><tbody>"
+        chunk = []
+        for row in self.values().iterator(chunk_size=STREAM_CHUNK_SIZE):
+            chunk.append("<tr>" + "".join(f"<td>{cell}</td>" for cell in self.render_row(row)) + "</tr>")
+            if len(chunk) >= STREAM_CHUNK_SIZE:
+                yield "".join(chunk)
+                chunk = []
+        yield "".join(chunk)
+        yield "</tbody></table>"
+
+    def streaming_response(self):
+        return StreamingHttpResponse(self.stream(), content_type="text/html; charset=utf-8")
+
+
+class TableViewMixin:
+    """List views that render one ``Table`` into ``context[table_context_name]``.
+
+    ``?stream=1`` returns the full table as streamed HTML instead of the page.
+    """
+
+    table_context_name = "table"
+    table_ordering = None
+    table_per_page = DEFAULT_PER_PAGE
+
+    def get_table_columns(self):
+        raise NotImplementedError
+
+    def get_table_queryset(self):
+        return self.get_queryset()
+
+    def get_table(self):
+        if not hasattr(self, "_table"):
+            self._table = Table(
+                self.get_table_queryset(),
+                self.get_table_columns(),
+                self.request,
+                ordering=self.table_ordering,
+                per_page=self.table_per_page,
+            )
+        return self._table
+
+    def render_to_response(self, context, **response_kwargs):
+        if self.request.GET.get("stream"):
+            return self.get_table().streaming_response()
+        return super().render_to_response(context, **response_kwargs)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        table = self.get_table()
+        context[self.table_context_name] = table.as_dict()
+        context["table_page"] = table.page
+        context["table_sort"] = self.request.GET.get("sort", "")
+        return context
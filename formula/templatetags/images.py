@@ -0,0 +1,41 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from formula.images import variants
+
+register = template.Library()
+
+
+@register.simple_tag
+def responsive_image(file, alt="", sizes="100vw", css_class="", loading="lazy"):
+    """``<picture>`` with WebP and JPEG srcsets for an image field file.
+
+    Falls back to a plain ``<img>`` of the original until the variants are
+    built (see formula.images); the first render schedules them.
+    """
+    if not file:
+        return ""
+    entry = variants(file)
+    if not entry:
+        return format_html(
+            '<img src="{}" alt="{}" class="{}" loading="{}" decoding="async" />', file.url, alt, css_class, loading
+        )
+    sources = {mime: ", ".join(f"{url} {w}w" for w, url in items) for mime, items in entry["variants"].items()}
+    fallback = entry["variants"]["image/jpeg"]
+    return format_html(
+        '<picture>{}<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" alt="{}" class="{}" '
+        'loading="{}" decoding="async" /></picture>',
+        format_html_join(
+            "",
+            '<source type="{}" srcset="{}" sizes="{}" />',
+            ((mime, srcset, sizes) for mime, srcset in sources.items() if mime != "image/jpeg"),
+        ),
+        fallback[len(fallback) // 2][1],
+        sources["image/jpeg"],
+        sizes,
+        entry["width"],
+        entry["height"],
+        alt,
+        css_class,
+        loading,
+    )
@@ -0,0 +1,7 @@
+from django.test import override_settings
+
+# Deletes are refused unless DEBUG (see signals.prevent_modifications), and the
+# toolbar callback reads the module-level DEBUG, so views are tested with both pinned.
+app_settings = override_settings(
+    DEBUG=True, DEBUG_TOOLBAR_CONFIG={"SHOW_TOOLBAR_CALLBACK": lambda request: False}
+)
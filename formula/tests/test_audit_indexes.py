@@ -0,0 +1,42 @@
+import datetime
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count
+from django.test import SimpleTestCase
+
+from formula.management.commands import audit_indexes
+from formula.models import Finance, Load, PersonalTask
+
+
+class ThrowawayDatabaseTests(SimpleTestCase):
+    def test_refuses_default(self):
+        with self.assertRaisesMessage(CommandError, "it is the 'default' database"):
+            call_command("audit_indexes", database="default")
+
+    def test_refuses_unknown_alias(self):
+        with self.assertRaisesMessage(CommandError, "Unknown database 'audit'"):
+            call_command("audit_indexes", database="audit")
+
+    def test_database_is_required(self):
+        with self.assertRaises(CommandError):
+            call_command("audit_indexes")
+
+
+class CandidateIndexTests(SimpleTestCase):
+    def test_equality_then_sort_then_range(self):
+        today = datetime.date(2026, 10, 19)
+        shape = Load.objects.filter(route_id=1, pickup_date__gte=today).order_by("-created_at")
+
+        self.assertEqual(audit_indexes.candidate_index(shape), (Load, ["route", "created_at", "pickup_date"]))
+
+    def test_group_by(self):
+        shape = PersonalTask.objects.values("status").annotate(n=Count("id")).order_by()
+
+        self.assertEqual(audit_indexes.candidate_index(shape), (PersonalTask, ["status"]))
+
+    def test_existing_index_prefix_is_covered(self):
+        self.assertTrue(audit_indexes.is_covered(Finance, ["type"]))
+        self.assertTrue(audit_indexes.is_covered(Finance, ["type", "date"]))
+        self.assertFalse(audit_indexes.is_covered(Finance, ["amount"]))
+        self.assertFalse(audit_indexes.is_covered(Finance, ["date", "type"]))
@@ -0,0 +1,51 @@
+import os
+import tempfile
+import time
+
+from django.core.files.base import ContentFile
+from django.test import TestCase
+
+from formula import blobs
+from formula.models import Blob, FileStorage
+from formula.storage import content_storage
+from formula.tests import app_settings
+
+DAY_AGO = time.time() - 24 * 60 * 60
+
+
+@app_settings
+class CollectTests(TestCase):
+    def setUp(self):
+        self.media = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(self.settings(MEDIA_ROOT=self.media))
+        self.storage = content_storage()
+
+    def age_files(self):
+        for directory, _subdirs, files in os.walk(self.media):
+            for filename in files:
+                os.utime(os.path.join(directory, filename), (DAY_AGO, DAY_AGO))
+
+    def test_unreferenced_links_and_blobs_are_removed(self):
+        kept = FileStorage.objects.create(name="kept", file=ContentFile(b"kept", name="kept.txt"))
+        gone = FileStorage.objects.create(name="gone", file=ContentFile(b"gone", name="gone.txt"))
+        gone_path = gone.file.path
+        gone.delete()
+        self.age_files()
+
+        removed, links, freed = blobs.collect(grace=60)
+
+        self.assertEqual((removed, links, freed), (1, 1, 4))
+        self.assertFalse(os.path.exists(gone_path))
+        self.assertTrue(self.storage.exists(kept.file.name))
+        self.assertEqual(list(Blob.objects.values_list("refcount", flat=True)), [1])
+
+    def test_image_derivatives_survive(self):
+        derivative = os.path.join(self.media, "derivatives", "ab", "ab" * 32, "800.webp")
+        os.makedirs(os.path.dirname(derivative))
+        with open(derivative, "wb") as f:
+            f.write(b"RIFF")
+        self.age_files()
+
+        blobs.collect(grace=60)
+
+        self.assertTrue(os.path.exists(derivative))
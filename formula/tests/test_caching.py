@@ -0,0 +1,29 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from formula import caching
+
+
+class GetOrComputeLockTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.namespace = caching.Namespace("test-lock")
+        self.addCleanup(caching.NAMESPACES.pop, "test-lock", None)
+        self.lock = f"{self.namespace.key('value')}:lock"
+
+    def test_releases_its_own_lock(self):
+        self.assertEqual(self.namespace.get_or_compute("value", compute=lambda: 1), 1)
+
+        self.assertIsNone(cache.get(self.lock))
+
+    def test_timed_out_wait_keeps_the_other_lock(self):
+        # Another worker is computing and takes longer than LOCK_WAIT.
+        cache.add(self.lock, 1, caching.LOCK_TIMEOUT)
+
+        with mock.patch.object(caching, "LOCK_WAIT", 0):
+            self.assertEqual(self.namespace.get_or_compute("value", compute=lambda: 2), 2)
+
+        self.assertEqual(cache.get(self.lock), 1)
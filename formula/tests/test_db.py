@@ -0,0 +1,24 @@
+from django.test import RequestFactory, SimpleTestCase
+
+from formula.db import ReplicaReadMiddleware
+
+
+class ReplicaReadMiddlewareTests(SimpleTestCase):
+    def wants_replica(self, path, method="get"):
+        request = getattr(RequestFactory(), method)(path)
+        return ReplicaReadMiddleware(lambda request: None).wants_replica(request)
+
+    def test_dashboard_paths_and_subpaths(self):
+        self.assertTrue(self.wants_replica("/admin/"))
+        self.assertTrue(self.wants_replica("/personal/goals/"))
+        self.assertTrue(self.wants_replica("/tv/dashboard/"))
+
+    def test_language_prefixed_paths(self):
+        self.assertTrue(self.wants_replica("/en/admin/"))
+        self.assertTrue(self.wants_replica("/de/admin/formula/load/"))
+
+    def test_other_paths_stay_on_the_primary(self):
+        self.assertFalse(self.wants_replica("/en/load/"))
+        self.assertFalse(self.wants_replica("/administrator/"))
+        self.assertFalse(self.wants_replica("/tv/dashboard/events/"))
+        self.assertFalse(self.wants_replica("/en/admin/", method="post"))
@@ -0,0 +1,69 @@
+import json
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+
+from formula.models import SavingsGoal, User
+from formula.tests import app_settings
+
+
+@app_settings
+class GoalsBatchTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user("saver"))
+        self.goal = SavingsGoal.objects.create(title="Car", target_amount=Decimal("1000"), priority=1)
+
+    def batch(self, *ops):
+        return self.client.post(
+            reverse("goals_v2_api_batch"), json.dumps({"ops": list(ops)}), content_type="application/json"
+        )
+
+    def assertRefused(self, response, index):
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["op"], index)
+        self.goal.refresh_from_db()
+        self.assertEqual(self.goal.title, "Car")
+        self.assertEqual(SavingsGoal.objects.count(), 1)
+
+    def test_applies_operations(self):
+        response = self.batch(
+            {"op": "add", "name": "House", "targetAmount": 5000},
+            {"op": "update", "id": str(self.goal.pk), "name": "Truck"},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.goal.refresh_from_db()
+        self.assertEqual(self.goal.title, "Truck")
+        self.assertEqual(SavingsGoal.objects.count(), 2)
+
+    def test_reorder_with_non_integer_ids(self):
+        response = self.batch({"op": "add", "name": "House"}, {"op": "reorder", "ids": [self.goal.pk, "abc"]})
+
+        self.assertRefused(response, 1)
+
+    def test_reorder_without_a_list(self):
+        self.assertRefused(self.batch({"op": "reorder", "ids": "1,2"}), 0)
+
+    def test_update_with_null_name(self):
+        response = self.batch({"op": "update", "id": self.goal.pk, "name": None})
+
+        self.assertRefused(response, 0)
+        self.assertIn("name", response.json()["error"])
+
+    def test_update_with_invalid_type(self):
+        self.assertRefused(self.batch({"op": "update", "id": self.goal.pk, "type": "lottery"}), 0)
+
+    def test_update_with_invalid_amount(self):
+        self.assertRefused(self.batch({"op": "update", "id": self.goal.pk, "targetAmount": "NaN"}), 0)
+
+    def test_delete_with_missing_id(self):
+        self.assertRefused(self.batch({"op": "delete"}), 0)
+
+    def test_operation_that_is_not_an_object(self):
+        self.assertRefused(self.batch({"op": "add", "name": "House"}, ["update"]), 1)
+
+    def test_failure_rolls_back_earlier_operations(self):
+        response = self.batch({"op": "add", "name": "House"}, {"op": "update", "id": self.goal.pk, "name": ""})
+
+        self.assertRefused(response, 1)
@@ -0,0 +1,62 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from formula import live
+from formula.models import LiveEvent
+from formula.tests import app_settings
+
+
+@app_settings
+class BacklogTests(TestCase):
+    def test_replays_events_after_last_id(self):
+        first = live.publish("goal.updated", {"id": 1})
+        second = live.publish("goal.deleted", {"id": 1})
+
+        self.assertEqual(
+            live.backlog_since(first),
+            [{"id": second, "event": "goal.deleted", "data": {"id": 1}}],
+        )
+        self.assertEqual([m["id"] for m in live.backlog_since(0)], [first, second])
+
+    def test_id_newer_than_the_table_reloads(self):
+        # E.g. Last-Event-ID kept by a screen across a database reset.
+        last_id = live.publish("goal.updated", {"id": 1})
+
+        self.assertIsNone(live.backlog_since(last_id + 100))
+
+    def test_pruned_events_reload(self):
+        with mock.patch.object(live, "BACKLOG_SIZE", 2):
+            first = live.publish("task.updated", {"id": 1})
+            for _ in range(3):
+                live.publish("task.updated", {"id": 1})
+
+        self.assertEqual(LiveEvent.objects.count(), 2)
+        self.assertIsNone(live.backlog_since(first))
+
+
+class PollTests(TestCase):
+    def setUp(self):
+        self.broker = live.Broker()
+        self.sent = []
+        self.broker.dispatch = self.sent.append
+
+    def test_dispatches_events_from_any_process(self):
+        LiveEvent.objects.create(id=1, event="goal.updated", data={"id": 7})
+
+        cursor = self.broker.poll(0, {})
+
+        self.assertEqual(cursor, 1)
+        self.assertEqual(self.sent, [{"id": 1, "event": "goal.updated", "data": {"id": 7}}])
+
+    def test_late_lower_id_is_still_dispatched(self):
+        gaps = {}
+        LiveEvent.objects.create(id=3, event="goal.updated", data={})
+        cursor = self.broker.poll(1, gaps)
+        LiveEvent.objects.create(id=2, event="task.updated", data={})
+
+        cursor = self.broker.poll(cursor, gaps)
+
+        self.assertEqual(cursor, 3)
+        self.assertEqual([m["id"] for m in self.sent], [3, 2])
+        self.assertEqual(gaps, {})
@@ -0,0 +1,102 @@
+import datetime
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+
+from formula import schedules
+from formula.models import (
+    PersonalProject,
+    PersonalSchedule,
+    PersonalScheduleBlock,
+    PersonalTask,
+    User,
+)
+from formula.tests import app_settings
+
+
+@app_settings
+class ReplanTaskTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user("planner"))
+        today = datetime.date.today()
+        PersonalSchedule.objects.create(week_start=schedules.week_start_for(today))
+        self.project = PersonalProject.objects.create(name="House")
+        self.task = PersonalTask.objects.create(project=self.project, title="Paint fence", estimated_hours=2)
+        PersonalScheduleBlock.objects.create(
+            task=self.task, date=today, start=datetime.time(18), end=datetime.time(20)
+        )
+
+    def edit(self, **changes):
+        data = {"project": self.project.pk, "title": self.task.title, "status": "TODO", "estimated_hours": "2"}
+        data.update(changes)
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(reverse("edit_task", args=[self.task.pk]), data)
+
+    def test_start_date_beyond_horizon_drops_blocks(self):
+        far = datetime.date.today() + datetime.timedelta(weeks=schedules.REPLAN_HORIZON_WEEKS + 4)
+
+        response = self.edit(start_date=far.isoformat())
+
+        self.assertEqual(response.status_code, 302)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.start_date, far)
+        self.assertFalse(PersonalScheduleBlock.objects.filter(task=self.task).exists())
+
+    def test_failed_replan_is_logged(self):
+        with (
+            mock.patch.object(schedules, "replan_task", side_effect=RuntimeError("boom")),
+            self.assertLogs("formula.schedules", "ERROR"),
+        ):
+            response = self.edit(title="Paint the fence", estimated_hours="3")
+
+        self.assertEqual(response.status_code, 302)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.title, "Paint the fence")
+
+
+@app_settings
+class ReplanDependencyTests(TestCase):
+    def setUp(self):
+        self.today = datetime.date.today()
+        PersonalSchedule.objects.create(week_start=schedules.week_start_for(self.today))
+        project = PersonalProject.objects.create(name="Shed")
+        self.first = PersonalTask.objects.create(project=project, title="Pour slab", estimated_hours=2)
+        self.second = PersonalTask.objects.create(project=project, title="Frame walls", estimated_hours=1)
+        self.second.depends_on.add(self.first)
+
+    def blocks(self, task):
+        return list(PersonalScheduleBlock.objects.filter(task=task).values_list("date", "start", "end"))
+
+    def test_dependent_starts_after_the_prerequisite_on_the_same_day(self):
+        PersonalScheduleBlock.objects.create(
+            task=self.first, date=self.today, start=datetime.time(19), end=datetime.time(21)
+        )
+
+        schedules.replan_task(self.second.pk)
+
+        self.assertEqual(self.blocks(self.second), [(self.today, datetime.time(21), datetime.time(22))])
+
+    def test_dependents_follow_a_prerequisite_that_slips(self):
+        PersonalScheduleBlock.objects.create(
+            task=self.first, date=self.today, start=datetime.time(18), end=datetime.time(20)
+        )
+        PersonalScheduleBlock.objects.create(
+            task=self.second, date=self.today, start=datetime.time(20), end=datetime.time(21)
+        )
+        PersonalTask.objects.filter(pk=self.first.pk).update(estimated_hours=3)
+
+        schedules.replan_task(self.first.pk)
+
+        self.assertEqual(self.blocks(self.first), [(self.today, datetime.time(18), datetime.time(21))])
+        self.assertEqual(self.blocks(self.second), [(self.today, datetime.time(21), datetime.time(22))])
+
+    def test_dependency_cycle_terminates(self):
+        self.first.depends_on.add(self.second)
+        PersonalScheduleBlock.objects.create(
+            task=self.second, date=self.today, start=datetime.time(18), end=datetime.time(19)
+        )
+
+        schedules.replan_task(self.first.pk)
+
+        self.assertEqual(len(self.blocks(self.first)), 1)
@@ -0,0 +1,57 @@
+import datetime
+
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from formula.models import PersonalProject, PersonalTask, User
+from formula.scheduling import TaskSpec, build_days, schedule_tasks
+from formula.tests import app_settings
+
+MONDAY = datetime.date(2025, 1, 6)
+EVENINGS = {d: [(18 * 60, 22 * 60)] for d in range(7)}
+
+
+class ScheduleTasksTests(SimpleTestCase):
+    def test_start_date_beyond_horizon_is_unscheduled(self):
+        days = build_days(MONDAY, 1, EVENINGS)
+        later = TaskSpec(id=1, title="Later", minutes=60, start_date=MONDAY + datetime.timedelta(days=60))
+        after = TaskSpec(id=2, title="After", minutes=60, depends_on=(1,))
+        now = TaskSpec(id=3, title="Now", minutes=60)
+
+        result = schedule_tasks([later, after, now], days)
+
+        self.assertEqual(result.unscheduled, {1: 60, 2: 60})
+        self.assertEqual({b.task_id for b in result.blocks}, {3})
+
+    def test_start_date_on_last_day_is_placed(self):
+        days = build_days(MONDAY, 1, EVENINGS)
+        spec = TaskSpec(id=1, title="Sunday", minutes=60, start_date=MONDAY + datetime.timedelta(days=6))
+
+        result = schedule_tasks([spec], days)
+
+        self.assertEqual(result.unscheduled, {})
+        self.assertEqual([b.date for b in result.blocks], [spec.start_date])
+
+
+@app_settings
+class AutoScheduleViewTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user("planner"))
+
+    def test_far_future_task_is_reported_unscheduled(self):
+        project = PersonalProject.objects.create(name="House")
+        task = PersonalTask.objects.create(
+            project=project, title="Paint fence", estimated_hours=2,
+            start_date=MONDAY + datetime.timedelta(days=365),
+        )
+
+        response = self.client.post(
+            reverse("project_scheduler"),
+            {"action": "auto_schedule", "week": MONDAY.isoformat(), "weeks": 1},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["unscheduled"],
+            [{"task_id": task.pk, "title": "Paint fence", "minutes": 120}],
+        )
@@ -0,0 +1,52 @@
+import tempfile
+
+from django.test import TestCase
+from django.urls import reverse
+
+from formula.models import UploadSession, User
+from formula.tests import app_settings
+
+TUS = {"HTTP_TUS_RESUMABLE": "1.0.0"}
+
+
+@app_settings
+class UploadEndpointTests(TestCase):
+    def setUp(self):
+        partial = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(self.settings(FILE_UPLOAD_PARTIAL_DIR=partial))
+        self.owner = User.objects.create_user("owner")
+        self.other = User.objects.create_user("other")
+
+    def start(self, length=10):
+        return self.client.post(reverse("filestorage_uploads"), HTTP_UPLOAD_LENGTH=str(length), **TUS)
+
+    def test_anonymous_upload_is_forbidden(self):
+        response = self.start()
+
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(UploadSession.objects.exists())
+
+    def test_anonymous_resume_is_forbidden(self):
+        self.client.force_login(self.owner)
+        location = self.start()["Location"]
+        self.client.logout()
+
+        self.assertEqual(self.client.head(location, **TUS).status_code, 403)
+
+    def test_sessions_of_other_users_are_not_found(self):
+        self.client.force_login(self.owner)
+        response = self.start()
+        self.assertEqual(response.status_code, 201)
+        location = response["Location"]
+
+        self.client.force_login(self.other)
+        self.assertEqual(self.client.head(location, **TUS).status_code, 404)
+        patch = self.client.patch(
+            location, b"0123456789", content_type="application/offset+octet-stream", HTTP_UPLOAD_OFFSET="0", **TUS
+        )
+        self.assertEqual(patch.status_code, 404)
+        self.assertEqual(self.client.delete(location, **TUS).status_code, 404)
+        self.assertEqual(UploadSession.objects.get().offset, 0)
+
+        self.client.force_login(self.owner)
+        self.assertEqual(self.client.head(location, **TUS)["Upload-Offset"], "0")
@@ -0,0 +1,212 @@
+"""Streaming, resumable file uploads for ``FileStorage``.
+
+Files are never read into memory as a whole: form uploads are hashed through
+``UploadedFile.chunks()`` and the resumable endpoint (``views.uploads``, a
+subset of the tus 1.0 protocol: creation, HEAD/PATCH, termination) appends the
+request body to a partial file in ``FILE_UPLOAD_PARTIAL_DIR`` one
+``CHUNK_SIZE`` block at a time. The SHA-256 of the content is computed while
+the bytes go by; when an interrupted upload resumes on another worker, the
+partial file is hashed once from disk instead.
+
+A finished file whose hash is already stored is not written again: the new
+``FileStorage`` row points at the existing file. ``FILE_UPLOAD_MAX_SIZE`` caps
+both paths.
+"""
+
+import hashlib
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+CHUNK_SIZE = 1024 * 1024
+TUS_VERSION = "1.0.0"
+# Running hashes of uploads in progress in this process.
+MAX_HASHERS = 64
+
+_hashers = OrderedDict()
+
+
+class UploadError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def max_size():
+    from django.conf import settings
+
+    return settings.FILE_UPLOAD_MAX_SIZE
+
+
+####################################################################
+# Storing complete files
+####################################################################
+def file_hash(file):
+    """``(sha256, size)`` of an uploaded or stored file, read in chunks."""
+    digest = hashlib.sha256()
+    size = 0
+    for chunk in file.chunks(CHUNK_SIZE):
+        digest.update(chunk)
+        size += len(chunk)
+    return digest.hexdigest(), size
+
+
+def duplicate_of(sha256):
+    from formula.models import FileStorage
+
+    if not sha256:
+        return None
+    return FileStorage.objects.filter(sha256=sha256).exclude(file="").order_by("pk").first()
+
+
+def prepare(instance, file):
+    """Hash ``file`` for a ``FileStorage`` about to be saved and reuse an identical stored file."""
+    sha256, size = file_hash(file)
+    instance.sha256, instance.size = sha256, size
+    existing = duplicate_of(sha256)
+    instance.file = existing.file.name if existing else file
+    return instance
+
+
+def store(file, **fields):
+    """New ``FileStorage`` for an uploaded ``file``."""
+    from formula.models import FileStorage
+
+    if file.size > max_size():
+        raise UploadError(f"File is larger than {max_size() // (1024 * 1024)} MB.", 413)
+    instance = prepare(FileStorage(**fields), file)
+    instance.save()
+    return instance
+
+
+####################################################################
+# Resumable sessions
+####################################################################
+def partial_path(session):
+    from django.conf import settings
+
+    return Path(settings.FILE_UPLOAD_PARTIAL_DIR) / str(session.pk)
+
+
+def create(user, filename, length, metadata):
+    from formula.models import UploadSession
+
+    if length < 0:
+        raise UploadError("Upload-Length must not be negative.")
+    if length > max_size():
+        raise UploadError(f"File is larger than {max_size() // (1024 * 1024)} MB.", 413)
+    session = UploadSession.objects.create(
+        user=user, filename=os.path.basename(filename or "upload")[:255], length=length, metadata=metadata
+    )
+    path = partial_path(session)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.touch()
+    if length == 0:
+        finish(session, hashlib.sha256())
+    return session
+
+
+def _hasher(session, path):
+    entry = _hashers.pop(session.pk, None)
+    if entry is not None and entry[0] == session.offset:
+        digest = entry[1]
+    else:
+        # Resumed elsewhere or after a restart: hash what is on disk so far.
+        digest = hashlib.sha256()
+        remaining = session.offset
+        with open(path, "rb") as f:
+            while remaining > 0:
+                block = f.read(min(CHUNK_SIZE, remaining))
+                if not block:
+                    break
+                digest.update(block)
+                remaining -= len(block)
+    return digest
+
+
+def append(session, stream, offset):
+    """Write ``stream`` at ``offset``; returns the new offset."""
+    from formula.models import UploadSession
+
+    if session.complete:
+        raise UploadError("Upload is already complete.", 409)
+    if offset != session.offset:
+        raise UploadError(f"Upload-Offset {offset} does not match {session.offset}.", 409)
+    path = partial_path(session)
+    if not path.exists():
+        raise UploadError("Upload data is gone.", 410)
+    digest = _hasher(session, path)
+    written = 0
+    try:
+        with open(path, "r+b") as out:
+            out.seek(offset)
+            out.truncate()
+            while True:
+                block = stream.read(CHUNK_SIZE)
+                if not block:
+                    break
+                if offset + written + len(block) > session.length:
+                    raise UploadError("Body is longer than Upload-Length.", 413)
+                out.write(block)
+                digest.update(block)
+                written += len(block)
+    finally:
+        # Keep what arrived, even when the client went away mid-request.
+        new_offset = offset + written
+        updated = UploadSession.objects.filter(pk=session.pk, offset=offset).update(offset=new_offset)
+        if updated:
+            session.offset = new_offset
+            _remember(session.pk, new_offset, digest)
+    if not updated:
+        raise UploadError("Upload was changed by another request.", 409)
+    if session.complete:
+        finish(session, _hashers.pop(session.pk)[1])
+    return session.offset
+
+
+def _remember(pk, offset, digest):
+    _hashers[pk] = (offset, digest)
+    while len(_hashers) > MAX_HASHERS:
+        _hashers.popitem(last=False)
+
+
+def finish(session, digest):
+    """Turn a complete upload into a ``FileStorage`` row."""
+    from django.core.files import File
+
+    from formula.models import FileStorage, Load
+
+    path = partial_path(session)
+    sha256 = digest.hexdigest()
+    existing = duplicate_of(sha256)
+    if existing:
+        name = existing.file.name
+    else:
+        field = FileStorage._meta.get_field("file")
+        with open(path, "rb") as f:
+            name = field.storage.save(os.path.join(field.upload_to, session.filename), File(f))
+    metadata = session.metadata or {}
+    load_id = metadata.get("load")
+    if load_id and not Load.objects.filter(pk=load_id).exists():
+        load_id = None
+    category = metadata.get("category")
+    if category not in dict(FileStorage.CATEGORY_CHOICES):
+        category = None
+    session.file = FileStorage.objects.create(
+        name=(metadata.get("name") or session.filename)[:255],
+        file=name,
+        category=category,
+        description=(metadata.get("description") or None),
+        load_id=load_id,
+        sha256=sha256,
+        size=session.length,
+    )
+    session.save(update_fields=["file", "updated_at"])
+    path.unlink(missing_ok=True)
+    return session.file
+
+
+def terminate(session):
+    _hashers.pop(session.pk, None)
+    partial_path(session).unlink(missing_ok=True)
+    session.delete()
@@ -15,6 +15,8 @@ urlpatterns = (
     path("cars/<int:pk>/", views.PublicCarDetailView.as_view(), name="public_car_detail"),
     path("contact/submit/", views.ContactSubmitView.as_view(), name="contact_submit"),
     path("login/", views.LoginRedirectView.as_view(), name="login"),
+    # Token-authenticated iCalendar subscription (see formula.calendar_feed)
+    path("calendar/<str:token>/feed.ics", views.calendar_feed, name="calendar_feed"),
 
     # Internal dashboard (employees can use admin login, then access personal tools)
     path("app/", views.HomeView.as_view(), name="internal_home"),
@@ -29,6 +31,7 @@ urlpatterns = (
     path("assignments/<int:pk>/", views.detail_view, name="assignments_detail"),
     path("assignments/<int:pk>/chat/", views.chat_view, name="assignments_chat"),
     path("tv/dashboard/", views.tv_dashboard, name="tv_dashboard"),
+    path("tv/dashboard/events/", views.tv_dashboard_events, name="tv_dashboard_events"),
     ]
     + i18n_patterns(
         path("admin/", formula_admin_site.urls),
@@ -36,6 +39,8 @@ urlpatterns = (
         path('filestorage/add/', views.FileStorageCreateView.as_view(), name='filestorage_add'),
         path('filestorage/<int:pk>/edit/', views.FileStorageUpdateView.as_view(), name='filestorage_edit'),
         path('filestorage/<int:pk>/delete/', views.FileStorageDeleteView.as_view(), name='filestorage_delete'),
+        path('filestorage/uploads/', views.FileUploadsView.as_view(), name='filestorage_uploads'),
+        path('filestorage/uploads/<uuid:pk>/', views.FileUploadView.as_view(), name='filestorage_upload'),
         path('iftareport/', views.IFTAReportListView.as_view(), name='iftareport_list'),
         path('iftareport/add/', views.IFTAReportCreateView.as_view(), name='iftareport_add'),
         path('iftareport/<int:pk>/edit/', views.IFTAReportUpdateView.as_view(), name='iftareport_edit'),
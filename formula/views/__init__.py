@@ -0,0 +1,68 @@
+"""Views, split per area and imported on first use.
+
+``formula.views.<name>`` keeps working for the URL confs, settings and the
+admin: the module that defines ``name`` is imported the first time it is
+looked up, so ``django.setup()`` and management commands that never touch a
+view don't pay for the view modules (and what they import).
+"""
+
+import importlib
+
+_AREAS = {
+    "public": (
+        "PublicHomePageView", "LoginRedirectView", "PublicServicesView", "PublicCarsView",
+        "PublicCarDetailView", "ContactSubmitView",
+    ),
+    "internal": (
+        "AdminContextMixin", "HomeView", "CrispyFormView", "CrispyFormsetView", "build_table",
+        "dashboard_callback", "random_data",
+    ),
+    "business": (
+        "FileStorageListView", "FileStorageCreateView", "FileStorageUpdateView", "FileStorageDeleteView",
+        "IFTAReportListView", "IFTAReportCreateView", "IFTAReportUpdateView", "IFTAReportDeleteView",
+        "RouteListView", "RouteCreateView", "RouteUpdateView", "RouteDeleteView",
+        "LoadListView", "LoadCreateView", "LoadUpdateView", "LoadDeleteView",
+        "DriverListView", "DriverCreateView", "DriverUpdateView", "DriverDeleteView",
+        "BusinessAssetListView", "BusinessAssetCreateView", "BusinessAssetUpdateView", "BusinessAssetDeleteView",
+        "FinanceListView", "FinanceCreateView", "FinanceUpdateView", "FinanceDeleteView",
+    ),
+    "assistant": ("AIAssistantView", "PersonalAIChatView"),
+    "personal": (
+        "PersonalBaseView", "PersonalDashboardView", "enrich_task_record_with_ai", "enrich_task_with_ai",
+        "PersonalPropertiesView", "PersonalPropertyEditView", "PersonalPropertyDeleteView",
+        "PersonalRepairsView", "PersonalRepairEditView", "PersonalRepairDeleteView",
+        "PersonalProjectsView", "PersonalProjectEditView", "PersonalProjectDeleteView",
+        "PersonalAssetsView", "PersonalAssetEditView", "PersonalAssetDeleteView",
+        "PersonalFinancialView", "PersonalFinancialEditView", "PersonalFinancialDeleteView",
+        "FORECAST_MONTHS", "PersonalMonthlyItemsView", "PersonalMonthlyItemEditView", "PersonalMonthlyItemDeleteView",
+        "PersonalDocumentsView", "PersonalDocumentEditView", "PersonalDocumentDeleteView",
+        "PersonalReportsView", "PersonalReportEditView", "PersonalReportDeleteView",
+        "calendar_feed_url", "calendar_feed", "GlobalCalendarView", "calendar_events",
+        "ProjectSchedulerView", "ProjectSchedulerCompactView", "ProjectTaskEditView", "ProjectTaskDeleteView",
+        "reorder_tasks", "reorder_monthly_items", "api_cashflow",
+    ),
+    "goals": (
+        "SavingsGoalsView", "SavingsGoalsV2View", "SavingsGoalsEmbedView", "GOAL_FIELDS", "GOAL_AMOUNTS",
+        "GoalOpError", "goals_version", "api_goals_list", "api_goals_batch", "api_goals_scenarios",
+        "api_goals_add", "api_goals_update", "api_goals_delete", "reorder_goals", "update_goal_amount",
+    ),
+    "uploads": ("FileUploadsView", "FileUploadView"),
+    "assignments": ("upload_view", "detail_view", "list_view", "chat_view"),
+    "tv": ("cashflow_summary", "tv_dashboard", "tv_dashboard_events"),
+}
+
+_MODULES = {name: area for area, names in _AREAS.items() for name in names}
+
+
+def __getattr__(name):
+    area = _MODULES.get(name)
+    if area is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{area}"), name)
+    # Later lookups skip this function.
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_MODULES))
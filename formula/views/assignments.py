@@ -0,0 +1,390 @@
+"""Assignment evaluation: uploads, rubric runs and chat."""
+
+import json
+import os
+import re
+
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import get_object_or_404, redirect, render
+
+from formula.forms import UploadForm
+from formula.models import ChatTurn, RunResult, Upload
+from formula.utils import RUBRICS
+
+# === Assignments evaluation (inline implementation) ===
+
+# Enough bytes for the 200000 character text cap in any UTF-8 text.
+MAX_TEXT_BYTES = 800_000
+
+
+def _detect_rubric(extracted_text: str) -> str:
+    """Very simple heuristic rubric set selector based on keyword presence."""
+    text_l = extracted_text.lower()
+    # Prefer more specific matches first
+    preference_order = [
+        ("logistic", "NBM3 Task 2"),
+        ("regression", "NBM3 Task 1"),
+        ("dashboard", "NAM2 Task 1"),
+        ("machine learning", "NIP TASK 3"),
+        ("chatbot", "NIP TASK 1"),
+        ("robot", "NIP TASK 2"),
+    ]
+    for kw, name in preference_order:
+        if kw in text_l and name in RUBRICS:
+            return name
+    # fallback: first available rubric
+    return next(iter(RUBRICS.keys())) if RUBRICS else ""
+
+
+def _evaluate_text(rubric_name: str, text: str):
+    """Produce per-item comments heuristically (no external API)."""
+    rubric = RUBRICS.get(rubric_name, {})
+    results = []
+    text_l = text.lower()
+    for label, question in rubric.items():
+        # crude relevance: count overlapping words from first 3 significant words of label
+        tokens = [t for t in re.split(r"[^a-z0-9]+", label.lower()) if t and len(t) > 2][:4]
+        hits = sum(1 for t in tokens if t in text_l)
+        if hits >= max(1, len(tokens)//2):
+            comment = f"The submission addresses {label} with some relevant detail; consider adding one deeper example."  # positive-ish
+        else:
+            comment = f"The submission lacks clear coverage of {label}; add specific evidence – this area needs improvement."  # needs improvement
+        results.append({
+            "label": label,
+            "question": question,
+            "comment": comment,
+        })
+    # synthesis
+    needs = [r for r in results if "needs improvement" in r["comment"].lower()]
+    strengths = len(results) - len(needs)
+    synthesis = (
+        f"You provide solid development across {strengths} rubric areas while {len(needs)} need(s) clearer evidence. "
+        f"You can strengthen weak areas by adding concrete data, examples, or justification. "
+        "You are on the right track; iterate with targeted revisions for the flagged items."  # always 3 sentences
+    )
+    return results, synthesis
+
+
+def _evaluate_text_ai(rubric_name: str, text: str):
+    """Two-phase AI evaluation: structure with GPT-5 (or fallback) then reasoning validation with o3 (or fallback).
+
+    Returns (items, synthesis, steps) where steps is a list of run dicts for persistence.
+    Each final item may include validated_score (0/1) and reason.
+    """
+    if not os.getenv('OPENAI_API_KEY'):
+        raise RuntimeError('OPENAI_API_KEY not configured')
+    rubric = RUBRICS.get(rubric_name, {})
+    if not rubric:
+        raise RuntimeError('Rubric not found')
+    struct_model = os.getenv('OPENAI_STRUCT_MODEL', os.getenv('OPENAI_MODEL', 'gpt-5'))
+    reason_model = os.getenv('OPENAI_REASON_MODEL', 'o3')
+    # Fallback hints
+    fallback_struct = 'gpt-4o-mini'
+    fallback_reason = 'gpt-4o-mini'
+
+    rubric_lines = [f"- {k}: {v}" for k, v in rubric.items()]
+    snippet = text[:15000]
+    system_struct = (
+        "You evaluate a student assignment against a rubric. "
+        "Respond ONLY with valid JSON: {\"items\": [ {\"label\": str, \"question\": str, \"initial_comment\": str }... ], \"synthesis\": str }. "
+        "One sentence per initial_comment. No markdown fences."
+    )
+    user_struct = (
+        f"Rubric: {rubric_name}\nItems:\n" + '\n'.join(rubric_lines) + "\n\nAssignment (truncated):\n" + snippet
+    )
+    try:
+        from openai import OpenAI  # type: ignore
+        client = OpenAI()
+        # Phase 1: structural extraction
+        try:
+            resp1 = client.chat.completions.create(
+                model=struct_model,
+                messages=[{"role": "system", "content": system_struct}, {"role": "user", "content": user_struct}],
+                temperature=0,
+                max_tokens=900,
+            )
+        except Exception:
+            # retry with fallback
+            resp1 = client.chat.completions.create(
+                model=fallback_struct,
+                messages=[{"role": "system", "content": system_struct}, {"role": "user", "content": user_struct}],
+                temperature=0,
+                max_tokens=900,
+            )
+        content1 = resp1.choices[0].message.content.strip()
+        if content1.startswith('```'):
+            content1 = content1.strip('`')
+            content1 = content1.split('\n', 1)[-1]
+        data = json.loads(content1)
+        raw_items = data.get('items') or []
+        synthesis = (data.get('synthesis') or '').strip()
+        norm_items = []
+        for it in raw_items:
+            if not isinstance(it, dict):
+                continue
+            norm_items.append({
+                'label': it.get('label', '').strip()[:200],
+                'question': it.get('question', '').strip()[:500],
+                'comment': it.get('initial_comment', it.get('comment','')).strip()[:500],
+            })
+        if not norm_items:
+            raise RuntimeError('No items returned by structural model')
+        # Phase 2: reasoning validation per item (cap to 40 items for safety)
+        validated = []
+        reason_failures = 0
+        for it in norm_items[:40]:
+            label = it['label']
+            question = it['question']
+            base_comment = it['comment']
+            # Build small context slice: naive keyword search
+            ctx_slice = ''
+            kw = label.split()[:3]
+            low_text = text.lower()
+            for k in kw:
+                idx = low_text.find(k.lower())
+                if idx != -1:
+                    start = max(0, idx-160)
+                    end = idx+160
+                    ctx_slice = text[start:end]
+                    break
+            reason_system = (
+                "You are a strict rubric reasoning validator. Return JSON: {label, validated_score: 0|1, revised_comment, reason}. "
+                "validated_score=1 only if the assignment excerpt clearly supports the rubric item. Keep revised_comment one sentence."
+            )
+            reason_user = (
+                f"Rubric Item Label: {label}\nQuestion: {question}\nCurrent Comment: {base_comment}\nExcerpt: {ctx_slice or 'N/A'}"
+            )
+            try:
+                try:
+                    resp2 = client.chat.completions.create(
+                        model=reason_model,
+                        messages=[{"role": "system", "content": reason_system}, {"role": "user", "content": reason_user}],
+                        temperature=0,
+                        max_tokens=350,
+                    )
+                except Exception:
+                    resp2 = client.chat.completions.create(
+                        model=fallback_reason,
+                        messages=[{"role": "system", "content": reason_system}, {"role": "user", "content": reason_user}],
+                        temperature=0,
+                        max_tokens=350,
+                    )
+                c2 = resp2.choices[0].message.content.strip()
+                if c2.startswith('```'):
+                    c2 = c2.strip('`')
+                    c2 = c2.split('\n', 1)[-1]
+                jd = json.loads(c2)
+                validated_score = 1 if str(jd.get('validated_score','')).strip() in {'1','true','True'} else 0
+                revised_comment = jd.get('revised_comment') or jd.get('comment') or base_comment
+                reason_txt = jd.get('reason','')[:400]
+                it['validated_score'] = validated_score
+                it['reason'] = reason_txt
+                it['comment'] = revised_comment.strip()[:500]
+            except Exception:
+                reason_failures += 1
+                it['validated_score'] = None
+                it['reason'] = 'Reasoning validation failed'
+            validated.append(it)
+        if reason_failures and not synthesis:
+            synthesis = f"Structural evaluation produced {len(validated)} items; {reason_failures} reasoning checks failed."
+        if not synthesis:
+            positives = sum(1 for v in validated if v.get('validated_score') == 1)
+            synthesis = f"{positives} of {len(validated)} items show clear evidence; focus on strengthening the remainder with concrete examples."[:400]
+        steps = [
+            {
+                'step_name': 'ai_structure_evaluation',
+                'prompt': f'Rubric: {rubric_name} model={struct_model}',
+                'output_text': content1[:5000],
+            },
+            {
+                'step_name': 'ai_reasoning_validation',
+                'prompt': f'Rubric: {rubric_name} model={reason_model}',
+                'output_text': json.dumps([{'label': v['label'], 'validated_score': v.get('validated_score'), 'reason': v.get('reason')} for v in validated])[:8000],
+            }
+        ]
+        return validated, synthesis[:1000], steps
+    except Exception as e:
+        raise RuntimeError(f'AI evaluation failed: {e}')
+
+
+@login_required
+def upload_view(request):
+    if request.method == 'POST':
+        form = UploadForm(request.POST, request.FILES)
+        if form.is_valid():
+            f = form.cleaned_data['file']
+            forced_type = form.cleaned_data.get('assignment_type') or 'auto'
+            evaluation_mode = form.cleaned_data.get('evaluation_mode') or 'heuristic'
+            # Only the start is needed for the text; the file itself is streamed to storage.
+            raw = b''
+            for chunk in f.chunks():
+                raw += chunk[:MAX_TEXT_BYTES - len(raw)]
+                if len(raw) >= MAX_TEXT_BYTES:
+                    break
+            try:
+                text = raw.decode('utf-8', errors='ignore')
+            except Exception:
+                text = ''
+            # Detect title as first non-empty line
+            detected_title = ''
+            for line in text.splitlines():
+                stripped = line.strip()
+                if stripped:
+                    detected_title = stripped[:500]
+                    break
+            upload = Upload.objects.create(
+                file=f,
+                original_name=getattr(f, 'name', 'uploaded'),
+                detected_title=detected_title,
+                extracted_text=text[:200000],  # safety cap
+                status='uploaded'
+            )
+            rubric_name = _detect_rubric(upload.extracted_text)
+            if forced_type and forced_type != 'auto' and forced_type in RUBRICS:
+                rubric_name = forced_type
+            upload.assignment_type = rubric_name
+            used_mode = 'heuristic'
+            extra_steps = []
+            if evaluation_mode == 'ai':
+                try:
+                    ai_result = _evaluate_text_ai(rubric_name, upload.extracted_text)
+                    if isinstance(ai_result, tuple) and len(ai_result) == 3:
+                        items, synthesis, extra_steps = ai_result
+                    else:  # backward compat
+                        items, synthesis = ai_result  # type: ignore
+                    used_mode = 'ai'
+                except Exception as ai_err:
+                    items, synthesis = _evaluate_text(rubric_name, upload.extracted_text)
+                    ChatTurn.objects.create(upload=upload, role='system', content=f'AI evaluation failed; fallback heuristic used. ({ai_err})')
+            else:
+                items, synthesis = _evaluate_text(rubric_name, upload.extracted_text)
+            upload.status = 'evaluated'
+            upload.save(update_fields=['assignment_type', 'status'])
+            # Persist run(s)
+            if used_mode == 'ai':
+                # main final items snapshot
+                RunResult.objects.create(
+                    upload=upload,
+                    step_name='ai_final_items',
+                    prompt=f'Rubric: {rubric_name}',
+                    output_text=str(items)
+                )
+                for st in extra_steps:
+                    RunResult.objects.create(
+                        upload=upload,
+                        step_name=st['step_name'],
+                        prompt=st['prompt'],
+                        output_text=st['output_text'],
+                    )
+                ChatTurn.objects.create(upload=upload, role='system', content=f'AI STRUCT={os.getenv("OPENAI_STRUCT_MODEL","gpt-5")} REASON={os.getenv("OPENAI_REASON_MODEL","o3")} evaluation executed for {rubric_name}')
+            else:
+                RunResult.objects.create(
+                    upload=upload,
+                    step_name='heuristic_evaluation',
+                    prompt=f'Rubric: {rubric_name}',
+                    output_text=str(items)
+                )
+                ChatTurn.objects.create(upload=upload, role='system', content=f'HEURISTIC rubric evaluation executed for {rubric_name}')
+            ChatTurn.objects.create(upload=upload, role='assistant', content=synthesis)
+            # Stash synthesized data in session for immediate detail view (avoid re-parsing list string)
+            request.session[f'assign_eval_{upload.pk}'] = {
+                'items': items,
+                'synthesis': synthesis,
+            }
+            return redirect('assignments_detail', pk=upload.pk)
+    else:
+        form = UploadForm()
+    return render(request, 'assignments/upload.html', {'form': form})
+
+
+@login_required
+def detail_view(request, pk: int):
+    upload = get_object_or_404(Upload, pk=pk)
+    sess_key = f'assign_eval_{upload.pk}'
+    data = request.session.get(sess_key)
+    final_items = []
+    synthesis = ''
+    if data:
+        final_items = data.get('items', [])
+        synthesis = data.get('synthesis', '')
+    else:
+        # attempt to reconstruct from RunResult (prefer AI over heuristic)
+        run = upload.runs.filter(step_name__in=['ai_evaluation','heuristic_evaluation']).order_by('-id').first()
+        if run:
+            try:
+                # unsafe eval avoided; use literal_eval
+                from ast import literal_eval
+                final_items = literal_eval(run.output_text)
+            except Exception:
+                final_items = []
+        last_chat = upload.chat_turns.order_by('-id').first()
+        if last_chat and last_chat.role == 'assistant':
+            synthesis = last_chat.content
+    needs_improvement = [it['label'] for it in final_items if 'needs improvement' in it['comment'].lower()]
+    context = {
+        'upload': upload,
+        'final_items': final_items,
+        'needs_improvement': needs_improvement,
+        'synthesis': synthesis,
+        'chat': upload.chat_turns.all(),
+        'runs': upload.runs.all(),
+    'all_comments_csv': ', '.join(it.get('comment','') for it in final_items) if final_items else '',
+    }
+    # prevent stale session growth
+    request.session.pop(sess_key, None)
+    return render(request, 'assignments/detail.html', context)
+
+
+@login_required
+def list_view(request):
+    """Simple listing of recent uploads."""
+    uploads = Upload.objects.all()[:200]
+    return render(request, 'assignments/list.html', {
+        'uploads': uploads,
+    })
+
+
+@login_required
+def chat_view(request, pk: int):
+    """Accept a user question and generate a heuristic assistant reply referencing extracted text.
+
+    This is a lightweight retrieval: we take up to 5 keywords (>=3 chars) from the question and
+    return sentences from the extracted_text that contain them, plus a brief summary.
+    """
+    upload = get_object_or_404(Upload, pk=pk)
+    if request.method != 'POST':  # safety
+        return redirect('assignments_detail', pk=pk)
+    question = (request.POST.get('question') or '').strip()
+    if not question:
+        return redirect('assignments_detail', pk=pk)
+    ChatTurn.objects.create(upload=upload, role='user', content=question)
+    text = upload.extracted_text[:50000]  # cap
+    # naive sentence split
+    sentences = re.split(r'(?<=[.!?])\s+', text)
+    # extract simple keywords
+    words = [w.lower() for w in re.findall(r'[A-Za-z]{3,}', question) if len(w) > 2]
+    seen = set()
+    keywords = []
+    for w in words:
+        if w not in seen:
+            seen.add(w)
+            keywords.append(w)
+        if len(keywords) >= 6:
+            break
+    matched = []
+    if keywords:
+        for s in sentences:
+            ls = s.lower()
+            if any(k in ls for k in keywords):
+                matched.append(s.strip())
+            if len(matched) >= 6:
+                break
+    if not matched:
+        answer_body = "I didn't find explicit matching content; consider adding more detail for: " + ', '.join(keywords[:3])
+    else:
+        answer_body = "Relevant excerpts:\n" + '\n'.join(f"- {m}" for m in matched)
+    synthesis = (
+        answer_body + "\n\nHeuristic note: This is a surface-level retrieval. Add concrete evidence or examples to strengthen alignment."  # guidance
+    )
+    ChatTurn.objects.create(upload=upload, role='assistant', content=synthesis)
+    return redirect('assignments_detail', pk=pk)
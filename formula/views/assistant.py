@@ -0,0 +1,132 @@
+"""AI chat pages; the OpenAI client is only loaded when a message is sent."""
+
+from django import forms
+from django.urls import reverse_lazy
+from django.utils.translation import gettext_lazy as _
+from django.views.generic import FormView
+
+from ..ai import chat_with_openai, rag_chat
+from .internal import AdminContextMixin
+from .personal import PersonalBaseView
+
+
+class AIAssistantView(AdminContextMixin, FormView):
+    template_name = 'formula/ai_assistant.html'
+    success_url = reverse_lazy('ai_assistant')
+    title = _("AI Assistant")
+    form_class = forms.Form
+
+    MODELS = [
+        ("gpt-5", "GPT-5"),
+        ("gpt-4o", "GPT-4o"),
+        ("o3-mini", "o3-mini"),
+        ("llama-3.1-405b", "Llama 3.1 405B"),
+    ]
+
+    AGENTS = [
+        ("general", "General Purpose"),
+        ("internal", "Internal Data QA"),
+        ("docs", "Docs QA"),
+        ("code", "Code Assistant"),
+    ]
+
+    DEFAULT_PROMPTS = {
+        "general": "You are a helpful, concise assistant.",
+        "internal": "You can reference our internal data sources. If unsure, say so and ask clarifying questions.",
+        "docs": "Answer strictly from the provided documentation. If not found, say you don't know.",
+        "code": "Be a precise coding assistant. Provide short answers and examples when needed.",
+    }
+
+    def get_initial(self):
+        return {
+            'model': self.request.POST.get('model') or 'gpt-5',
+            'agent': self.request.POST.get('agent') or 'general',
+            'system_prompt': self.request.POST.get('system_prompt') or self.DEFAULT_PROMPTS.get('general'),
+        }
+
+    def get_chat(self):
+        return self.request.session.get('ai_chat', [])
+
+    def set_chat(self, chat):
+        self.request.session['ai_chat'] = chat
+        self.request.session.modified = True
+
+    def post(self, request, *args, **kwargs):
+        model = request.POST.get('model') or 'gpt-5'
+        agent = request.POST.get('agent') or 'general'
+        system_prompt = request.POST.get('system_prompt') or self.DEFAULT_PROMPTS.get(agent, self.DEFAULT_PROMPTS['general'])
+        message = (request.POST.get('message') or '').strip()
+        action = request.POST.get('action')
+
+        if action == 'clear':
+            self.set_chat([])
+            return self.form_valid(form=None)
+
+        chat = self.get_chat()
+        chat = chat[-50:]
+        request.session['ai_settings'] = {'model': model, 'agent': agent, 'system_prompt': system_prompt}
+
+        if message:
+            chat.append({'role': 'user', 'content': message})
+            try:
+                if agent == 'internal':
+                    reply = rag_chat(model=model, system_prompt=system_prompt, chat=chat)
+                else:
+                    reply = chat_with_openai(model=model, system_prompt=system_prompt, messages=chat)
+            except Exception as e:
+                reply = f"Error: {e}. Ensure OPENAI_API_KEY is set."
+            chat.append({'role': 'assistant', 'content': reply})
+            self.set_chat(chat)
+        return self.form_valid(form=None)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        saved = self.request.session.get('ai_settings') or {}
+        model = saved.get('model', 'gpt-5')
+        agent = saved.get('agent', 'general')
+        system_prompt = saved.get('system_prompt', self.DEFAULT_PROMPTS.get(agent, self.DEFAULT_PROMPTS['general']))
+        context.update({
+            'models': self.MODELS,
+            'agents': self.AGENTS,
+            'model_selected': model,
+            'agent_selected': agent,
+            'system_prompt': system_prompt,
+            'chat': self.get_chat(),
+            'show_internal_tools': False,
+        })
+        return context
+
+# New: Personal AI Chat
+class PersonalAIChatView(PersonalBaseView, FormView):
+    template_name = 'ai_chat.html'
+    form_class = forms.Form
+    success_url = reverse_lazy('personal_ai')
+
+    def get_chat(self):
+        return self.request.session.get('personal_ai_chat', [])
+
+    def set_chat(self, chat):
+        self.request.session['personal_ai_chat'] = chat
+        self.request.session.modified = True
+
+    def post(self, request, *args, **kwargs):
+        action = request.POST.get('action')
+        if action == 'clear':
+            self.set_chat([])
+            return self.form_valid(form=None)
+        message = (request.POST.get('message') or '').strip()
+        chat = self.get_chat()[-50:]
+        if message:
+            chat.append({'role': 'user', 'content': message})
+            try:
+                reply = chat_with_openai(model='gpt-4o', system_prompt='You are a concise, helpful home projects assistant.', messages=chat)
+            except Exception as e:
+                reply = f"Error: {e}. Ensure OPENAI_API_KEY is set."
+            chat.append({'role': 'assistant', 'content': reply})
+            self.set_chat(chat)
+        return self.form_valid(form=None)
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        ctx.update({'chat': self.get_chat()})
+        return ctx
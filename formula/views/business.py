@@ -0,0 +1,759 @@
+"""Trucking records: files, IFTA, routes, loads, drivers, assets and finances."""
+
+import csv
+import json
+
+from django.contrib import messages
+from django.core.files.uploadedfile import UploadedFile
+from django.db.models import Count, Q
+from django.http import HttpResponse
+from django.shortcuts import redirect
+from django.urls import reverse_lazy
+from django.utils.html import format_html
+from django.utils.translation import gettext as _gt
+from django.utils.translation import gettext_lazy as _
+from django.views.generic import CreateView, DeleteView, ListView, UpdateView
+
+from formula import uploads
+from formula.models import (
+    BusinessAsset,
+    Driver,
+    FileStorage,
+    Finance,
+    IFTAReport,
+    Load,
+    Route,
+)
+from formula.tables import Actions, Column, TableViewMixin
+
+from .internal import AdminContextMixin, build_table
+
+
+class FileStorageListView(AdminContextMixin, ListView):
+    model = FileStorage
+    template_name = 'formula/filestorage_list.html'
+    title = _("File Storage")
+
+    def get_queryset(self):
+        qs = super().get_queryset().order_by('-uploaded_at')
+        q = self.request.GET.get('q')
+        if q:
+            qs = qs.filter(Q(name__icontains=q) | Q(file__icontains=q))
+        return qs
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        # Build categories from model choices (stable list)
+        all_categories = [label for value, label in getattr(FileStorage, 'CATEGORY_CHOICES', [])]
+        selected = self.request.GET.get('category') or 'All'
+        files = [
+            fs for fs in self.object_list
+            if selected == 'All' or fs.category_display == selected
+        ]
+        # Build table without Actions, with Description, and link to file
+        rows = []
+        for fs in files:
+            file_url = fs.file.url if getattr(fs, 'file', None) else '#'
+            name_link = format_html(
+                '<a class="text-blue-600 hover:underline" href="{}" target="_blank" rel="noopener">{}</a>',
+                file_url,
+                fs.name,
+            )
+            rows.append([
+                name_link,
+                fs.category_display,
+                (fs.description or ''),
+                fs.uploaded_at.strftime("%Y-%m-%d %H:%M"),
+            ])
+        context["filestorage_table"] = build_table([
+            _("Name"), _("Category"), _("Description"), _("Uploaded at")
+        ], rows)
+        context["categories"] = ['All'] + all_categories
+        context["selected_category"] = selected
+        context["query"] = self.request.GET.get('q', '')
+        return context
+
+
+class FileStorageFormMixin:
+    def form_valid(self, form):
+        # Size cap from settings; hash the upload and reuse an identical stored file
+        uploaded_file = form.cleaned_data['file']
+        if isinstance(uploaded_file, UploadedFile):
+            if uploaded_file.size > uploads.max_size():
+                form.add_error('file', f'File size must be under {uploads.max_size() // (1024 * 1024)}MB.')
+                return self.form_invalid(form)
+            uploads.prepare(form.instance, uploaded_file)
+        return super().form_valid(form)
+
+
+class FileStorageCreateView(FileStorageFormMixin, AdminContextMixin, CreateView):
+    model = FileStorage
+    fields = ['name', 'file', 'category', 'description']
+    template_name = 'formula/filestorage_form.html'
+    success_url = reverse_lazy('filestorage_list')
+    title = _("Add File")
+
+
+class FileStorageUpdateView(FileStorageFormMixin, AdminContextMixin, UpdateView):
+    model = FileStorage
+    fields = ['name', 'file', 'category', 'description']
+    template_name = 'formula/filestorage_form.html'
+    success_url = reverse_lazy('filestorage_list')
+    title = _("Edit File")
+
+
+class FileStorageDeleteView(AdminContextMixin, DeleteView):
+    model = FileStorage
+    template_name = 'formula/filestorage_confirm_delete.html'
+    success_url = reverse_lazy('filestorage_list')
+    title = _("Delete File")
+
+
+def _mpg(row):
+    return f"{row['total_miles'] / row['total_fuel']:.2f}" if row["total_fuel"] else "0.00"
+
+
+def _load_days(row):
+    if row["pickup_date"] and row["delivery_date"]:
+        return (row["delivery_date"] - row["pickup_date"]).days
+    return ""
+
+
+def _driver_name(row):
+    if row["first_name"] and row["last_name"]:
+        return f"{row['last_name']}, {row['first_name']}"
+    return ""
+
+
+def _finance_amount(row):
+    amount = row["amount"] or 0
+    sign = '-' if row["type"] == 'EXPENSE' or (not row["type"] and amount < 0) else ''
+    return f"{sign}${abs(amount):,.2f}"
+
+
+class IFTAReportListView(TableViewMixin, AdminContextMixin, ListView):
+    model = IFTAReport
+    template_name = 'formula/iftareport_list.html'
+    title = _("IFTA Reports")
+    table_context_name = "iftareport_table"
+
+    def get_table_columns(self):
+        return [
+            Column(_("Report"), "report_name", link="iftareport_edit"),
+            Column(_("Start"), "start_date"),
+            Column(_("End"), "end_date"),
+            Column(_("Miles"), "total_miles"),
+            Column(_("Fuel"), "total_fuel"),
+            Column(_("MPG"), render=_mpg, fields=("total_miles", "total_fuel")),
+        ]
+
+    def get_queryset(self):
+        qs = super().get_queryset().order_by('-created_at')
+        q = self.request.GET.get('q')
+        if q:
+            qs = qs.filter(report_name__icontains=q)
+        start = self.request.GET.get('start')
+        end = self.request.GET.get('end')
+        if start:
+            qs = qs.filter(start_date__gte=start)
+        if end:
+            qs = qs.filter(end_date__lte=end)
+        return qs
+
+    def render_to_response(self, context, **response_kwargs):
+        if self.request.GET.get('export') == 'csv':
+            # Export current queryset
+            response = HttpResponse(content_type='text/csv')
+            response['Content-Disposition'] = 'attachment; filename="ifta_reports.csv"'
+            writer = csv.writer(response)
+            writer.writerow(['Report', 'Start', 'End', 'Miles', 'Fuel', 'MPG'])
+            for r in self.object_list:
+                mpg = (r.total_miles / r.total_fuel) if r.total_fuel else 0
+                writer.writerow([r.report_name, r.start_date, r.end_date, r.total_miles, r.total_fuel, f"{mpg:.2f}"])
+            return response
+        return super().render_to_response(context, **response_kwargs)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        # KPI totals
+        total_miles = sum((r.total_miles or 0) for r in self.object_list)
+        total_fuel = sum((r.total_fuel or 0) for r in self.object_list)
+        avg_mpg = (total_miles / total_fuel) if total_fuel else 0
+        context.update({
+            'total_miles': total_miles,
+            'total_fuel': total_fuel,
+            'avg_mpg': avg_mpg,
+            'q': self.request.GET.get('q', ''),
+            'start': self.request.GET.get('start', ''),
+            'end': self.request.GET.get('end', ''),
+        })
+        return context
+
+
+class IFTAReportCreateView(AdminContextMixin, CreateView):
+    model = IFTAReport
+    fields = ['report_name', 'start_date', 'end_date', 'total_miles', 'total_fuel']
+    template_name = 'formula/iftareport_form.html'
+    success_url = reverse_lazy('iftareport_list')
+    title = _("Add IFTA Report")
+
+    def form_valid(self, form):
+        # Ensure start_date is before end_date
+        start_date = form.cleaned_data['start_date']
+        end_date = form.cleaned_data['end_date']
+        if start_date > end_date:
+            form.add_error('end_date', 'End date must be after start date.')
+            return self.form_invalid(form)
+        return super().form_valid(form)
+
+
+class IFTAReportUpdateView(AdminContextMixin, UpdateView):
+    model = IFTAReport
+    fields = ['report_name', 'start_date', 'end_date', 'total_miles', 'total_fuel']
+    template_name = 'formula/iftareport_form.html'
+    success_url = reverse_lazy('iftareport_list')
+    title = _("Edit IFTA Report")
+
+    def form_valid(self, form):
+        # Ensure start_date is before end_date
+        start_date = form.cleaned_data['start_date']
+        end_date = form.cleaned_data['end_date']
+        if start_date > end_date:
+            form.add_error('end_date', 'End date must be after start date.')
+            return self.form_invalid(form)
+        return super().form_valid(form)
+
+
+class IFTAReportDeleteView(AdminContextMixin, DeleteView):
+    model = IFTAReport
+    template_name = 'formula/iftareport_confirm_delete.html'
+    success_url = reverse_lazy('iftareport_list')
+    title = _("Delete IFTA Report")
+
+
+class RouteListView(TableViewMixin, AdminContextMixin, ListView):
+    model = Route
+    template_name = 'formula/route_list.html'
+    title = _("Routes")
+    table_context_name = "route_table"
+
+    def get_table_columns(self):
+        return [
+            Column(_("Name"), "name"),
+            Column(_("Start"), "start_location"),
+            Column(_("End"), "end_location"),
+            Column(_("Distance"), "distance"),
+            Column(_("Created"), "created_at", render=lambda r: r["created_at"].strftime("%Y-%m-%d")),
+            Actions(edit="route_edit", delete="route_delete"),
+        ]
+
+    def render_to_response(self, context, **response_kwargs):
+        if self.request.GET.get('export') == 'csv':
+            response = HttpResponse(content_type='text/csv')
+            response['Content-Disposition'] = 'attachment; filename="routes.csv"'
+            writer = csv.writer(response)
+            writer.writerow(['name','start_location','end_location','distance','start_latitude','start_longitude','end_latitude','end_longitude'])
+            for r in self.object_list:
+                writer.writerow([
+                    r.name, r.start_location, r.end_location, r.distance,
+                    getattr(r, 'start_latitude', ''), getattr(r, 'start_longitude', ''),
+                    getattr(r, 'end_latitude', ''), getattr(r, 'end_longitude', ''),
+                ])
+            return response
+        if self.request.GET.get('template') == 'csv':
+            response = HttpResponse(content_type='text/csv')
+            response['Content-Disposition'] = 'attachment; filename="routes_template.csv"'
+            writer = csv.writer(response)
+            writer.writerow(['name','start_location','end_location','distance','start_latitude','start_longitude','end_latitude','end_longitude'])
+            writer.writerow(['I-90 East','Seattle, WA','Spokane, WA','279','47.6062','-122.3321','47.6588','-117.4260'])
+            return response
+        return super().render_to_response(context, **response_kwargs)
+
+    def post(self, request, *args, **kwargs):
+        f = request.FILES.get('csv_file')
+        if not f:
+            return redirect('route_list')
+        try:
+            import csv as _csv
+            import io
+            data = f.read()
+            try:
+                text = data.decode('utf-8')
+            except Exception:
+                text = data.decode('latin-1')
+            reader = _csv.DictReader(io.StringIO(text))
+            for row in reader:
+                name = (row.get('name') or '').strip()
+                if not name:
+                    continue
+                start_loc = row.get('start_location') or ''
+                end_loc = row.get('end_location') or ''
+                try:
+                    dist = float(row.get('distance') or 0)
+                except Exception:
+                    dist = 0
+                def _flt(v):
+                    try:
+                        return float(v)
+                    except Exception:
+                        return None
+                Route.objects.update_or_create(
+                    name=name,
+                    defaults={
+                        'start_location': start_loc,
+                        'end_location': end_loc,
+                        'distance': dist,
+                        'start_latitude': _flt(row.get('start_latitude')),
+                        'start_longitude': _flt(row.get('start_longitude')),
+                        'end_latitude': _flt(row.get('end_latitude')),
+                        'end_longitude': _flt(row.get('end_longitude')),
+                    }
+                )
+        except Exception:
+            pass
+        return redirect('route_list')
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["download_template_url"] = reverse_lazy("route_list") + "?template=csv"
+        try:
+            from django.conf import settings as dj_settings
+            context["GOOGLE_MAPS_EMBED_API_KEY"] = getattr(dj_settings, "GOOGLE_MAPS_EMBED_API_KEY", "")
+        except Exception:
+            context["GOOGLE_MAPS_EMBED_API_KEY"] = ""
+        return context
+
+
+class RouteCreateView(AdminContextMixin, CreateView):
+    model = Route
+    fields = ['name', 'start_location', 'end_location', 'distance', 'start_latitude', 'start_longitude', 'end_latitude', 'end_longitude']
+    template_name = 'formula/route_form.html'
+    success_url = reverse_lazy('route_list')
+    title = _("Add Route")
+
+
+class RouteUpdateView(AdminContextMixin, UpdateView):
+    model = Route
+    fields = ['name', 'start_location', 'end_location', 'distance', 'start_latitude', 'start_longitude', 'end_latitude', 'end_longitude']
+    template_name = 'formula/route_form.html'
+    success_url = reverse_lazy('route_list')
+    title = _("Edit Route")
+
+
+class RouteDeleteView(AdminContextMixin, DeleteView):
+    model = Route
+    template_name = 'formula/route_confirm_delete.html'
+    success_url = reverse_lazy('route_list')
+    title = _("Delete Route")
+
+
+class LoadListView(TableViewMixin, AdminContextMixin, ListView):
+    model = Load
+    template_name = 'formula/load_list.html'
+    title = _("Loads")
+    table_context_name = "load_table"
+
+    def get_table_queryset(self):
+        return self.get_queryset().annotate(docs_count=Count("documents"))
+
+    def get_table_columns(self):
+        return [
+            Column(_("Load"), "load_name", link="load_edit"),
+            Column(_("Pickup"), "pickup_date"),
+            Column(_("Delivery"), "delivery_date"),
+            Column(_("Route"), "route__name"),
+            Column(_("Days"), render=_load_days, fields=("pickup_date", "delivery_date")),
+            Column(_("Docs"), "docs_count"),
+        ]
+
+    def post(self, request, *args, **kwargs):
+        f = request.FILES.get('csv_file')
+        if not f:
+            messages.error(request, _("No file selected."))
+            return redirect('load_list')
+
+        import csv as _csv
+        import io
+        from datetime import date as _date
+        from datetime import datetime as _dt
+        from datetime import timedelta as _td
+
+        data = f.read()
+        try:
+            text = data.decode('utf-8')
+        except Exception:
+            text = data.decode('latin-1')
+
+        reader = _csv.DictReader(io.StringIO(text))
+        created = 0
+        skipped = 0
+
+        def _parse_date_any(s: str | None) -> _date | None:
+            if not s:
+                return None
+            s = s.strip()
+            fmts = ("%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y", "%Y/%m/%d")
+            for fmt in fmts:
+                try:
+                    return _dt.strptime(s, fmt).date()
+                except Exception:
+                    continue
+            try:
+                return _date.fromisoformat(s)
+            except Exception:
+                return None
+
+        # Ensure a fallback route exists
+        fallback_route, _created_fb = Route.objects.get_or_create(
+            name="Unassigned", defaults={"start_location": "", "end_location": "", "distance": 0}
+        )
+
+        for row in reader:
+            try:
+                # normalize keys (case/space insensitive)
+                nrow = {(k or '').strip().lower(): (v or '') for k, v in row.items()}
+
+                def get_any(*keys):
+                    for k in keys:
+                        if k in nrow and str(nrow[k]).strip():
+                            return str(nrow[k]).strip()
+                    return ''
+
+                name = get_any('load_name', 'name', 'load')
+                if not name:
+                    skipped += 1
+                    continue
+                desc = get_any('description', 'desc', 'notes')
+                p = _parse_date_any(get_any('pickup_date', 'pickup', 'pickupdate', 'pickup date'))
+                d = _parse_date_any(get_any('delivery_date', 'delivery', 'deliverydate', 'delivery date', 'dropoff'))
+
+                # If dates missing, default to today and +1 day
+                if not p and not d:
+                    p = _date.today()
+                    d = p + _td(days=1)
+                elif p and not d:
+                    d = p
+                elif d and not p:
+                    p = d
+
+                route_name = get_any('route_name', 'route', 'routename') or "Unassigned"
+                route, _created_rt = Route.objects.get_or_create(
+                    name=route_name, defaults={'start_location': '', 'end_location': '', 'distance': 0}
+                )
+
+                Load.objects.create(
+                    load_name=name,
+                    description=desc,
+                    pickup_date=p,
+                    delivery_date=d,
+                    route=route or fallback_route,
+                )
+                created += 1
+            except Exception:
+                skipped += 1
+                continue
+
+        if created:
+            messages.success(request, _gt("Imported %(c)s loads. Skipped %(s)s.") % {"c": created, "s": skipped})
+        elif skipped:
+            messages.error(request, _gt("No loads imported. Skipped %(s)s. Check columns: load_name, description, pickup_date, delivery_date, route_name.") % {"s": skipped})
+        else:
+            messages.info(request, _gt("Nothing to import."))
+        return redirect('load_list')
+
+    def get_queryset(self):
+        qs = super().get_queryset().order_by('-created_at')
+        q = self.request.GET.get('q')
+        if q:
+            qs = qs.filter(Q(load_name__icontains=q) | Q(description__icontains=q))
+        route_id = self.request.GET.get('route')
+        if route_id:
+            qs = qs.filter(route_id=route_id)
+        pstart = self.request.GET.get('pstart')
+        pend = self.request.GET.get('pend')
+        if pstart:
+            qs = qs.filter(pickup_date__gte=pstart)
+        if pend:
+            qs = qs.filter(pickup_date__lte=pend)
+        return qs
+
+    def render_to_response(self, context, **response_kwargs):
+        if self.request.GET.get('export') == 'csv':
+            response = HttpResponse(content_type='text/csv')
+            response['Content-Disposition'] = 'attachment; filename="loads.csv"'
+            writer = csv.writer(response)
+            writer.writerow(['Load', 'Pickup', 'Delivery', 'Route', 'Days'])
+            for l in self.object_list:
+                route_name = l.route.name if l.route_id else ''
+                days = (l.delivery_date - l.pickup_date).days if l.delivery_date and l.pickup_date else ''
+                writer.writerow([l.load_name, l.pickup_date, l.delivery_date, route_name, days])
+            return response
+        if self.request.GET.get('template') == 'csv':
+            response = HttpResponse(content_type='text/csv')
+            response['Content-Disposition'] = 'attachment; filename="loads_template.csv"'
+            writer = csv.writer(response)
+            writer.writerow(['load_name','description','pickup_date','delivery_date','route_name'])
+            writer.writerow(['Acme Widgets','20 pallets widgets','2025-08-01','2025-08-05','I-90 East'])
+            return response
+        return super().render_to_response(context, **response_kwargs)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        # KPIs
+        count = self.object_list.count()
+        durations = [
+            (l.delivery_date - l.pickup_date).days
+            for l in self.object_list
+            if l.delivery_date and l.pickup_date
+        ]
+        avg_days = sum(durations) / len(durations) if durations else 0
+        without_route = self.object_list.filter(route__isnull=True).count()
+        context.update({
+            'loads_count': count,
+            'avg_days': avg_days,
+            'without_route': without_route,
+            'q': self.request.GET.get('q', ''),
+            'pstart': self.request.GET.get('pstart', ''),
+            'pend': self.request.GET.get('pend', ''),
+            'route_selected': self.request.GET.get('route', ''),
+            'routes': Route.objects.all().order_by('name'),
+        })
+        context["download_template_url"] = reverse_lazy("load_list") + "?template=csv"
+        return context
+
+
+class LoadCreateView(AdminContextMixin, CreateView):
+    model = Load
+    fields = ['load_name', 'description', 'pickup_date', 'delivery_date', 'route']
+    template_name = 'formula/load_form.html'
+    success_url = reverse_lazy('load_list')
+    title = _("Add Load")
+
+
+class LoadUpdateView(AdminContextMixin, UpdateView):
+    model = Load
+    fields = ['load_name', 'description', 'pickup_date', 'delivery_date', 'route']
+    template_name = 'formula/load_form.html'
+    success_url = reverse_lazy('load_list')
+    title = _("Edit Load")
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["documents"] = self.object.documents.all().order_by('-uploaded_at')
+        return context
+
+    def post(self, request, *args, **kwargs):
+        # If uploading a document, handle it and stay on page
+        if request.POST.get('upload_for') == 'document':
+            self.object = self.get_object()
+            f = request.FILES.get('file')
+            if f:
+                try:
+                    uploads.store(f, name=request.POST.get('name') or f.name, load=self.object)
+                except uploads.UploadError as e:
+                    messages.error(request, str(e))
+            return redirect('load_edit', pk=self.object.pk)
+        return super().post(request, *args, **kwargs)
+
+
+class LoadDeleteView(AdminContextMixin, DeleteView):
+    model = Load
+    template_name = 'formula/load_confirm_delete.html'
+    success_url = reverse_lazy('load_list')
+    title = _("Delete Load")
+
+
+class DriverListView(TableViewMixin, AdminContextMixin, ListView):
+    model = Driver
+    template_name = 'formula/driver_list.html'
+    title = _("Drivers")
+    table_context_name = "driver_table"
+
+    def get_table_columns(self):
+        return [
+            Column(_("Name"), "last_name", render=_driver_name, fields=("first_name",)),
+            Column(_("Status"), "status"),
+            Column(_("Category"), "category"),
+            Column(_("Created"), "created_at", render=lambda r: r["created_at"].strftime("%Y-%m-%d")),
+            Actions(edit="driver_edit", delete="driver_delete"),
+        ]
+
+
+class DriverCreateView(AdminContextMixin, CreateView):
+    model = Driver
+    fields = ['first_name', 'last_name', 'license_number', 'phone_number', 'email', 'is_active']
+    template_name = 'formula/driver_form.html'
+    success_url = reverse_lazy('driver_list')
+    title = _("Add Driver")
+
+
+class DriverUpdateView(AdminContextMixin, UpdateView):
+    model = Driver
+    fields = ['first_name', 'last_name', 'license_number', 'phone_number', 'email', 'is_active'
+    ]
+    template_name = 'formula/driver_form.html'
+    success_url = reverse_lazy('driver_list')
+    title = _("Edit Driver")
+
+
+class DriverDeleteView(AdminContextMixin, DeleteView):
+    model = Driver
+    template_name = 'formula/driver_confirm_delete.html'
+    success_url = reverse_lazy('driver_list')
+    title = _("Delete Driver")
+
+
+class BusinessAssetListView(TableViewMixin, AdminContextMixin, ListView):
+    model = BusinessAsset
+    template_name = 'formula/businessasset_list.html'
+    title = _("Business Assets")
+    table_context_name = "businessasset_table"
+
+    def get_table_columns(self):
+        return [
+            Column(_("Name"), "name"),
+            Column(_("Value"), "value"),
+            Column(_("Purchased"), "purchase_date"),
+            Actions(edit="businessasset_edit", delete="businessasset_delete"),
+        ]
+
+
+class BusinessAssetCreateView(AdminContextMixin, CreateView):
+    model = BusinessAsset
+    fields = ['name', 'description', 'image', 'purchase_date', 'value', 'category', 'miles', 'hours']
+    template_name = 'formula/businessasset_form.html'
+    success_url = reverse_lazy('businessasset_list')
+    title = _("Add Business Asset")
+
+
+class BusinessAssetUpdateView(AdminContextMixin, UpdateView):
+    model = BusinessAsset
+    fields = ['name', 'description', 'image', 'purchase_date', 'value', 'category', 'miles', 'hours']
+    template_name = 'formula/businessasset_form.html'
+    success_url = reverse_lazy('businessasset_list')
+    title = _("Edit Business Asset")
+
+
+class BusinessAssetDeleteView(AdminContextMixin, DeleteView):
+    model = BusinessAsset
+    template_name = 'formula/businessasset_confirm_delete.html'
+    success_url = reverse_lazy('businessasset_list')
+    title = _("Delete Business Asset")
+
+
+class FinanceListView(TableViewMixin, AdminContextMixin, ListView):
+    model = Finance
+    template_name = 'formula/finance_list.html'
+    title = _("Finance")
+    table_context_name = "finance_table"
+
+    def get_table_columns(self):
+        return [
+            Column(_("Category"), "category", link="finance_edit"),
+            Column(_("Type"), "type"),
+            Column(_("Amount"), "amount", render=_finance_amount, fields=("type",)),
+            Column(_("Date"), "date"),
+            Column(_("Description"), "description"),
+        ]
+
+    def get_queryset(self):
+        qs = super().get_queryset().order_by('-date')
+        q = self.request.GET.get('q')
+        if q:
+            qs = qs.filter(Q(category__icontains=q) | Q(description__icontains=q))
+        category = self.request.GET.get('category')
+        if category:
+            qs = qs.filter(category=category)
+        kind = self.request.GET.get('type')
+        if kind in ("INCOME", "EXPENSE"):
+            qs = qs.filter(type=kind)
+        start = self.request.GET.get('start')
+        end = self.request.GET.get('end')
+        if start:
+            qs = qs.filter(date__gte=start)
+        if end:
+            qs = qs.filter(date__lte=end)
+        min_amt = self.request.GET.get('min')
+        max_amt = self.request.GET.get('max')
+        try:
+            if min_amt not in (None, ""):
+                qs = qs.filter(amount__gte=float(min_amt))
+            if max_amt not in (None, ""):
+                qs = qs.filter(amount__lte=float(max_amt))
+        except ValueError:
+            pass
+        return qs
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        # KPI split income vs expense
+        income = sum((f.amount or 0) for f in self.object_list if (f.type == 'INCOME') or (not f.type and (f.amount or 0) > 0))
+        expenses = sum((f.amount or 0) for f in self.object_list if (f.type == 'EXPENSE') or (not f.type and (f.amount or 0) < 0))
+        net = income + expenses
+        expenses_display = abs(expenses)
+        # Monthly aggregates for charts
+        series = {}
+        expense_by_cat = {}
+        for f in self.object_list:
+            ym = f.date.strftime('%Y-%m') if f.date else 'Unknown'
+            if ym not in series:
+                series[ym] = {'income': 0.0, 'expense': 0.0}
+            amt = abs(f.amount or 0)
+            if (f.type == 'INCOME') or (not f.type and (f.amount or 0) > 0):
+                series[ym]['income'] += amt
+            else:
+                series[ym]['expense'] += amt
+                # category breakdown for expenses
+                key = f.category or 'Uncategorized'
+                expense_by_cat[key] = expense_by_cat.get(key, 0.0) + amt
+        months = sorted(series.keys())
+        income_points = [series[m]['income'] for m in months]
+        expense_points = [series[m]['expense'] for m in months]
+        # Build JSON strings for charts
+        context.update({
+            'income_total': income,
+            'expense_total': expenses_display,
+            'net_total': net,
+            'months': months,
+            'income_points': income_points,
+            'expense_points': expense_points,
+            'months_json': json.dumps(months),
+            'income_points_json': json.dumps(income_points),
+            'expense_points_json': json.dumps(expense_points),
+            'expense_cat_labels_json': json.dumps(list(expense_by_cat.keys())),
+            'expense_cat_values_json': json.dumps(list(expense_by_cat.values())),
+            'q': self.request.GET.get('q', ''),
+            'start': self.request.GET.get('start', ''),
+            'end': self.request.GET.get('end', ''),
+            'min': self.request.GET.get('min', ''),
+            'max': self.request.GET.get('max', ''),
+            'category_selected': self.request.GET.get('category', ''),
+            'type_selected': self.request.GET.get('type', ''),
+            'categories': list(
+                Finance.objects.exclude(category__isnull=True).exclude(category__exact="").values_list('category', flat=True).distinct().order_by('category')
+            ),
+        })
+        return context
+
+
+class FinanceCreateView(AdminContextMixin, CreateView):
+    model = Finance
+    fields = ['category', 'type', 'amount', 'date', 'description']
+    template_name = 'formula/finance_form.html'
+    success_url = reverse_lazy('finance_list')
+    title = _("Add Finance")
+
+
+class FinanceUpdateView(AdminContextMixin, UpdateView):
+    model = Finance
+    fields = ['category', 'type', 'amount', 'date', 'description']
+    template_name = 'formula/finance_form.html'
+    success_url = reverse_lazy('finance_list')
+    title = _("Edit Finance")
+
+
+class FinanceDeleteView(AdminContextMixin, DeleteView):
+    model = Finance
+    template_name = 'formula/finance_confirm_delete.html'
+    success_url = reverse_lazy('finance_list')
+    title = _("Delete Finance")
@@ -0,0 +1,477 @@
+"""Savings goals pages, the embeddable widget and the goals JSON API."""
+
+import json
+
+from django.db import models, transaction
+from django.db.models import Count
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404, redirect
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import condition
+
+from formula.ordering import next_rank, reorder
+from formula.projections import (
+    ORDERS,
+    default_weekly_amounts,
+    monthly_timeline,
+    pooled_schedule,
+    scenarios,
+)
+
+from .personal import PersonalBaseView, _reorder
+
+
+# New: Savings Goals page
+class SavingsGoalsView(PersonalBaseView):
+    template_name = 'goals.html'
+
+    def _get_plan(self):
+        from ..models import SavingsPlan
+        plan = SavingsPlan.objects.first()
+        if not plan:
+            plan = SavingsPlan.objects.create(weekly_amount=0)
+        return plan
+
+    def get(self, request, *args, **kwargs):
+        from ..forms import SavingsGoalForm, SavingsPlanForm
+        from ..models import SavingsGoal
+        plan = self._get_plan()
+        goals = list(SavingsGoal.objects.all().order_by('priority', 'created_at'))
+        ctx = self.get_context_data(
+            plan_form=SavingsPlanForm(instance=plan),
+            goal_form=SavingsGoalForm(),
+            goals=goals,
+            weekly=float(plan.weekly_amount or 0),
+            schedule=self._compute_schedule(goals, float(plan.weekly_amount or 0)),
+        )
+        return self.render_to_response(ctx)
+
+    def post(self, request, *args, **kwargs):
+        action = request.POST.get('action')
+        from ..forms import SavingsGoalForm, SavingsPlanForm
+        from ..models import SavingsGoal
+        plan = self._get_plan()
+        if action == 'set_weekly':
+            form = SavingsPlanForm(request.POST, instance=plan)
+            if form.is_valid():
+                form.save()
+            return redirect('goals')
+        if action == 'add_goal':
+            form = SavingsGoalForm(request.POST)
+            if form.is_valid():
+                g = form.save(commit=False)
+                # Set priority to end
+                g.priority = next_rank(SavingsGoal.objects.all())
+                g.save()
+            return redirect('goals')
+        if action == 'edit_goal':
+            pk = request.POST.get('id')
+            g = get_object_or_404(SavingsGoal, pk=pk)
+            form = SavingsGoalForm(request.POST, instance=g)
+            if form.is_valid():
+                form.save()
+            return redirect('goals')
+        if action == 'delete_goal':
+            pk = request.POST.get('id')
+            g = get_object_or_404(SavingsGoal, pk=pk)
+            g.delete()
+            return redirect('goals')
+        return redirect('goals')
+
+    def _compute_schedule(self, goals, weekly):
+        """Return a list of {id,title,remaining,weeks,cumulative_weeks,eta_date} based on priority order."""
+        return pooled_schedule(goals, weekly, timezone.localdate())
+
+
+class SavingsGoalsV2View(SavingsGoalsView):
+    template_name = 'goals_v2.html'
+
+    def _sequence_goals(self, goals):
+        """Return list of dicts augmenting goals with start_date, completion_date, status, progress."""
+        today = timezone.localdate()
+        processed = []
+        for g, projected in zip(goals, monthly_timeline(goals, today), strict=True):
+            start_date = projected['start_date']
+            completion_date = projected['completion_date']
+            progress = 100.0 if g.target_amount and g.current_amount >= g.target_amount else (
+                (float(g.current_amount) / float(g.target_amount) * 100.0) if g.target_amount else 0.0
+            )
+            if progress >= 100:
+                status = 'completed'
+            elif start_date <= today < completion_date:
+                status = 'active'
+            elif progress < 100 and today < start_date:
+                status = 'pending'
+            else:
+                status = 'active'
+            processed.append({
+                'obj': g,
+                'id': g.id,
+                'title': g.title,
+                'description': g.description,
+                'target_amount': g.target_amount,
+                'current_amount': g.current_amount,
+                'monthly_contribution': g.monthly_contribution,
+                'remaining_amount': projected['remaining'],
+                'progress': round(progress),
+                'start_date': start_date,
+                'completion_date': completion_date,
+                'status': status,
+                'goal_type': g.goal_type or 'savings',
+            })
+        return processed
+
+    def get(self, request, *args, **kwargs):
+        from ..forms import SavingsGoalForm, SavingsPlanForm
+        from ..models import SavingsGoal
+        plan = self._get_plan()
+        goals = list(SavingsGoal.objects.all().order_by('priority', 'created_at'))
+        processed = self._sequence_goals(goals)
+        ctx = self.get_context_data(
+            plan_form=SavingsPlanForm(instance=plan),
+            goal_form=SavingsGoalForm(),
+            goals=goals,  # raw list if needed
+            processed_goals=processed,
+            weekly=float(plan.weekly_amount or 0),
+            schedule=self._compute_schedule(goals, float(plan.weekly_amount or 0)),
+            scenarios=scenarios(goals, default_weekly_amounts(plan.weekly_amount)),
+        )
+        return self.render_to_response(ctx)
+
+    def post(self, request, *args, **kwargs):
+        # mirror parent but redirect to goals_v2
+        action = request.POST.get('action')
+        from ..forms import SavingsGoalForm, SavingsPlanForm
+        from ..models import SavingsGoal
+        plan = self._get_plan()
+        if action == 'set_weekly':
+            form = SavingsPlanForm(request.POST, instance=plan)
+            if form.is_valid():
+                form.save()
+            return redirect('goals_v2')
+        if action == 'add_goal':
+            form = SavingsGoalForm(request.POST)
+            if form.is_valid():
+                g = form.save(commit=False)
+                g.priority = next_rank(SavingsGoal.objects.all())
+                g.save()
+            return redirect('goals_v2')
+        if action == 'edit_goal':
+            pk = request.POST.get('id')
+            g = get_object_or_404(SavingsGoal, pk=pk)
+            form = SavingsGoalForm(request.POST, instance=g)
+            if form.is_valid():
+                form.save()
+            return redirect('goals_v2')
+        if action == 'delete_goal':
+            pk = request.POST.get('id')
+            g = get_object_or_404(SavingsGoal, pk=pk)
+            g.delete()
+            return redirect('goals_v2')
+        return redirect('goals_v2')
+
+
+# New: Savings Goals embed view (public)
+class SavingsGoalsEmbedView(PersonalBaseView):
+    template_name = 'goals_embed.html'
+
+    @method_decorator(condition(etag_func=lambda request, *args, **kwargs: _goals_etag()))
+    def get(self, request, *args, **kwargs):
+        from ..models import SavingsGoal
+        goals = list(SavingsGoal.objects.all().order_by('priority', 'created_at'))
+        payload = [{**_goal_json(g), 'id': str(g.id)} for g in goals]
+        return self.render_to_response({'goals': payload})
+
+
+#########################################
+# Lightweight Goals API (no deep validation; CSRF exempt for simplicity)
+#########################################
+GOAL_FIELDS = {
+    'name': 'title', 'title': 'title', 'description': 'description',
+    'targetAmount': 'target_amount', 'currentAmount': 'current_amount',
+    'monthlyContribution': 'monthly_contribution', 'type': 'goal_type', 'icon': 'icon',
+}
+GOAL_AMOUNTS = ('target_amount', 'current_amount', 'monthly_contribution')
+
+
+class GoalOpError(Exception):
+    pass
+
+
+def _goal_json(g):
+    return {
+        'id': g.id,
+        'name': g.title,
+        'description': g.description or '',
+        'targetAmount': float(g.target_amount or 0),
+        'currentAmount': float(g.current_amount or 0),
+        'monthlyContribution': float(g.monthly_contribution or 0),
+        'type': g.goal_type or 'savings',
+        'icon': g.icon or '',
+    }
+
+
+def goals_version():
+    """Changes whenever a goal is added, edited, reordered or deleted."""
+    from ..models import SavingsGoal
+    state = SavingsGoal.objects.order_by().aggregate(n=Count('id'), last=models.Max('updated_at'))
+    last = state['last'].timestamp() if state['last'] else 0
+    return f"{state['n']}-{last:.6f}"
+
+
+def _goals_etag():
+    return f'"goals-{goals_version()}"'
+
+
+def _apply_goal_fields(g, body):
+    """Set the API fields present in ``body`` on ``g``; return the model fields changed."""
+    from decimal import Decimal, InvalidOperation
+    changed = []
+    for key, value in body.items():
+        field = GOAL_FIELDS.get(key)
+        if field is None:
+            continue
+        if field in GOAL_AMOUNTS:
+            try:
+                value = Decimal(str(value or 0))
+            except InvalidOperation:
+                raise GoalOpError(f'Invalid numeric value for {key}') from None
+        setattr(g, field, value)
+        if field not in changed:
+            changed.append(field)
+    return changed
+
+
+def _add_goal(body):
+    from ..models import SavingsGoal
+    g = SavingsGoal(
+        title=body.get('name') or body.get('title') or 'Untitled',
+        description=body.get('description') or '',
+        goal_type=body.get('type') or 'savings',
+        icon=body.get('icon') or '',
+        priority=next_rank(SavingsGoal.objects.all()),
+    )
+    _apply_goal_fields(g, {k: body.get(k) for k in ('targetAmount', 'currentAmount', 'monthlyContribution')})
+    _clean_goal(g)
+    g.save()
+    return g
+
+
+def _clean_goal(g):
+    """Model validation, reported with the API field names."""
+    from django.core.exceptions import ValidationError
+    try:
+        g.full_clean(validate_unique=False)
+    except ValidationError as e:
+        names = {}
+        for key, field in GOAL_FIELDS.items():
+            names.setdefault(field, key)
+        raise GoalOpError('; '.join(
+            f"{names.get(field, field)}: {' '.join(messages)}" for field, messages in e.message_dict.items()
+        )) from e
+
+
+def _goal_id(value):
+    """``value`` as a goal pk: an integer, or digits as the pages send them."""
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value)
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise GoalOpError(f'Invalid goal id: {value!r}')
+    return value
+
+
+def _check_op(op):
+    """Raise ``GoalOpError`` unless ``op`` is a well-formed batch operation."""
+    if not isinstance(op, dict):
+        raise GoalOpError('Operation must be an object')
+    kind = op.get('op')
+    if kind in ('update', 'delete'):
+        _goal_id(op.get('id'))
+    elif kind == 'reorder':
+        if not isinstance(op.get('ids'), list):
+            raise GoalOpError('reorder needs a list of ids')
+        for pk in op['ids']:
+            _goal_id(pk)
+    elif kind != 'add':
+        raise GoalOpError(f'Unknown op: {kind!r}')
+
+
+def _get_goal(pk):
+    from ..models import SavingsGoal
+    try:
+        return SavingsGoal.objects.get(pk=pk)
+    except (SavingsGoal.DoesNotExist, ValueError, TypeError):
+        raise GoalOpError(f'Goal {pk} not found') from None
+
+
+def _update_goal(g, body):
+    changed = _apply_goal_fields(g, body)
+    if changed:
+        _clean_goal(g)
+        g.save(update_fields=[*changed, 'updated_at'])
+    return g
+
+
+def _json_body(request):
+    try:
+        return json.loads(request.body.decode('utf-8'))
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+@csrf_exempt
+@condition(etag_func=lambda request: _goals_etag())
+def api_goals_list(request):
+    from ..models import SavingsGoal
+    goals = list(SavingsGoal.objects.all().order_by('priority', 'created_at'))
+    response = JsonResponse({'ok': True, 'version': goals_version(), 'goals': [_goal_json(g) for g in goals]})
+    # Cache, but revalidate with If-None-Match every time.
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+@csrf_exempt
+def api_goals_batch(request):
+    """Apply several goal operations atomically.
+
+    Body: ``{"version": "...", "ops": [{"op": "add", ...fields},
+    {"op": "update", "id": 1, ...fields}, {"op": "delete", "id": 2},
+    {"op": "reorder", "ids": [...]}]}``. With ``version`` (or ``If-Match``)
+    the batch is refused with 412 if the goals changed since that version.
+    Either every operation is applied or none is.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'ok': False, 'error': 'POST required'}, status=405)
+    from ..models import SavingsGoal
+    body = _json_body(request)
+    if not isinstance(body, dict) or not isinstance(body.get('ops'), list):
+        return JsonResponse({'ok': False, 'error': 'Invalid JSON'}, status=400)
+    expected = body.get('version')
+    if not expected and request.headers.get('If-Match'):
+        expected = request.headers['If-Match'].removeprefix('W/').strip('"').removeprefix('goals-')
+    # Malformed operations are refused before anything runs.
+    for index, op in enumerate(body['ops']):
+        try:
+            _check_op(op)
+        except GoalOpError as e:
+            return JsonResponse({'ok': False, 'error': str(e), 'op': index}, status=400)
+    results = []
+    try:
+        with transaction.atomic():
+            if expected and expected != goals_version():
+                return JsonResponse({'ok': False, 'error': 'Goals changed', 'version': goals_version()}, status=412)
+            for op in body['ops']:
+                kind = op['op']
+                if kind == 'add':
+                    results.append({'op': kind, 'goal': _goal_json(_add_goal(op))})
+                elif kind == 'update':
+                    results.append({'op': kind, 'goal': _goal_json(_update_goal(_get_goal(_goal_id(op['id'])), op))})
+                elif kind == 'delete':
+                    _get_goal(_goal_id(op['id'])).delete()
+                    results.append({'op': kind, 'id': _goal_id(op['id'])})
+                else:
+                    reorder(SavingsGoal.objects.all(), [_goal_id(pk) for pk in op['ids']], 'priority')
+                    results.append({'op': kind})
+    except GoalOpError as e:
+        # Nothing was saved; ``op`` is the index of the failing operation.
+        return JsonResponse({'ok': False, 'error': str(e), 'op': len(results)}, status=400)
+    return JsonResponse({'ok': True, 'version': goals_version(), 'results': results})
+
+
+def _float_list(value):
+    return [float(v) for v in value.split(',') if v.strip()]
+
+
+def api_goals_scenarios(request):
+    """Funding weeks for a grid of weekly amounts, annual rates and goal orders.
+
+    ``?weekly=100,150&rates=0,0.05&orders=priority,smallest_first``; every
+    parameter is optional and defaults to the slider stops of the goals page.
+    """
+    from ..models import SavingsGoal, SavingsPlan
+    try:
+        weekly = _float_list(request.GET.get('weekly', ''))
+        rates = _float_list(request.GET.get('rates', ''))
+    except ValueError:
+        return JsonResponse({'ok': False, 'error': 'Invalid numeric value'}, status=400)
+    orders = [o for o in request.GET.get('orders', '').split(',') if o]
+    unknown = [o for o in orders if o not in ORDERS]
+    if unknown:
+        return JsonResponse({'ok': False, 'error': f"Unknown order: {', '.join(unknown)}"}, status=400)
+    if not weekly:
+        plan = SavingsPlan.objects.first()
+        weekly = default_weekly_amounts(plan.weekly_amount if plan else 0)
+    options = {}
+    if rates:
+        options['annual_rates'] = rates[:20]
+    if orders:
+        options['orders'] = orders
+    goals = list(SavingsGoal.objects.all().order_by('priority', 'created_at'))
+    grid = scenarios(goals, weekly[:50], **options)
+    return JsonResponse({'ok': True, 'today': timezone.localdate().isoformat(), **grid})
+
+
+@csrf_exempt
+def api_goals_add(request):
+    if request.method != 'POST':
+        return JsonResponse({'ok': False, 'error': 'POST required'}, status=405)
+    body = _json_body(request)
+    if not isinstance(body, dict):
+        return JsonResponse({'ok': False, 'error': 'Invalid JSON'}, status=400)
+    try:
+        g = _add_goal(body)
+    except GoalOpError as e:
+        return JsonResponse({'ok': False, 'error': str(e)}, status=400)
+    return JsonResponse({'ok': True, 'goal': _goal_json(g)})
+
+@csrf_exempt
+def api_goals_update(request, pk: int):
+    if request.method != 'POST':
+        return JsonResponse({'ok': False, 'error': 'POST required'}, status=405)
+    from ..models import SavingsGoal
+    g = get_object_or_404(SavingsGoal, pk=pk)
+    body = _json_body(request)
+    if not isinstance(body, dict):
+        return JsonResponse({'ok': False, 'error': 'Invalid JSON'}, status=400)
+    try:
+        _update_goal(g, body)
+    except GoalOpError as e:
+        return JsonResponse({'ok': False, 'error': str(e)}, status=400)
+    return JsonResponse({'ok': True, 'goal': _goal_json(g)})
+
+@csrf_exempt
+def api_goals_delete(request, pk: int):
+    if request.method != 'POST':
+        return JsonResponse({'ok': False, 'error': 'POST required'}, status=405)
+    from ..models import SavingsGoal
+    g = get_object_or_404(SavingsGoal, pk=pk)
+    g.delete()
+    return JsonResponse({'ok': True})
+
+@csrf_exempt
+def reorder_goals(request):
+    from ..models import SavingsGoal
+    return _reorder(request, SavingsGoal.objects.all(), 'priority')
+
+@csrf_exempt
+def update_goal_amount(request, pk: int):
+    if request.method != 'POST':
+        return JsonResponse({'ok': False, 'error': 'POST required'}, status=405)
+    from ..models import SavingsGoal
+    g = get_object_or_404(SavingsGoal, pk=pk)
+    try:
+        data = json.loads(request.body.decode('utf-8'))
+        changed = []
+        if data.get('current_amount') is not None:
+            g.current_amount = data['current_amount']
+            changed.append('current_amount')
+        if data.get('target_amount') is not None:
+            g.target_amount = data['target_amount']
+            changed.append('target_amount')
+        if changed:
+            g.save(update_fields=[*changed, 'updated_at'])
+        return JsonResponse({'ok': True, 'version': goals_version()})
+    except Exception as e:
+        return JsonResponse({'ok': False, 'error': str(e)}, status=400)
@@ -0,0 +1,1465 @@
+"""Personal pages: properties, projects, tasks, finances, documents and the calendar."""
+
+import csv
+import json
+import re
+from datetime import date, timedelta
+
+from django.contrib import messages
+from django.core.paginator import Paginator
+from django.db import models
+from django.db.models import Q
+from django.http import HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404, redirect
+from django.urls import reverse_lazy
+from django.utils import timezone
+from django.views.decorators.csrf import csrf_exempt
+from django.views.generic import TemplateView
+
+from formula import cashflow
+from formula.forms import (
+    AssetForm,
+    DocumentForm,
+    FinancialEntryForm,
+    MonthlyItemForm,
+    ProjectForm,
+    PropertyForm,
+    RepairForm,
+    ReportForm,
+    TaskForm,
+)
+from formula.models import (
+    PersonalAsset,
+    PersonalDocument,
+    PersonalFinancialEntry,
+    PersonalMonthlyItem,
+    PersonalProject,
+    PersonalProperty,
+    PersonalRepair,
+    PersonalReport,
+    PersonalTask,
+)
+from formula.ordering import reorder
+
+
+# Personal base + list views
+class PersonalBaseView(TemplateView):
+    extra_context = {}
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        today = timezone.localdate()
+        ctx.setdefault('today', today)
+        ctx.setdefault('today_plus_3', today + timedelta(days=3))
+        return ctx
+
+
+# Helper: AI enrichment for a PersonalTask record
+def enrich_task_record_with_ai(task: PersonalTask):
+    system_prompt = (
+        "You are an expert task assistant for DIY/home projects. For a given task, "
+        "return concise JSON with keys: tips (array of 3-5 bullet tips), "
+        "instructions (array of 5-10 ordered steps), tools (array of common tools), "
+        "materials (array of materials/parts), duration_estimate (human string), "
+        "estimated_cost (human string), safety (array). Keep answers short and practical."
+    )
+    user_msg = (
+        f"Project: {task.project.name}\n"
+        f"Task: {task.title}\n"
+        f"Description: {task.description or ''}\n"
+        f"Section: {task.section or ''}"
+    )
+    from ..ai import chat_with_openai
+
+    reply = chat_with_openai(model='gpt-4o', system_prompt=system_prompt, messages=[{"role": "user", "content": user_msg}])
+    data = None
+    try:
+        data = json.loads(reply)
+    except Exception:
+        m = re.search(r"\{[\s\S]*\}", reply)
+        if m:
+            try:
+                data = json.loads(m.group(0))
+            except Exception:
+                data = None
+
+    # Normalize structure for template rendering
+    def _to_list(val):
+        if val is None:
+            return None
+        if isinstance(val, list):
+            # ensure strings
+            out = [str(x).strip() for x in val if str(x).strip()]
+            return out or None
+        if isinstance(val, str):
+            txt = val.strip()
+            if not txt:
+                return None
+            # split by newlines and common separators
+            parts = re.split(r"\r?\n|\u2022|•|;|\t", txt)
+            cleaned = []
+            for p in parts:
+                s = p.strip()
+                # strip leading bullets/numbers like -, *, +, 1), 1., - [ ]
+                s = re.sub(r"^(?:[-*+•\u2022]\s*|\d+[\).]\s*)", "", s).strip()
+                if s:
+                    cleaned.append(s)
+            return cleaned or None
+        # fallback
+        return [str(val).strip()]
+
+    if not isinstance(data, dict):
+        data = {"raw": reply}
+    else:
+        data = {
+            "instructions": _to_list(data.get("instructions")),
+            "tips": _to_list(data.get("tips")),
+            "tools": _to_list(data.get("tools")),
+            "materials": _to_list(data.get("materials")),
+            "safety": _to_list(data.get("safety")),
+            "duration_estimate": (str(data.get("duration_estimate")).strip() if data.get("duration_estimate") else None),
+            "estimated_cost": (str(data.get("estimated_cost")).strip() if data.get("estimated_cost") else None),
+        }
+        # If all normalized fields are empty, keep raw for debugging
+        if not any([data.get("instructions"), data.get("tips"), data.get("tools"), data.get("materials"), data.get("safety"), data.get("duration_estimate"), data.get("estimated_cost")]):
+            data = {"raw": reply}
+
+    task.ai_suggested = True
+    task.ai_details = data
+    task.save(update_fields=["ai_suggested", "ai_details"])
+
+
+# Exposed endpoint to enrich a task via POST
+@csrf_exempt
+def enrich_task_with_ai(request, pk: int):
+    if request.method != 'POST':
+        return redirect('projects')
+    task = get_object_or_404(PersonalTask, pk=pk)
+    try:
+        enrich_task_record_with_ai(task)
+    except Exception as e:
+        task.ai_details = {"error": str(e)}
+        task.save(update_fields=["ai_details"])
+    return redirect(f"{reverse_lazy('projects')}?project={task.project_id}")
+
+
+# Personal CRUD helpers (edit/delete views)
+class PersonalPropertyEditView(PersonalBaseView):
+    template_name = 'properties.html'
+
+    def get(self, request, pk: int, *args, **kwargs):
+        obj = get_object_or_404(PersonalProperty, pk=pk)
+        q = request.GET.get('search', '').strip()
+        qs = PersonalProperty.objects.all().order_by('-created_at')
+        if q:
+            qs = qs.filter(Q(name__icontains=q) | Q(address__icontains=q))
+        page = Paginator(qs, 10).get_page(request.GET.get('page'))
+        ctx = self.get_context_data(form=PropertyForm(instance=obj), page_obj=page, search_query=q, edit_property=True)
+        return self.render_to_response(ctx)
+
+    def post(self, request, pk: int, *args, **kwargs):
+        obj = get_object_or_404(PersonalProperty, pk=pk)
+        form = PropertyForm(request.POST, instance=obj)
+        if form.is_valid():
+            form.save()
+        return redirect('properties')
+
+
+class PersonalPropertyDeleteView(PersonalBaseView):
+    def get(self, request, pk: int, *args, **kwargs):
+        obj = get_object_or_404(PersonalProperty, pk=pk)
+        obj.delete()
+        return redirect('properties')
+
+
+class PersonalRepairsView(PersonalBaseView):
+    template_name = 'repairs.html'
+
+    def get(self, request, *args, **kwargs):
+        q = request.GET.get('search', '').strip()
+        qs = PersonalRepair.objects.all().order_by('-created_at')
+        if q:
+            qs = qs.filter(Q(title__icontains=q) | Q(description__icontains=q) | Q(assigned_to__icontains=q))
+        page = Paginator(qs, 10).get_page(request.GET.get('page'))
+        ctx = self.get_context_data(form=RepairForm(), page_obj=page, search_query=q)
+        return self.render_to_response(ctx)
+
+    def post(self, request, *args, **kwargs):
+        form = RepairForm(request.POST)
+        if form.is_valid():
+            form.save()
+        return redirect('repairs')
+
+
+class PersonalRepairEditView(PersonalBaseView):
+    template_name = 'repairs.html'
+
+    def get(self, request, pk: int, *args, **kwargs):
+        obj = get_object_or_404(PersonalRepair, pk=pk)
+        q = request.GET.get('search', '').strip()
+        page = Paginator(PersonalRepair.objects.all().order_by('-created_at'), 10).get_page(request.GET.get('page'))
+        ctx = self.get_context_data(form=RepairForm(instance=obj), page_obj=page, search_query=q, edit_repair=True)
+        return self.render_to_response(ctx)
+
+    def post(self, request, pk: int, *args, **kwargs):
+        obj = get_object_or_404(PersonalRepair, pk=pk)
+        form = RepairForm(request.POST, instance=obj)
+        if form.is_valid():
+            form.save()
+        return redirect('repairs')
+
+
+class PersonalRepairDeleteView(PersonalBaseView):
+    def get(self, request, pk: int, *args, **kwargs):
+        obj = get_object_or_404(PersonalRepair, pk=pk)
+        obj.delete()
+        return redirect('repairs')
+
+
+class PersonalProjectEditView(PersonalBaseView):
+    template_name = 'projects.html'
+
+    def get(self, request, pk: int, *args, **kwargs):
+        project = get_object_or_404(PersonalProject, pk=pk)
+        q = request.GET.get('search', '').strip()
+        status = request.GET.get('status', '').strip()
+        page = Paginator(PersonalProject.objects.all().order_by('-created_at'), 10).get_page(request.GET.get('page'))
+        by_status = {
+            'PLANNED': PersonalProject.objects.filter(status='PLANNED').count(),
+            'IN_PROGRESS': PersonalProject.objects.filter(status='IN_PROGRESS').count(),
+            'COMPLETED': PersonalProject.objects.filter(status='COMPLETED').count(),
+            'ON_HOLD': PersonalProject.objects.filter(status='ON_HOLD').count(),
+        }
+        total_budget = PersonalProject.objects.exclude(budget__isnull=True).aggregate(s=models.Sum('budget'))['s'] or 0
+        tasks = project.tasks.all().order_by(models.F('position').asc(nulls_first=True), '-created_at')
+        ctx = self.get_context_data(
+            form=ProjectForm(instance=project), page_obj=page, search_query=q,
+            status_selected=status, project_status_counts=by_status, total_budget=total_budget,
+            selected_project=project, tasks=tasks, task_form=TaskForm(initial={'project': project}), edit_project=True,
+        )
+        return self.render_to_response(ctx)
+
+    def post(self, request, pk: int, *args, **kwargs):
+        project = get_object_or_404(PersonalProject, pk=pk)
+        form = ProjectForm(request.POST, instance=project)
+        if form.is_valid():
+            form.save()
+        return redirect('projects')
+
+
+class PersonalProjectDeleteView(PersonalBaseView):
+    def get(self, request, pk: int, *args, **kwargs):
+        project = get_object_or_404(PersonalProject, pk=pk)
+        project.delete()
+        return redirect('projects')
+
+
+class PersonalAssetEditView(PersonalBaseView):
+    template_name = 'assets.html'
+
+    def get(self, request, pk: int, *args, **kwargs):
+        obj = get_object_or_404(PersonalAsset, pk=pk)
+        q = request.GET.get('search', '').strip()
+        cat = request.GET.get('category', '').strip()
+        qs = PersonalAsset.objects.all().order_by('-created_at')
+        if q:
+            qs = qs.filter(Q(name__icontains=q) | Q(category__icontains=q))
+        if cat:
+            qs = qs.filter(category__iexact=cat)
+        page = Paginator(qs, 10).get_page(request.GET.get('page'))
+        categories = (
+            PersonalAsset.objects.exclude(category__isnull=True)
+            .exclude(category__exact='')
+            .values_list('category', flat=True).distinct().order_by('category')
+        )
+        ctx = self.get_context_data(form=AssetForm(instance=obj), page_obj=page, search_query=q, categories=categories, category_selected=cat, edit_asset=True)
+        return self.render_to_response(ctx)
+
+    def post(self, request, pk: int, *args, **kwargs):
+        obj = get_object_or_404(PersonalAsset, pk=pk)
+        form = AssetForm(request.POST, instance=obj)
+        if form.is_valid():
+            form.save()
+        return redirect('assets')
+
+
+class PersonalAssetDeleteView(PersonalBaseView):
+    def get(self, request, pk: int, *args, **kwargs):
+        obj = get_object_or_404(PersonalAsset, pk=pk)
+        obj.delete()
+        return redirect('assets')
+
+
+class PersonalFinancialView(PersonalBaseView):
+    template_name = 'financial.html'
+
+    def get(self, request, *args, **kwargs):
+        q = request.GET.get('search', '').strip()
+        qs = PersonalFinancialEntry.objects.all().order_by('-date', '-created_at')
+        if q:
+            qs = qs.filter(Q(description__icontains=q) | Q(category__icontains=q))
+        # extra filters
+        category = request.GET.get('category', '').strip()
+        kind = request.GET.get('type', '').strip()
+        start = request.GET.get('start', '').strip()
+        end = request.GET.get('end', '').strip()
+        min_amt = request.GET.get('min', '').strip()
+        max_amt = request.GET.get('max', '').strip()
+        if category:
+            qs = qs.filter(category=category)
+        if kind in ("INCOME", "EXPENSE"):
+            qs = qs.filter(type=kind)
+        if start:
+            qs = qs.filter(date__gte=start)
+        if end:
+            qs = qs.filter(date__lte=end)
+        try:
+            if min_amt:
+                qs = qs.filter(amount__gte=float(min_amt))
+            if max_amt:
+                qs = qs.filter(amount__lte=float(max_amt))
+        except ValueError:
+            pass
+
+        # CSV export
+        if request.GET.get('export') == 'csv':
+            response = HttpResponse(content_type='text/csv')
+            response['Content-Disposition'] = 'attachment; filename="personal_finance.csv"'
+            writer = csv.writer(response)
+            writer.writerow(['Category', 'Type', 'Amount', 'Date', 'Description'])
+            for f in qs:
+                writer.writerow([f.category or '', f.type or '', f.amount, f.date, (f.description or '')])
+            return response
+
+        # KPIs and charts
+        income = sum((float(f.amount) if f.amount is not None else 0) for f in qs if (f.type == 'INCOME') or (not f.type and (f.amount or 0) > 0))
+        expenses = sum((float(f.amount) if f.amount is not None else 0) for f in qs if (f.type == 'EXPENSE') or (not f.type and (f.amount or 0) < 0))
+        net = income + expenses
+        expenses_display = abs(expenses)
+        series = {}
+        expense_by_cat = {}
+        for f in qs:
+            ym = f.date.strftime('%Y-%m') if f.date else 'Unknown'
+            if ym not in series:
+                series[ym] = {'income': 0.0, 'expense': 0.0}
+            amt = abs(float(f.amount) if f.amount is not None else 0)
+            if (f.type == 'INCOME') or (not f.type and (f.amount or 0) > 0):
+                series[ym]['income'] += amt
+            else:
+                series[ym]['expense'] += amt
+                key = f.category or 'Uncategorized'
+                expense_by_cat[key] = expense_by_cat.get(key, 0.0) + amt
+        months = sorted(series.keys())
+        income_points = [series[m]['income'] for m in months]
+        expense_points = [series[m]['expense'] for m in months]
+
+        page = Paginator(qs, 10).get_page(request.GET.get('page'))
+        categories = list(
+            PersonalFinancialEntry.objects.exclude(category__isnull=True).exclude(category__exact="").values_list('category', flat=True).distinct().order_by('category')
+        )
+        ctx = self.get_context_data(
+            form=FinancialEntryForm(),
+            page_obj=page,
+            search_query=q,
+            income_total=income,
+            expense_total=expenses_display,
+            net_total=net,
+            months_json=json.dumps(months),
+            income_points_json=json.dumps(income_points),
+            expense_points_json=json.dumps(expense_points),
+            expense_cat_labels_json=json.dumps(list(expense_by_cat.keys())),
+            expense_cat_values_json=json.dumps(list(expense_by_cat.values())),
+            categories=categories,
+            category_selected=category,
+            type_selected=kind,
+            start=start,
+            end=end,
+            min=min_amt,
+            max=max_amt,
+        )
+        return self.render_to_response(ctx)
+
+    def post(self, request, *args, **kwargs):
+        form = FinancialEntryForm(request.POST)
+        if form.is_valid():
+            form.save()
+        return redirect('financial')
+
+
+class PersonalFinancialEditView(PersonalBaseView):
+    template_name = 'financial.html'
+
+    def get(self, request, pk: int, *args, **kwargs):
+        obj = get_object_or_404(PersonalFinancialEntry, pk=pk)
+        q = request.GET.get('search', '').strip()
+        page = Paginator(PersonalFinancialEntry.objects.all().order_by('-date', '-created_at'), 10).get_page(request.GET.get('page'))
+        ctx = self.get_context_data(form=FinancialEntryForm(instance=obj), page_obj=page, search_query=q, edit_financial_entry=True)
+        return self.render_to_response(ctx)
+
+    def post(self, request, pk: int, *args, **kwargs):
+        obj = get_object_or_404(PersonalFinancialEntry, pk=pk)
+        form = FinancialEntryForm(request.POST, instance=obj)
+        if form.is_valid():
+            form.save()
+        return redirect('financial')
+
+
+class PersonalFinancialDeleteView(PersonalBaseView):
+    def get(self, request, pk: int, *args, **kwargs):
+        obj = get_object_or_404(PersonalFinancialEntry, pk=pk)
+        obj.delete()
+        return redirect('financial')
+
+
+# New: Monthly Items subpage
+FORECAST_MONTHS = 6
+
+
+class PersonalMonthlyItemsView(PersonalBaseView):
+    template_name = 'monthly_items.html'
+
+    def get(self, request, *args, **kwargs):
+        q = request.GET.get('search', '').strip()
+        kind = request.GET.get('type', '').strip()
+        qs = PersonalMonthlyItem.objects.all()
+        if q:
+            qs = qs.filter(Q(title__icontains=q) | Q(category__icontains=q) | Q(notes__icontains=q))
+        if kind in ("INCOME", "EXPENSE"):
+            qs = qs.filter(type=kind)
+        totals = qs.aggregate(
+            income=models.Sum('amount', filter=Q(type='INCOME')),
+            expenses=models.Sum('amount', filter=Q(type='EXPENSE')),
+        )
+        income_total = float(totals['income'] or 0)
+        expense_total = float(totals['expenses'] or 0)
+        net = income_total - expense_total
+        page = Paginator(qs, 20).get_page(request.GET.get('page'))
+        ctx = self.get_context_data(
+            form=MonthlyItemForm(), page_obj=page, search_query=q,
+            type_selected=kind, income_total=income_total, expense_total=expense_total, net_total=net,
+            forecast=cashflow.forecast(FORECAST_MONTHS),
+        )
+        return self.render_to_response(ctx)
+
+    def post(self, request, *args, **kwargs):
+        form = MonthlyItemForm(request.POST)
+        if form.is_valid():
+            form.save()
+        return redirect('monthly_items')
+
+
+class PersonalMonthlyItemEditView(PersonalBaseView):
+    template_name = 'monthly_items.html'
+
+    def get(self, request, pk: int, *args, **kwargs):
+        obj = get_object_or_404(PersonalMonthlyItem, pk=pk)
+        q = request.GET.get('search', '').strip()
+        kind = request.GET.get('type', '').strip()
+        page = Paginator(PersonalMonthlyItem.objects.all(), 20).get_page(request.GET.get('page'))
+        ctx = self.get_context_data(form=MonthlyItemForm(instance=obj), page_obj=page, search_query=q, type_selected=kind, edit_item=True)
+        return self.render_to_response(ctx)
+
+    def post(self, request, pk: int, *args, **kwargs):
+        obj = get_object_or_404(PersonalMonthlyItem, pk=pk)
+        form = MonthlyItemForm(request.POST, instance=obj)
+        if form.is_valid():
+            form.save()
+        return redirect('monthly_items')
+
+
+class PersonalMonthlyItemDeleteView(PersonalBaseView):
+    def get(self, request, pk: int, *args, **kwargs):
+        obj = get_object_or_404(PersonalMonthlyItem, pk=pk)
+        obj.delete()
+        return redirect('monthly_items')
+
+
+class PersonalDocumentsView(PersonalBaseView):
+    template_name = 'documents.html'
+
+    def get(self, request, *args, **kwargs):
+        q = request.GET.get('search', '').strip()
+        qs = PersonalDocument.objects.all().order_by('-created_at')
+        if q:
+            qs = qs.filter(Q(title__icontains=q))
+        page = Paginator(qs, 10).get_page(request.GET.get('page'))
+        ctx = self.get_context_data(form=DocumentForm(), page_obj=page, search_query=q)
+        return self.render_to_response(ctx)
+
+    def post(self, request, *args, **kwargs):
+        form = DocumentForm(request.POST, request.FILES)
+        if form.is_valid():
+            form.save()
+        return redirect('documents')
+
+
+class PersonalDocumentEditView(PersonalBaseView):
+    template_name = 'documents.html'
+
+    def get(self, request, pk: int, *args, **kwargs):
+        obj = get_object_or_404(PersonalDocument, pk=pk)
+        q = request.GET.get('search', '').strip()
+        page = Paginator(PersonalDocument.objects.all().order_by('-created_at'), 10).get_page(request.GET.get('page'))
+        ctx = self.get_context_data(form=DocumentForm(instance=obj), page_obj=page, search_query=q, edit_document=True)
+        return self.render_to_response(ctx)
+
+    def post(self, request, pk: int, *args, **kwargs):
+        obj = get_object_or_404(PersonalDocument, pk=pk)
+        form = DocumentForm(request.POST, request.FILES, instance=obj)
+        if form.is_valid():
+            form.save()
+        return redirect('documents')
+
+
+class PersonalDocumentDeleteView(PersonalBaseView):
+    def get(self, request, pk: int, *args, **kwargs):
+        obj = get_object_or_404(PersonalDocument, pk=pk)
+        obj.delete()
+        return redirect('documents')
+
+
+class PersonalReportsView(PersonalBaseView):
+    template_name = 'reports.html'
+
+    def get(self, request, *args, **kwargs):
+        q = request.GET.get('search', '').strip()
+        qs = PersonalReport.objects.all().order_by('-created_at')
+        if q:
+            qs = qs.filter(Q(title__icontains=q) | Q(content__icontains=q))
+        page = Paginator(qs, 10).get_page(request.GET.get('page'))
+        ctx = self.get_context_data(form=ReportForm(), page_obj=page, search_query=q)
+        return self.render_to_response(ctx)
+
+    def post(self, request, *args, **kwargs):
+        form = ReportForm(request.POST)
+        if form.is_valid():
+            form.save()
+        return redirect('reports')
+
+
+class PersonalReportEditView(PersonalBaseView):
+    template_name = 'reports.html'
+
+    def get(self, request, pk: int, *args, **kwargs):
+        obj = get_object_or_404(PersonalReport, pk=pk)
+        q = request.GET.get('search', '').strip()
+        page = Paginator(PersonalReport.objects.all().order_by('-created_at'), 10).get_page(request.GET.get('page'))
+        ctx = self.get_context_data(form=ReportForm(instance=obj), page_obj=page, search_query=q, edit_report=True)
+        return self.render_to_response(ctx)
+
+    def post(self, request, pk: int, *args, **kwargs):
+        obj = get_object_or_404(PersonalReport, pk=pk)
+        form = ReportForm(request.POST, instance=obj)
+        if form.is_valid():
+            form.save()
+        return redirect('reports')
+
+
+class PersonalReportDeleteView(PersonalBaseView):
+    def get(self, request, pk: int, *args, **kwargs):
+        obj = get_object_or_404(PersonalReport, pk=pk)
+        obj.delete()
+        return redirect('reports')
+
+
+def calendar_feed_url(request):
+    """Absolute subscription URL of the iCalendar feed for the current user."""
+    from ..calendar_feed import make_feed_token
+    if not request.user.is_authenticated:
+        return ''
+    return request.build_absolute_uri(reverse_lazy('calendar_feed', args=[make_feed_token(request.user)]))
+
+
+def calendar_feed(request, token):
+    """Subscribable iCalendar feed; authenticated by the token in the URL.
+
+    Calendar clients can't log in, so the token stands in for the session.
+    Responses carry an ETag and a matching If-None-Match gets a bodiless 304.
+    """
+    from django.http import Http404, StreamingHttpResponse
+    from django.utils.http import parse_etags, quote_etag
+
+    from ..calendar_feed import feed_etag, feed_querysets, stream_feed, user_for_token
+    if user_for_token(token) is None:
+        raise Http404('Unknown calendar')
+    etag = quote_etag(feed_etag())
+    if etag in parse_etags(request.headers.get('If-None-Match', '')):
+        resp = HttpResponse(status=304)
+    else:
+        projects, tasks, blocks = feed_querysets()
+        resp = StreamingHttpResponse(stream_feed(projects, tasks, blocks), content_type='text/calendar; charset=utf-8')
+        resp['Content-Disposition'] = 'inline; filename="personal.ics"'
+    resp['ETag'] = etag
+    resp['Cache-Control'] = 'private, no-cache'
+    return resp
+
+
+class GlobalCalendarView(PersonalBaseView):
+    template_name = 'global_calendar.html'
+
+    def get(self, request, *args, **kwargs):
+        # Events are fetched per visible range from calendar_events
+        ctx = self.get_context_data(calendar_feed_url=calendar_feed_url(request))
+        return self.render_to_response(ctx)
+
+
+def calendar_events(request):
+    """JSON events for the calendar widget's visible ``start``/``end`` range."""
+    from ..calendar_feed import MAX_RANGE_DAYS, cached_range_events
+    try:
+        # Widgets send ISO datetimes with offsets; only the date part matters
+        start = date.fromisoformat((request.GET.get('start') or '')[:10])
+        end = date.fromisoformat((request.GET.get('end') or '')[:10])
+    except ValueError:
+        return JsonResponse({'ok': False, 'error': 'start and end dates required'}, status=400)
+    if end < start or (end - start).days > MAX_RANGE_DAYS:
+        return JsonResponse({'ok': False, 'error': 'invalid range'}, status=400)
+    resp = JsonResponse(cached_range_events(start, end), safe=False)
+    resp['Cache-Control'] = 'private, max-age=30'
+    return resp
+
+
+class PersonalProjectsView(PersonalBaseView):
+    template_name = 'projects.html'
+
+    def get(self, request, *args, **kwargs):
+        # Export tasks as JSON (project-scoped or all)
+        if request.GET.get('export') == 'tasks_json':
+            pid = request.GET.get('project')
+            data = []
+            qs = PersonalTask.objects.all().select_related('project')
+            if pid:
+                qs = qs.filter(project_id=pid)
+            for t in qs.order_by('project_id', 'start_date', 'due_date', 'id'):
+               
+                data.append({
+                    'id': t.id,
+                    'project_id': t.project_id,
+                    'project': t.project.name if t.project_id else None,
+                    'title': t.title,
+                    'description': t.description,
+                    'status': t.status,
+                    'priority': t.priority,
+                    'assigned_to': t.assigned_to,
+                    'section': t.section,
+                    'start_date': t.start_date.isoformat() if t.start_date else None,
+                    'due_date': t.due_date.isoformat() if t.due_date else None,
+                    'progress': t.progress,
+                    'ai_suggested': t.ai_suggested,
+                    'ai_details': t.ai_details,
+                    'created_at': t.created_at.isoformat() if t.created_at else None,
+                })
+            proj_details = None
+            if pid:
+                p = PersonalProject.objects.filter(pk=pid).first()
+                if p:
+                    proj_details = {
+                        'id': p.id,
+                        'name': p.name,
+                        'description': p.description,
+                        'status': p.status,
+                        'assigned_to': p.assigned_to,
+                        'budget': float(p.budget) if getattr(p, 'budget', None) is not None else None,
+                        'start_date': p.start_date.isoformat() if p.start_date else None,
+                        'end_date': p.end_date.isoformat() if p.end_date else None,
+                        'created_at': p.created_at.isoformat() if getattr(p, 'created_at', None) else None,
+                    }
+            return JsonResponse({'tasks': data, 'project': pid, 'project_details': proj_details}, json_dumps_params={'indent': 2})
+
+        # New: export projects with nested tasks as JSON
+        if request.GET.get('export') == 'projects_json':
+            pid = request.GET.get('project')
+            projects_qs = PersonalProject.objects.all()
+            if pid:
+                projects_qs = projects_qs.filter(pk=pid)
+            projects = []
+            for p in projects_qs:
+                tasks = []
+                for t in p.tasks.all().order_by('start_date', 'due_date', 'id'):
+                    tasks.append({
+                        'id': t.id,
+                        'title': t.title,
+                        'description': t.description,
+                        'status': t.status,
+                        'priority': t.priority,
+                        'assigned_to': t.assigned_to,
+                        'section': t.section,
+                        'start_date': t.start_date.isoformat() if t.start_date else None,
+                        'due_date': t.due_date.isoformat() if t.due_date else None,
+                        'progress': t.progress,
+                        'ai_suggested': t.ai_suggested,
+                        'ai_details': t.ai_details,
+                        'created_at': t.created_at.isoformat() if t.created_at else None,
+                    })
+                projects.append({
+                    'id': p.id,
+                    'name': p.name,
+                    'description': p.description,
+                    'status': p.status,
+                    'assigned_to': p.assigned_to,
+                    'budget': float(p.budget) if getattr(p, 'budget', None) is not None else None,
+                    'start_date': p.start_date.isoformat() if p.start_date else None,
+                    'end_date': p.end_date.isoformat() if p.end_date else None,
+                    'created_at': p.created_at.isoformat() if getattr(p, 'created_at', None) else None,
+                    'tasks': tasks,
+                })
+            return JsonResponse({'projects': projects}, json_dumps_params={'indent': 2})
+
+        # New: provide a CSV template for importing tasks
+        if request.GET.get('export') == 'tasks_csv_template':
+            response = HttpResponse(content_type='text/csv')
+            response['Content-Disposition'] = 'attachment; filename="tasks_template.csv"'
+            writer = csv.writer(response)
+            # Updated template: includes per-row project assignment and estimated hours for scheduler
+            writer.writerow(['title', 'project', 'estimated_hours', 'description', 'section', 'status', 'priority', 'assigned_to', 'start_date', 'due_date', 'progress'])
+            # Add multiple examples with different date formats and projects
+            writer.writerow(['Install new faucet', 'Home Renovation', '2.5', 'Replace kitchen faucet with modern stainless steel model', 'Kitchen', 'TODO', 'HIGH', 'John', '2025-08-12', '2025-08-15', '0'])
+            writer.writerow(['Paint living room', 'Home Renovation', '4', 'Apply fresh coat of paint to living room walls', 'Living Room', 'IN_PROGRESS', 'MEDIUM', 'Sarah', '08/10/2025', '08/20/2025', '25'])
+            writer.writerow(['Fix bathroom tile', 'Bathroom Refresh', '1.5', 'Repair loose tile in master bathroom', 'Bathroom', 'DONE', 'LOW', 'Mike', '2025-08-01', '2025-08-05', '100'])
+            # Notes about accepted values and behaviors
+            writer.writerow(['# NOTE: Dates can be in YYYY-MM-DD, MM/DD/YYYY, or DD/MM/YYYY format', '', '', '', '', '', '', '', '', '', ''])
+            writer.writerow(['# Valid status: TODO, IN_PROGRESS, DONE', '', '', '', '', '', '', '', '', '', ''])
+            writer.writerow(['# Valid priority: LOW, MEDIUM, HIGH (or leave blank)', '', '', '', '', '', '', '', '', '', ''])
+            writer.writerow(['# If project does not exist, it will be created automatically', '', '', '', '', '', '', '', '', '', ''])
+            writer.writerow(['# If no project column is provided, the selected project (if any) will be used', '', '', '', '', '', '', '', '', '', ''])
+            return response
+
+        q = request.GET.get('search', '').strip()
+        status = request.GET.get('status', '').strip()
+        qs = PersonalProject.objects.all().order_by('-created_at')
+        if q:
+            qs = qs.filter(Q(name__icontains=q) | Q(description__icontains=q))
+        if status:
+            qs = qs.filter(status=status)
+        page = Paginator(qs, 10).get_page(request.GET.get('page'))
+        by_status = {
+            'PLANNED': PersonalProject.objects.filter(status='PLANNED').count(),
+            'IN_PROGRESS': PersonalProject.objects.filter(status='IN_PROGRESS').count(),
+            'COMPLETED': PersonalProject.objects.filter(status='COMPLETED').count(),
+            'ON_HOLD': PersonalProject.objects.filter(status='ON_HOLD').count(),
+        }
+        total_budget = PersonalProject.objects.exclude(budget__isnull=True).aggregate(s=models.Sum('budget'))['s'] or 0
+        ctx = self.get_context_data(
+            form=ProjectForm(), page_obj=page, search_query=q,
+            status_selected=status, project_status_counts=by_status, total_budget=total_budget,
+        )
+        return self.render_to_response(ctx)
+
+    def post(self, request, *args, **kwargs):
+        action = request.POST.get('action')
+        if action == 'generate_project_ai':
+            name = (request.POST.get('name') or '').strip()
+            description = (request.POST.get('description') or '').strip()
+            if not name:
+                messages.error(request, 'Provide a project name.')
+                return redirect('projects')
+            # Create the project first
+            p = PersonalProject.objects.create(name=name, description=description or None, status='PLANNED')
+            # Ask AI to generate a structured plan
+            try:
+                from ..ai import chat_with_openai
+                system = (
+                    'You are a project planner. Given a title and description, generate a JSON with fields: '
+                    '{"tasks":[{"title":"...","description":"...","status":"TODO|IN_PROGRESS|DONE","priority":"LOW|MEDIUM|HIGH","section":"","assigned_to":"","start_date":"YYYY-MM-DD","due_date":"YYYY-MM-DD"}],'
+                    '"images":[{"prompt":"alt text or caption for image related to project"}]}'
+                )
+                user_msg = f"Title: {name}\nDescription: {description}"
+                content = chat_with_openai('gpt-4o-mini', system, [{ 'role':'user', 'content': user_msg }])
+            except Exception as e:
+                content = ''
+            import json
+            import re
+            tasks = []
+            images = []
+            if content:
+                try:
+                    data = json.loads(content)
+                    tasks = data.get('tasks') or []
+                    images = data.get('images') or []
+                except Exception:
+                    m = re.search(r"\{[\s\S]*\}", content)
+                    if m:
+                        try:
+                            data = json.loads(m.group(0))
+                            tasks = data.get('tasks') or []
+                            images = data.get('images') or []
+                        except Exception:
+                            pass
+            # Save tasks (ensure dates for calendar/gantt where possible)
+            from datetime import datetime as _dt
+            from datetime import timedelta as _td
+
+            from ..models import PersonalProjectMedia, PersonalTask
+            proj_start_candidates = []
+            proj_end_candidates = []
+            for t in tasks if isinstance(tasks, list) else []:
+                title = (t.get('title') or '').strip()
+                if not title:
+                    continue
+                nt = PersonalTask(project=p, title=title)
+                nt.description = (t.get('description') or '').strip() or None
+                st = (t.get('status') or 'TODO').strip().upper()
+                nt.status = st if st in ('TODO','IN_PROGRESS','DONE') else 'TODO'
+                pr = (t.get('priority') or '').strip().upper()
+                nt.priority = pr if pr in ('LOW','MEDIUM','HIGH') else None
+                nt.section = (t.get('section') or '').strip() or None
+                nt.assigned_to = (t.get('assigned_to') or '').strip() or None
+                try:
+                    sd = (t.get('start_date') or '').strip()
+                    dd = (t.get('due_date') or '').strip()
+                    # Parse ISO or fallback noop
+                    sdt = _dt.fromisoformat(sd).date() if sd else None
+                    edt = _dt.fromisoformat(dd).date() if dd else None
+                    if sdt and not edt:
+                        edt = sdt + _td(days=1)
+                    if edt and not sdt:
+                        sdt = edt - _td(days=1)
+                    # If both still missing, set a sensible default window
+                    if not sdt and not edt:
+                        today = timezone.localdate()
+                        sdt = today + _td(days=1)
+                        edt = today + _td(days=2)
+                    nt.start_date = sdt
+                    nt.due_date = edt
+                except Exception:
+                    pass
+                try:
+                    nt.save()
+                    if nt.start_date:
+                        proj_start_candidates.append(nt.start_date)
+                    if nt.due_date:
+                        proj_end_candidates.append(nt.due_date)
+                except Exception:
+                    continue
+            # Backfill project start/end if missing
+            try:
+                if not p.start_date and proj_start_candidates:
+                    p.start_date = min(proj_start_candidates)
+                if not p.end_date and proj_end_candidates:
+                    p.end_date = max(proj_end_candidates)
+                if p.start_date or p.end_date:
+                    p.save(update_fields=[f for f in ['start_date','end_date'] if getattr(p, f)])
+            except Exception:
+                pass
+            # Save image placeholders as media entries (URL field) using prompts as captions
+            # Generate images when possible; fallback to placeholder URLs
+            for idx, im in enumerate(images if isinstance(images, list) else []):
+                cap = (im.get('prompt') or '').strip()
+                if not cap:
+                    continue
+                try:
+                    # Try AI image generation
+                    from django.core.files.base import ContentFile
+
+                    from ..ai import generate_image
+                    img_bytes = generate_image(cap, size="1024x1024")
+                    if img_bytes:
+                        fname = f"ai_project_{p.id}_{idx+1}.png"
+                        media = PersonalProjectMedia(project=p, caption=cap)
+                        media.file.save(fname, ContentFile(img_bytes), save=True)
+                        continue
+                except Exception:
+                    pass
+                # Fallback to URL placeholder so UI still shows a tile
+                try:
+                    PersonalProjectMedia.objects.create(project=p, url='https://via.placeholder.com/512?text=AI+Image', caption=cap)
+                except Exception:
+                    pass
+            messages.success(request, 'AI generated project created.')
+            return redirect(f"{reverse_lazy('projects')}?project={p.id}")
+
+        if action == 'add_task':
+            pid = request.POST.get('project')
+            project = get_object_or_404(PersonalProject, pk=pid)
+            form = TaskForm(request.POST)
+            task = None
+            if form.is_valid():
+                task = form.save(commit=False)
+                if not getattr(task, 'project_id', None):
+                    task.project = project
+                task.save()
+            else:
+                # Fallback manual create for robustness
+                title = (request.POST.get('title') or '').strip()
+                if title:
+                    t = PersonalTask(
+                        project=project,
+                        title=title,
+                        description=(request.POST.get('description') or '').strip() or None,
+                        section=(request.POST.get('section') or '').strip() or None,
+                        status=(request.POST.get('status') or 'TODO').strip() or 'TODO',
+                        priority=(request.POST.get('priority') or '').strip() or None,
+                        assigned_to=(request.POST.get('assigned_to') or '').strip() or None,
+                        progress=int(request.POST.get('progress') or 0),
+                        ai_suggested=bool(request.POST.get('ai_suggested')),
+                    )
+                    sd = (request.POST.get('start_date') or '').strip()
+                    dd = (request.POST.get('due_date') or '').strip()
+                    try:
+                        if sd:
+                            t.start_date = timezone.datetime.fromisoformat(sd).date()
+                        if dd:
+                            t.due_date = timezone.datetime.fromisoformat(dd).date()
+                    except Exception:
+                        pass
+                    t.save()
+                    task = t
+            # Optional enrich
+            enrich_flag = request.POST.get('enrich_on_add') in ('on', 'true', '1')
+            if enrich_flag and task:
+                try:
+                    enrich_task_record_with_ai(task)
+                except Exception:
+                    pass
+            return redirect(f"{reverse_lazy('projects')}?project={project.id}")
+
+        if action == 'upload_media':
+            pid = request.POST.get('project')
+            project = get_object_or_404(PersonalProject, pk=pid)
+            from ..models import PersonalProjectMedia
+            m = PersonalProjectMedia(project=project)
+            m.caption = request.POST.get('caption') or None
+            if request.FILES.get('file'):
+                m.file = request.FILES['file']
+            url = (request.POST.get('url') or '').strip()
+            if url:
+                m.url = url
+            if not m.file and not m.url:
+                return redirect(f"{reverse_lazy('projects')}?project={pid}")
+            m.save()
+            return redirect(f"{reverse_lazy('projects')}?project={pid}")
+
+        if action == 'import_tasks_csv':
+            pid = request.POST.get('project')
+            default_project = None
+            if pid:
+                try:
+                    default_project = get_object_or_404(PersonalProject, pk=pid)
+                except Exception:
+                    default_project = None
+            f = request.FILES.get('file')
+            if not f:
+                messages.error(request, 'No file selected for import.')
+                return redirect(f"{reverse_lazy('projects')}" + (f"?project={pid}" if pid else ''))
+
+            import io
+            try:
+                text = f.read().decode('utf-8', errors='ignore')
+            except Exception:
+                try:
+                    text = f.read().decode('latin-1', errors='ignore')
+                except Exception as e:
+                    messages.error(request, f'Error reading file: {e}')
+                    return redirect(f"{reverse_lazy('projects')}" + (f"?project={pid}" if pid else ''))
+
+            try:
+                reader = csv.DictReader(io.StringIO(text))
+                imported_count = 0
+                error_count = 0
+                created_projects = 0
+                from datetime import datetime as _dt
+                date_formats = ['%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y']
+                for row_num, row in enumerate(reader, start=1):
+                    title = (row.get('title') or row.get('Task') or '').strip()
+                    if not title or title.startswith('#'):
+                        continue
+
+                    # Resolve project per row or fallback to default
+                    proj_name = (row.get('project') or row.get('Project') or row.get('project_name') or '').strip()
+                    project = default_project
+                    if proj_name:
+                        try:
+                            project_obj, created = PersonalProject.objects.get_or_create(name=proj_name)
+                            if created:
+                                created_projects += 1
+                            project = project_obj
+                        except Exception:
+                            project = default_project
+                    if not project:
+                        error_count += 1
+                        continue  # cannot assign without project
+
+                    try:
+                        t = PersonalTask(project=project, title=title)
+                        t.description = (row.get('description') or row.get('Description') or '').strip() or None
+                        t.section = (row.get('section') or '').strip() or None
+                        st = (row.get('status') or '').strip().upper()
+                        t.status = st if st in ('TODO','IN_PROGRESS','DONE') else 'TODO'
+                        pr = (row.get('priority') or '').strip().upper()
+                        t.priority = pr if pr in ('LOW','MEDIUM','HIGH') else None
+                        t.assigned_to = (row.get('assigned_to') or '').strip() or None
+                        try:
+                            t.progress = int(row.get('progress') or 0)
+                        except Exception:
+                            t.progress = 0
+                        # Estimated hours for scheduler
+                        hours_val = (row.get('estimated_hours') or row.get('hours') or row.get('hrs') or '').strip()
+                        try:
+                            if hours_val:
+                                t.estimated_hours = float(hours_val)
+                        except Exception:
+                            pass
+                        # Dates
+                        sd = (row.get('start_date') or row.get('start') or '').strip()
+                        dd = (row.get('due_date') or row.get('end') or '').strip()
+                        def parse_date(s):
+                            s = (s or '').strip()
+                            if not s:
+                                return None
+                            try:
+                                return timezone.datetime.fromisoformat(s).date()
+                            except Exception:
+                                for fmt in date_formats:
+                                    try:
+                                        return _dt.strptime(s, fmt).date()
+                                    except Exception:
+                                        continue
+                            return None
+                        try:
+                            t.start_date = parse_date(sd) or t.start_date
+                            t.due_date = parse_date(dd) or t.due_date
+                        except Exception:
+                            pass
+                        t.save()
+                        imported_count += 1
+                    except Exception:
+                        error_count += 1
+                        continue
+
+                if imported_count > 0:
+                    extra = f" Created {created_projects} new project(s)." if created_projects else ''
+                    if error_count > 0:
+                        messages.success(request, f"Imported {imported_count} task(s). {error_count} row(s) skipped.{extra}")
+                    else:
+                        messages.success(request, f"Imported {imported_count} task(s).{extra}")
+                else:
+                    messages.warning(request, 'No tasks were imported. Please check your CSV format.')
+            except Exception as e:
+                messages.error(request, f'Error processing CSV file: {e}')
+
+            return redirect(f"{reverse_lazy('projects')}" + (f"?project={pid}" if pid else ''))
+
+        if action == 'import_tasks_json':
+            pid = request.POST.get('project')
+            default_project = None
+            if pid:
+                try:
+                    default_project = get_object_or_404(PersonalProject, pk=pid)
+                except Exception:
+                    default_project = None
+            f = request.FILES.get('file')
+            if not f:
+                messages.error(request, 'No file selected for import.')
+                return redirect(f"{reverse_lazy('projects')}" + (f"?project={pid}" if pid else ''))
+
+            import io
+            try:
+                text = f.read().decode('utf-8', errors='ignore')
+                items = json.loads(text)
+            except Exception as e:
+                messages.error(request, f'Error reading JSON file: {e}')
+                return redirect(f"{reverse_lazy('projects')}" + (f"?project={pid}" if pid else ''))
+
+            try:
+                if isinstance(items, dict):
+                    items = items.get('tasks') or []
+
+                imported_count = 0
+                created_projects = 0
+                for row in items if isinstance(items, list) else []:
+                    title = (row.get('title') or '').strip()
+                    if not title:
+                        continue
+                    # Per-item project, else default
+                    proj_name = (row.get('project') or row.get('Project') or row.get('project_name') or '').strip()
+                    project = default_project
+                    if proj_name:
+                        try:
+                            project_obj, created = PersonalProject.objects.get_or_create(name=proj_name)
+                            if created:
+                                created_projects += 1
+                            project = project_obj
+                        except Exception:
+                            project = default_project
+                    if not project:
+                        continue
+                    t = PersonalTask(project=project, title=title)
+                    t.description = (row.get('description') or '').strip() or None
+                    t.section = (row.get('section') or '').strip() or None
+                    st = (row.get('status') or '').strip().upper()
+                    if st not in ('TODO','IN_PROGRESS','DONE'):
+                        st = 'TODO'
+                    t.status = st
+                    pr = (row.get('priority') or '').strip().upper()
+                    t.priority = pr if pr in ('LOW','MEDIUM','HIGH') else None
+                    t.assigned_to = (row.get('assigned_to') or '').strip() or None
+                    try:
+                        t.progress = int(row.get('progress') or 0)
+                    except Exception:
+                        t.progress = 0
+                    # Estimated hours support
+                    try:
+                        eh = row.get('estimated_hours') if isinstance(row, dict) else None
+                        if eh is None:
+                            eh = row.get('hours')
+                        if eh is not None:
+                            t.estimated_hours = float(eh)
+                    except Exception:
+                        pass
+                    sd = row.get('start_date') or row.get('start')
+                    dd = row.get('due_date') or row.get('end')
+                    from datetime import datetime as _dt
+                    try:
+                        if sd:
+                            t.start_date = _dt.fromisoformat(sd).date()
+                        if dd:
+                            t.due_date = _dt.fromisoformat(dd).date()
+                    except Exception:
+                        pass
+                    t.save()
+                    imported_count += 1
+
+                if imported_count > 0:
+                    extra = f" Created {created_projects} new project(s)." if created_projects else ''
+                    messages.success(request, f'Successfully imported {imported_count} tasks from JSON.{extra}')
+                else:
+                    messages.warning(request, 'No tasks were imported. Please check your JSON format.')
+            except Exception as e:
+                messages.error(request, f'Error processing JSON file: {e}')
+
+            return redirect(f"{reverse_lazy('projects')}" + (f"?project={pid}" if pid else ''))
+
+        # default: add or edit project
+        form = ProjectForm(request.POST)
+        if form.is_valid():
+            form.save()
+        return redirect('projects')
+
+
+# New: Project tasks scheduler subpage
+class ProjectSchedulerView(PersonalBaseView):
+    template_name = 'project_scheduler.html'
+
+    def get(self, request, *args, **kwargs):
+        # Inputs: optional project filter, weekly open window settings
+        pid = request.GET.get('project')
+        start_week = request.GET.get('week')  # ISO date for Monday
+        open_start = request.GET.get('open_start', '18:00')  # HH:MM
+        open_end = request.GET.get('open_end', '22:00')
+        # Load tasks (unscheduled first). Require estimated_hours to be set.
+        tasks = PersonalTask.objects.select_related('project').order_by('-priority' if hasattr(PersonalTask, 'priority') else 'created_at')
+        if pid:
+            tasks = tasks.filter(project_id=pid)
+        tasks = [t for t in tasks if (t.estimated_hours or 0) > 0]
+        # Compute week dates (Mon..Sun)
+        today = timezone.localdate()
+        if start_week:
+            try:
+                monday = timezone.datetime.fromisoformat(start_week).date()
+            except Exception:
+                monday = today - timedelta(days=today.weekday())
+        else:
+            monday = today - timedelta(days=today.weekday())
+        days = [monday + timedelta(days=i) for i in range(7)]
+        # Capacity and totals
+        try:
+            s_h, s_m = [int(x) for x in (open_start or '18:00').split(':')]
+            e_h, e_m = [int(x) for x in (open_end or '22:00').split(':')]
+        except Exception:
+            s_h, s_m, e_h, e_m = 18, 0, 22, 0
+        per_day_minutes = max((e_h * 60 + e_m) - (s_h * 60 + s_m), 0)
+        capacity_hours = round((per_day_minutes * len(days)) / 60.0, 2)
+        total_hours = round(sum(float(t.estimated_hours or 0) for t in tasks), 2)
+        remaining_hours = round(capacity_hours - total_hours, 2)
+        # Load the persisted blocks for this week
+        from ..schedules import has_blocks, schedule_payload
+        week_end = monday + timedelta(days=6)
+        saved_schedule = schedule_payload(monday, week_end) if has_blocks(monday, week_end) else None
+
+        ctx = self.get_context_data(
+            tasks=tasks,
+            days=days,
+            open_start=open_start,
+            open_end=open_end,
+            total_hours=total_hours,
+            capacity_hours=capacity_hours,
+            remaining_hours=remaining_hours,
+            projects=PersonalProject.objects.all().order_by('name'),
+            selected_project=int(pid) if pid else None,
+            saved_schedule=saved_schedule,
+            calendar_feed_url=calendar_feed_url(request),
+            week_start=monday.isoformat(),
+            prev_week=(monday - timedelta(days=7)).isoformat(),
+            next_week=(monday + timedelta(days=7)).isoformat(),
+        )
+        return self.render_to_response(ctx)
+
+    def post(self, request, *args, **kwargs):
+        action = request.POST.get('action')
+        if action == 'auto_schedule':
+            return self._auto_schedule(request)
+        if action == 'export_ics':
+            return self._export_ics(request)
+        return redirect('project_scheduler')
+
+    def _auto_schedule(self, request):
+        # Pack open tasks into the per-day windows over one or more weeks (see formula.scheduling)
+        from ..schedules import plan, schedule_payload, window_settings
+        from ..scheduling import DEFAULT_MIN_BLOCK, parse_hhmm
+        pid = request.POST.get('project')
+        open_start = request.POST.get('open_start') or '18:00'
+        open_end = request.POST.get('open_end') or '22:00'
+        week = request.POST.get('week')
+        try:
+            weeks = min(max(int(request.POST.get('weeks') or 1), 1), 26)
+        except ValueError:
+            weeks = 1
+        try:
+            min_block = max(int(request.POST.get('min_block') or DEFAULT_MIN_BLOCK), 5)
+        except ValueError:
+            min_block = DEFAULT_MIN_BLOCK
+
+        tasks = (
+            PersonalTask.objects.select_related('project')
+            .exclude(status='DONE')
+            .filter(estimated_hours__gt=0)
+        )
+        if pid:
+            tasks = tasks.filter(project_id=pid)
+        tasks = list(tasks)
+        deps = {}
+        edges = PersonalTask.depends_on.through.objects.filter(from_personaltask__in=tasks)
+        for task_id, dep_id in edges.values_list('from_personaltask_id', 'to_personaltask_id'):
+            deps.setdefault(task_id, []).append(dep_id)
+
+        today = timezone.localdate()
+        if week:
+            try:
+                monday = timezone.datetime.fromisoformat(week).date()
+            except Exception:
+                monday = today - timedelta(days=today.weekday())
+        else:
+            monday = today - timedelta(days=today.weekday())
+
+        # Per-day windows (fallback to global open_start/open_end), repeated every week
+        windows = {}
+        for i in range(7):
+            en = request.POST.get(f'day{i}_enabled')
+            enabled = True if en is None else str(en).lower() in ('1', 'true', 'on', 'yes')
+            if not enabled:
+                continue
+            s_min = parse_hhmm(request.POST.get(f'day{i}_start') or open_start, open_start)
+            e_min = parse_hhmm(request.POST.get(f'day{i}_end') or open_end, open_end)
+            windows[(monday.weekday() + i) % 7] = [(s_min, e_min)]
+
+        # Stores blocks + window settings per week; other projects' blocks are kept
+        settings_data = window_settings(open_start, open_end, windows, min_block)
+        result = plan(tasks, monday, weeks, settings_data, depends_on=deps)
+        titles = {t.id: t.title for t in tasks}
+        data = {
+            'week_start': monday.isoformat(),
+            'open_start': open_start,
+            'open_end': open_end,
+            'weeks': weeks,
+            'min_block': min_block,
+            # Read back from the store so blocks of other projects show too
+            'days': schedule_payload(monday, monday + timedelta(days=7 * weeks - 1))['days'],
+            'unscheduled': [
+                {'task_id': tid, 'title': titles.get(tid, ''), 'minutes': minutes}
+                for tid, minutes in result.unscheduled.items()
+            ],
+            'late': [{'task_id': tid, 'title': titles.get(tid, '')} for tid in result.late],
+        }
+        return JsonResponse(data)
+
+    def _export_ics(self, request):
+        # One-off download of the week on screen, built from the stored blocks
+        from django.http import StreamingHttpResponse
+
+        from ..calendar_feed import feed_querysets, stream_feed
+        today = timezone.localdate()
+        monday = today - timedelta(days=today.weekday())
+        week = request.POST.get('week') or request.GET.get('week')
+        if week:
+            try:
+                monday = date.fromisoformat(week)
+            except ValueError:
+                pass
+        _projects, _tasks, blocks = feed_querysets(since=monday)
+        blocks = blocks.filter(date__lte=monday + timedelta(days=6))
+        resp = StreamingHttpResponse(stream_feed(blocks=blocks, name='Project schedule'), content_type='text/calendar; charset=utf-8')
+        resp['Content-Disposition'] = f'attachment; filename="project_schedule_{monday.isoformat()}.ics"'
+        return resp
+
+
+# New: compact mobile-friendly scheduler page (blocks only)
+class ProjectSchedulerCompactView(PersonalBaseView):
+    template_name = 'project_scheduler_compact.html'
+
+    def get(self, request, *args, **kwargs):
+        # Reuse same context building as main scheduler
+        from ..schedules import has_blocks, schedule_payload
+        open_start = request.GET.get('open_start', '18:00')
+        open_end = request.GET.get('open_end', '22:00')
+        today = timezone.localdate()
+        monday = today - timedelta(days=today.weekday())
+        if request.GET.get('week'):
+            try:
+                monday = date.fromisoformat(request.GET['week'])
+            except ValueError:
+                pass
+        days = [monday + timedelta(days=i) for i in range(7)]
+        # Load persisted blocks for the week if any
+        saved_schedule = schedule_payload(days[0], days[-1]) if has_blocks(days[0], days[-1]) else None
+        ctx = self.get_context_data(
+            days=days,
+            open_start=open_start,
+            open_end=open_end,
+            saved_schedule=saved_schedule,
+        )
+        return self.render_to_response(ctx)
+
+
+# New: Personal section root dashboard
+class PersonalDashboardView(PersonalBaseView):
+    template_name = 'dashboard.html'
+
+    def get(self, request, *args, **kwargs):
+        counts = {
+            'properties': PersonalProperty.objects.count(),
+            'assets': PersonalAsset.objects.count(),
+            'projects': PersonalProject.objects.count(),
+            'repairs': PersonalRepair.objects.count(),
+            'documents': PersonalDocument.objects.count(),
+            'reports': PersonalReport.objects.count(),
+            'tasks': PersonalTask.objects.count(),
+        }
+        recent_projects = PersonalProject.objects.all().order_by('-created_at')[:5]
+        recent_tasks = PersonalTask.objects.all().order_by('-created_at')[:5]
+        ctx = self.get_context_data(counts=counts, recent_projects=recent_projects, recent_tasks=recent_tasks)
+        return self.render_to_response(ctx)
+
+
+# New: Properties list/create
+class PersonalPropertiesView(PersonalBaseView):
+    template_name = 'properties.html'
+
+    def get(self, request, *args, **kwargs):
+        q = request.GET.get('search', '').strip()
+        qs = PersonalProperty.objects.all().order_by('-created_at')
+        if q:
+            qs = qs.filter(Q(name__icontains=q) | Q(address__icontains=q))
+        page = Paginator(qs, 10).get_page(request.GET.get('page'))
+        ctx = self.get_context_data(form=PropertyForm(), page_obj=page, search_query=q)
+        return self.render_to_response(ctx)
+
+    def post(self, request, *args, **kwargs):
+        form = PropertyForm(request.POST)
+        if form.is_valid():
+            form.save()
+        return redirect('properties')
+
+
+# New: Assets list/create
+class PersonalAssetsView(PersonalBaseView):
+    template_name = 'assets.html'
+
+    def get(self, request, *args, **kwargs):
+        q = request.GET.get('search', '').strip()
+        cat = request.GET.get('category', '').strip()
+        qs = PersonalAsset.objects.all().order_by('-created_at')
+        if q:
+            qs = qs.filter(Q(name__icontains=q) | Q(category__icontains=q))
+        if cat:
+            qs = qs.filter(category__iexact=cat)
+        page = Paginator(qs, 10).get_page(request.GET.get('page'))
+        categories = (
+            PersonalAsset.objects.exclude(category__isnull=True)
+            .exclude(category__exact='')
+            .values_list('category', flat=True).distinct().order_by('category')
+        )
+        ctx = self.get_context_data(form=AssetForm(), page_obj=page, search_query=q, categories=categories, category_selected=cat)
+        return self.render_to_response(ctx)
+
+    def post(self, request, *args, **kwargs):
+        form = AssetForm(request.POST)
+        if form.is_valid():
+            form.save()
+        return redirect('assets')
+
+
+# New: Task edit/delete within projects
+class ProjectTaskEditView(PersonalBaseView):
+    template_name = 'projects.html'
+
+    def get(self, request, pk: int, *args, **kwargs):
+        task = get_object_or_404(PersonalTask, pk=pk)
+        project = task.project
+        q = request.GET.get('search', '').strip()
+        status = request.GET.get('status', '').strip()
+        page = Paginator(PersonalProject.objects.all().order_by('-created_at'), 10).get_page(request.GET.get('page'))
+        by_status = {
+            'PLANNED': PersonalProject.objects.filter(status='PLANNED').count(),
+            'IN_PROGRESS': PersonalProject.objects.filter(status='IN_PROGRESS').count(),
+            'COMPLETED': PersonalProject.objects.filter(status='COMPLETED').count(),
+            'ON_HOLD': PersonalProject.objects.filter(status='ON_HOLD').count(),
+        }
+        total_budget = PersonalProject.objects.exclude(budget__isnull=True).aggregate(s=models.Sum('budget'))['s'] or 0
+        tasks = project.tasks.all().order_by(models.F('position').asc(nulls_first=True), '-created_at')
+        ctx = self.get_context_data(
+            form=ProjectForm(instance=project), page_obj=page, search_query=q,
+            status_selected=status, project_status_counts=by_status, total_budget=total_budget,
+            selected_project=project, tasks=tasks, task_form=TaskForm(instance=task), edit_task=True,
+        )
+        return self.render_to_response(ctx)
+
+    def post(self, request, pk: int, *args, **kwargs):
+        task = get_object_or_404(PersonalTask, pk=pk)
+        form = TaskForm(request.POST, instance=task)
+        if form.is_valid():
+            form.save()
+        return redirect(f"{reverse_lazy('projects')}?project={task.project_id}")
+
+
+class ProjectTaskDeleteView(PersonalBaseView):
+    def get(self, request, pk: int, *args, **kwargs):
+        task = get_object_or_404(PersonalTask, pk=pk)
+        pid = task.project_id
+        task.delete()
+        return redirect(f"{reverse_lazy('projects')}?project={pid}")
+
+def _reorder(request, queryset, field):
+    """Apply ``{"ids": [...]}`` from the body as the new order of ``queryset``."""
+    if request.method != 'POST':
+        return JsonResponse({'ok': False, 'error': 'POST required'}, status=405)
+    try:
+        data = json.loads(request.body.decode('utf-8'))
+        ids = data.get('ids') or []
+        updated = reorder(queryset, ids, field)
+        return JsonResponse({'ok': True, 'updated': updated})
+    except Exception as e:
+        return JsonResponse({'ok': False, 'error': str(e)}, status=400)
+
+@csrf_exempt
+def reorder_tasks(request, project_pk: int):
+    project = get_object_or_404(PersonalProject, pk=project_pk)
+    return _reorder(request, project.tasks.all(), 'position')
+
+
+@csrf_exempt
+def reorder_monthly_items(request):
+    return _reorder(request, PersonalMonthlyItem.objects.all(), 'position')
+
+
+def api_cashflow(request):
+    """Forecast as JSON: ``?months=6``, ``?daily=1`` for every day, ``?on=YYYY-MM-DD`` for one balance."""
+    try:
+        months = int(request.GET.get('months', FORECAST_MONTHS))
+        on = date.fromisoformat(request.GET['on']) if request.GET.get('on') else None
+    except ValueError:
+        return JsonResponse({'ok': False, 'error': 'Invalid months or date'}, status=400)
+    forecast = cashflow.forecast(months, timezone.localdate())
+    data = {'ok': True, **forecast.as_dict(daily=bool(request.GET.get('daily')))}
+    if on is not None:
+        data['on'] = {'date': on.isoformat(), 'balance': float(forecast.balance_on(on))}
+    return JsonResponse(data)
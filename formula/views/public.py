@@ -0,0 +1,67 @@
+"""Public site pages and the contact form."""
+
+from django.shortcuts import get_object_or_404, redirect, render
+from django.views import View
+from django.views.generic import RedirectView
+
+
+class PublicHomePageView(View):
+    """Simple public landing page for Human Futures LLC."""
+    def get(self, request, *args, **kwargs):
+        from ..forms import LeadForm
+        from ..models import Car
+        cars = list(Car.objects.filter(is_active=True).order_by('-created_at')[:6])
+        return render(request, 'public_home.html', {'lead_form': LeadForm(), 'cars': cars})
+
+
+class LoginRedirectView(RedirectView):
+    url = '/admin/login/'
+
+
+class PublicServicesView(View):
+    def get(self, request, *args, **kwargs):
+        return render(request, 'public_services.html')
+
+
+class PublicCarsView(View):
+    def get(self, request, *args, **kwargs):
+        from ..models import Car
+        cars = list(Car.objects.filter(is_active=True).order_by('-created_at')[:50])
+        return render(request, 'public_cars.html', {'cars': cars})
+
+
+class PublicCarDetailView(View):
+    def get(self, request, pk, *args, **kwargs):
+        from ..models import Car
+        car = get_object_or_404(Car, pk=pk, is_active=True)
+        return render(request, 'public_car_detail.html', {'car': car})
+
+
+class ContactSubmitView(View):
+    """Accepts POST from public landing/contact form and stores a Lead."""
+    def post(self, request, *args, **kwargs):
+        from ..forms import LeadForm
+        form = LeadForm(request.POST)
+        if form.is_valid():
+            lead = form.save(commit=False)
+            lead.source = request.POST.get('source') or 'public_site'
+            # attempt to save lead and notify via email if configured
+            try:
+                lead.save()
+            except Exception:
+                return redirect(request.META.get('HTTP_REFERER', '/'))
+
+            # queue the SALES_EMAIL notification; process_outbox sends it
+            from ..outbox import notify_lead
+            try:
+                notify_lead(lead)
+            except Exception:
+                # the lead is saved; don't break the public UX over the email
+                pass
+
+            # simple success flow: redirect back to referrer
+            return redirect(request.META.get('HTTP_REFERER', '/'))
+        # on invalid, re-render home with errors
+        from ..models import Car
+        cars = list(Car.objects.filter(is_active=True).order_by('-created_at')[:6])
+        return render(request, 'public_home.html', {'lead_form': form, 'cars': cars})
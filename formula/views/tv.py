@@ -0,0 +1,78 @@
+"""Read-only TV dashboard and its live event stream."""
+
+from datetime import date, timedelta
+
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import render
+
+from formula import cashflow
+
+
+def cashflow_summary(today):
+    forecast = cashflow.forecast(3, today)
+    low_day, low_balance = forecast.lowest(today)
+    return {
+        'today': float(forecast.balance_on(today)),
+        'in_30_days': float(forecast.balance_on(today + timedelta(days=30))),
+        'month_end': float(forecast.balance_on(forecast.month_ends()[0][0])),
+        'lowest_date': low_day,
+        'lowest': float(low_balance),
+    }
+
+
+@login_required
+def tv_dashboard(request):
+    """Aggregated personal + savings overview for a wall/TV.
+
+    Keeps logic minimal & heavy lifting server-side. Changes are pushed to the
+    screen over ``tv_dashboard_events`` instead of reloading the page.
+    """
+    from ..live import goal_payload, month_finances, task_bucket
+    from ..models import PersonalMonthlyItem, PersonalTask, SavingsGoal, SavingsPlan
+    from ..schedules import schedule_payload, week_start_for
+    today = date.today()
+    # Savings goals summary
+    goals = list(SavingsGoal.objects.all().order_by('priority', 'created_at'))
+    goals_payload = [goal_payload(g) for g in goals[:12]]
+    # Tasks: upcoming / in progress / overdue
+    tasks_qs = PersonalTask.objects.select_related('project').all()
+    buckets = {'upcoming': [], 'in_progress': [], 'overdue': [], 'done': []}
+    for t in tasks_qs[:400]:
+        buckets[task_bucket(t, today)].append(t)
+    # Finances: month to date net
+    finances = month_finances(today)
+    recurring = PersonalMonthlyItem.objects.all()
+    # This week's scheduled blocks
+    monday = week_start_for(today)
+    plan = SavingsPlan.objects.first()
+    context = {
+        'today': today,
+        'goals': goals_payload,
+        'tasks_upcoming': buckets['upcoming'][:20],
+        'tasks_in_progress': buckets['in_progress'][:20],
+        'tasks_overdue': buckets['overdue'][:20],
+        'month_income': finances['income'],
+        'month_expenses': finances['expenses'],
+        'month_net': finances['net'],
+        'recurring': recurring[:30],
+        'schedule': schedule_payload(monday, monday + timedelta(days=6)),
+        'weekly_pool': float(plan.weekly_amount) if plan else 0,
+        'cashflow': cashflow_summary(today),
+    }
+    return render(request, 'dashboard/tv.html', context)
+
+
+@login_required
+async def tv_dashboard_events(request):
+    """Server-sent event stream of dashboard deltas (see ``formula.live``)."""
+    from django.http import StreamingHttpResponse
+
+    from ..live import event_stream
+    try:
+        last_id = int(request.headers.get('Last-Event-ID') or request.GET.get('last_id') or 0)
+    except ValueError:
+        last_id = 0
+    response = StreamingHttpResponse(event_stream(last_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
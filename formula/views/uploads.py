@@ -0,0 +1,113 @@
+"""Resumable (tus 1.0) upload endpoint for FileStorage; see formula.uploads."""
+
+import base64
+import binascii
+
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.views import View
+
+from formula import uploads
+from formula.models import UploadSession
+
+EXTENSIONS = 'creation,creation-with-upload,termination'
+
+
+def _metadata(header):
+    """``Upload-Metadata: key base64,key base64`` as a dict of strings."""
+    out = {}
+    for pair in (header or '').split(','):
+        key, _, value = pair.strip().partition(' ')
+        if not key:
+            continue
+        try:
+            out[key] = base64.b64decode(value).decode('utf-8') if value else ''
+        except (binascii.Error, UnicodeDecodeError) as e:
+            raise uploads.UploadError(f'Invalid Upload-Metadata value for {key!r}.') from e
+    return out
+
+
+def _int_header(request, name):
+    try:
+        return int(request.headers[name])
+    except (KeyError, ValueError) as e:
+        raise uploads.UploadError(f'Missing or invalid {name} header.') from e
+
+
+def _response(status=204, **headers):
+    response = HttpResponse(status=status)
+    response['Tus-Resumable'] = uploads.TUS_VERSION
+    response['Cache-Control'] = 'no-store'
+    for name, value in headers.items():
+        response[name.replace('_', '-')] = str(value)
+    return response
+
+
+def _error(e):
+    response = JsonResponse({'error': str(e)}, status=e.status)
+    response['Tus-Resumable'] = uploads.TUS_VERSION
+    return response
+
+
+def _completed(response, session):
+    if session.file_id:
+        response['Upload-File-Id'] = str(session.file_id)
+    return response
+
+
+class UploadLoginRequiredMixin(LoginRequiredMixin):
+    # tus clients can't follow a redirect to the login page.
+    raise_exception = True
+
+
+class FileUploadsView(UploadLoginRequiredMixin, View):
+    """``POST`` creates an upload session; ``OPTIONS`` advertises the server's limits."""
+
+    def options(self, request, *args, **kwargs):
+        return _response(
+            Tus_Version=uploads.TUS_VERSION, Tus_Extension=EXTENSIONS, Tus_Max_Size=uploads.max_size()
+        )
+
+    def post(self, request, *args, **kwargs):
+        try:
+            metadata = _metadata(request.headers.get('Upload-Metadata'))
+            session = uploads.create(
+                request.user, metadata.pop('filename', ''), _int_header(request, 'Upload-Length'), metadata
+            )
+            if request.headers.get('Content-Type') == 'application/offset+octet-stream':
+                uploads.append(session, request, 0)
+        except uploads.UploadError as e:
+            return _error(e)
+        response = _response(
+            201, Location=reverse('filestorage_upload', args=[session.pk]), Upload_Offset=session.offset
+        )
+        return _completed(response, session)
+
+
+class FileUploadView(UploadLoginRequiredMixin, View):
+    """``HEAD`` reports the offset to resume from, ``PATCH`` appends, ``DELETE`` abandons."""
+
+    def get_session(self, request, pk):
+        # Sessions are only reachable by the user who started them.
+        return get_object_or_404(UploadSession, pk=pk, user=request.user)
+
+    def head(self, request, pk, *args, **kwargs):
+        session = self.get_session(request, pk)
+        return _completed(_response(200, Upload_Offset=session.offset, Upload_Length=session.length), session)
+
+    def patch(self, request, pk, *args, **kwargs):
+        session = self.get_session(request, pk)
+        if request.headers.get('Content-Type') != 'application/offset+octet-stream':
+            return _error(uploads.UploadError('Content-Type must be application/offset+octet-stream.', 415))
+        try:
+            # Reads the body from the request stream, never request.body.
+            uploads.append(session, request, _int_header(request, 'Upload-Offset'))
+        except uploads.UploadError as e:
+            return _error(e)
+        return _completed(_response(Upload_Offset=session.offset), session)
+
+    def delete(self, request, pk, *args, **kwargs):
+        uploads.terminate(self.get_session(request, pk))
+        return _response()
@@ -0,0 +1,140 @@
+"""Vite build manifest, read once per build.
+
+``frontend_v2`` is built into ``frontend_v2/dist`` (collected as static
+files) with ``.vite/manifest.json`` describing every chunk. ``Manifest``
+parses that file once, keeps the rendered tags per entry and only looks at
+the file's mtime again every ``check_interval`` seconds, so rendering
+``{% vite_asset %}`` normally does no disk I/O at all.
+
+For an entry the tags are, in order: stylesheets of the entry and every chunk
+it imports statically, ``modulepreload`` hints for those chunks (the browser
+fetches them in parallel with the entry instead of after parsing it) and the
+entry script. Dynamic imports are left to load on demand.
+
+Built files carry a content hash in their name, so ``immutable_file_test``
+lets WhiteNoise serve them with a one year ``immutable`` cache header.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from html import escape
+
+# Vite: assets/<name>-<8 char hash>.<ext>; Django's manifest storage: <name>.<12 hex>.<ext>
+HASHED_VITE_FILE = re.compile(r"^assets/.+-[A-Za-z0-9_-]{8}\.[A-Za-z0-9]+$")
+HASHED_DJANGO_FILE = re.compile(r"^.+\.[0-9a-f]{12}\..+$")
+
+
+####################################################################
+# Manifest
+####################################################################
+class Manifest:
+    def __init__(self, path, static_url="/static/", check_interval=None):
+        self.path = path
+        self.static_url = static_url
+        # None: never look at the file again once it's loaded.
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._checked = None
+        self._chunks = None
+        self._tags = {}
+
+    def chunks(self):
+        """The parsed manifest, or ``None`` when there is no build."""
+        now = time.monotonic()
+        if self._checked is not None and (
+            self.check_interval is None or now - self._checked < self.check_interval
+        ):
+            return self._chunks
+        with self._lock:
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except FileNotFoundError:
+                mtime = None
+            if mtime != self._mtime or self._checked is None:
+                self._chunks = self._read() if mtime is not None else None
+                self._mtime = mtime
+                self._tags = {}
+            self._checked = now
+        return self._chunks
+
+    def _read(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def imported(self, entry):
+        """Chunks ``entry`` imports statically, depth first, each once."""
+        chunks = self.chunks() or {}
+        seen = []
+
+        def visit(name):
+            for child in chunks.get(name, {}).get("imports", ()):
+                if child not in seen and child != entry:
+                    seen.append(child)
+                    visit(child)
+
+        visit(entry)
+        return seen
+
+    def tags(self, entry):
+        """HTML for ``entry``; empty when the build doesn't have it."""
+        chunks = self.chunks()
+        if chunks is None:
+            return None
+        html = self._tags.get(entry)
+        if html is None:
+            html = self._tags[entry] = self._render(chunks, entry)
+        return html
+
+    def _render(self, chunks, entry):
+        record = chunks.get(entry)
+        if not record:
+            return ""
+        imported = self.imported(entry)
+        css = []
+        for name in [entry, *imported]:
+            for href in chunks[name].get("css", ()):
+                if href not in css:
+                    css.append(href)
+        lines = [f'<link rel="stylesheet" href="{self.url(href)}" />' for href in css]
+        lines += [f'<link rel="modulepreload" href="{self.url(chunks[name]["file"])}" />' for name in imported]
+        lines.append(f'<script type="module" src="{self.url(record["file"])}"></script>')
+        return "\n".join(lines)
+
+    def url(self, file):
+        return escape(self.static_url + file)
+
+
+_manifest = None
+
+
+def manifest():
+    """The process-wide ``Manifest`` for ``frontend_v2``."""
+    global _manifest
+    if _manifest is None:
+        from django.conf import settings
+
+        _manifest = Manifest(
+            os.path.join(settings.BASE_DIR, "frontend_v2", "dist", ".vite", "manifest.json"),
+            static_url=settings.STATIC_URL,
+            # Pick up rebuilds while developing; a deploy restarts the workers.
+            check_interval=1.0 if settings.DEBUG else None,
+        )
+    return _manifest
+
+
+####################################################################
+# WhiteNoise
+####################################################################
+def immutable_file_test(path, url):
+    """``WHITENOISE_IMMUTABLE_FILE_TEST``: files whose name changes with their content."""
+    from django.conf import settings
+
+    name = url[len(settings.STATIC_URL):] if url.startswith(settings.STATIC_URL) else url.lstrip("/")
+    return bool(HASHED_VITE_FILE.match(name) or HASHED_DJANGO_FILE.match(name))